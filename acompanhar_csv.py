@@ -0,0 +1,199 @@
+"""
+Acompanhamento de um CSV de resultados que cresce por anexação (por outras ferramentas ou à mão).
+
+O acompanhador guarda, em um arquivo JSON ao lado do CSV, a posição em bytes já processada, a
+identidade do arquivo (dispositivo e inode), o tamanho e a data de modificação vistos, o hash de
+todo o trecho já lido e quantas partidas vieram dele. Se identidade, tamanho e data de modificação
+não mudaram desde a última verificação, nada é lido. Caso contrário, o trecho já lido é conferido
+pelo hash (uma leitura sequencial que detecta também edições no meio do arquivo) e só as linhas
+completas anexadas depois da posição são lidas. Se o arquivo foi truncado, substituído ou editado, ou se o registro tem menos partidas do que
+as já lidas do CSV, a verificação indica que o conteúdo inteiro deve ser reprocessado. Sem marcador
+anterior, o CSV só é dado como processado se todas as suas partidas já estiverem no registro.
+
+sincronizar() aplica as linhas novas ao registro de partidas (e, incrementalmente, ao estado do
+modelo e ao índice de confrontos). Quando o CSV foi reescrito, o registro é refeito a partir dele
+sem descartar as partidas que só existem no registro (incluídas pela interface ou por importação
+em lote): elas são mantidas depois das do CSV e devolvidas ao chamador, que deve avisar o usuário
+e reconstruir o estado do modelo.
+"""
+import io
+import os
+import json
+import hashlib
+from collections import Counter
+import pandas as pd
+
+from arquivos import gravar_atomico
+from dados import normalizar_colunas
+from importar_resultados import validar_resultados, importar_resultados
+
+SEM_MUDANCAS, ANEXADAS, REESCRITO = 'sem_mudancas', 'anexadas', 'reescrito'
+_BYTES_LEITURA = 1 << 20
+
+
+def _identidade(info):
+    return [info.st_dev, info.st_ino]
+
+
+def _assinatura(info):
+    return _identidade(info) + [info.st_size, info.st_mtime_ns]
+
+
+def _chaves(df):
+    return list(zip(df['mandante'], df['visitante'], df['gols_mandante'].astype(int), df['gols_visitante'].astype(int)))
+
+
+def partidas_ausentes(df, referencia):
+    """
+    Partidas de df que não estão em referencia (comparando mandante, visitante e placar, com
+    repetições), na ordem de df.
+    """
+    restantes = Counter(_chaves(referencia))
+    ausentes = []
+    for i, chave in enumerate(_chaves(df)):
+        if restantes[chave]:
+            restantes[chave] -= 1
+        else:
+            ausentes.append(i)
+    return df.iloc[ausentes].reset_index(drop=True)
+
+
+class AcompanhadorCSV:
+    """
+    Parâmetros:
+        caminho_csv (str): CSV acompanhado (esquema de br-25.csv ou de campeonato-brasileiro-full.csv).
+        caminho_marcador (str): Arquivo JSON com a posição já processada (padrão: CSV + '.acompanhamento.json').
+    """
+    def __init__(self, caminho_csv, caminho_marcador=None):
+        self.caminho_csv = caminho_csv
+        self.caminho_marcador = caminho_marcador or caminho_csv + '.acompanhamento.json'
+        self.marcador = self._ler_marcador()
+        self._pendente = None
+        # Assinatura do arquivo na última verificação sem novidades (posição do marcador conferida)
+        self._conferido = None
+
+    def _ler_marcador(self):
+        try:
+            with open(self.caminho_marcador, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _hash(self, f, posicao):
+        h = hashlib.blake2b(digest_size=16)
+        f.seek(0)
+        restante = posicao
+        while restante > 0:
+            bloco = f.read(min(restante, _BYTES_LEITURA))
+            if not bloco:
+                break
+            h.update(bloco)
+            restante -= len(bloco)
+        return h.hexdigest()
+
+    def _novo_marcador(self, f, info, posicao, n_partidas):
+        return {'identidade': _identidade(info), 'assinatura': _assinatura(info), 'posicao': posicao,
+                'hash': self._hash(f, posicao), 'n_partidas': int(n_partidas)}
+
+    def _ler_linhas(self, conteudo):
+        df = pd.read_csv(io.BytesIO(conteudo), dtype=str)
+        df = normalizar_colunas(df, self.caminho_csv)
+        # Linhas sem placar (jogos ainda não disputados) são ignoradas, como na importação do CSV
+        return df.dropna(subset=['gols_mandante', 'gols_visitante']).reset_index(drop=True)
+
+    def _ler_tudo(self, f, info):
+        f.seek(0)
+        conteudo = f.read()
+        fim = conteudo.rfind(b'\n') + 1
+        df = self._ler_linhas(conteudo[:fim])
+        self._pendente = self._novo_marcador(f, info, fim, len(df))
+        return df
+
+    def verificar(self, registro=None):
+        """
+        Verifica o CSV desde a última posição confirmada.
+
+        Parâmetros:
+            registro (RegistroPartidas): Registro de destino. Se informado, o trecho já lido só é
+                aceito se o registro tiver ao menos as partidas que vieram dele e, sem marcador
+                anterior, se o registro contiver todas as partidas do CSV.
+        Retorna:
+            tuple: (situacao, df), com situacao SEM_MUDANCAS, ANEXADAS (df com as linhas novas) ou
+            REESCRITO (df com todas as linhas do arquivo).
+        """
+        self._pendente = None
+        try:
+            assinatura = _assinatura(os.stat(self.caminho_csv))
+        except FileNotFoundError:
+            return SEM_MUDANCAS, None
+        marcador = self.marcador
+        # Arquivo intocado desde a última verificação: nada a ler nem a conferir
+        if (marcador is not None and assinatura in (marcador.get('assinatura'), self._conferido)
+                and (registro is None or len(registro) >= marcador.get('n_partidas', 0))):
+            return SEM_MUDANCAS, None
+        with open(self.caminho_csv, 'rb') as f:
+            info = os.fstat(f.fileno())
+            if marcador is None:
+                df = self._ler_tudo(f, info)
+                if registro is not None and not partidas_ausentes(df, registro.para_dataframe()).empty:
+                    return REESCRITO, df
+                self.confirmar()
+                return SEM_MUDANCAS, None
+
+            posicao = marcador['posicao']
+            if (marcador['identidade'] != _identidade(info) or info.st_size < posicao
+                    or self._hash(f, posicao) != marcador.get('hash')
+                    or (registro is not None and len(registro) < marcador.get('n_partidas', 0))):
+                return REESCRITO, self._ler_tudo(f, info)
+
+            f.seek(posicao)
+            anexado = f.read()
+            # Só linhas completas: uma linha ainda sendo gravada fica para a próxima verificação
+            fim = anexado.rfind(b'\n') + 1
+            if fim == 0:
+                self._conferido = _assinatura(info)
+                return SEM_MUDANCAS, None
+            f.seek(0)
+            cabecalho = f.readline()
+            df = self._ler_linhas(cabecalho + anexado[:fim])
+            self._pendente = self._novo_marcador(f, info, posicao + fim, marcador['n_partidas'] + len(df))
+            return ANEXADAS, df
+
+    def confirmar(self):
+        """
+        Grava a posição da última verificação, depois que as linhas devolvidas foram aplicadas.
+        """
+        if self._pendente is None:
+            return
+        gravar_atomico(self.caminho_marcador, json.dumps(self._pendente).encode('utf-8'))
+        self.marcador, self._pendente, self._conferido = self._pendente, None, None
+
+
+def sincronizar(acompanhador, registro, estado=None, confrontos=None):
+    """
+    Verifica o CSV e aplica o que mudou. A posição só é confirmada se a aplicação der certo.
+
+    Parâmetros:
+        acompanhador (AcompanhadorCSV): Acompanhador do CSV de origem.
+        registro (RegistroPartidas): Registro de partidas de destino.
+        estado (EstadoModelo): Atualizado incrementalmente com linhas anexadas (opcional).
+        confrontos (IndiceConfrontos): Atualizado incrementalmente com linhas anexadas (opcional).
+    Retorna:
+        tuple: (situacao, df, preservadas), com situacao e df como em AcompanhadorCSV.verificar e
+        preservadas as partidas do registro ausentes do CSV que foram mantidas na reescrita
+        (vazio nos demais casos).
+    Lança:
+        ValueError: Se as linhas lidas não forem válidas (serão lidas de novo na próxima verificação).
+    """
+    situacao, df = acompanhador.verificar(registro)
+    preservadas = pd.DataFrame()
+    if situacao == ANEXADAS and not df.empty:
+        importar_resultados(df, registro, estado, confrontos, permitir_novos=True)
+    elif situacao == REESCRITO:
+        erros = validar_resultados(df, set(), permitir_novos=True)
+        if erros:
+            raise ValueError("\n".join(erros))
+        preservadas = partidas_ausentes(registro.para_dataframe(), df)
+        registro.reescrever(df.to_dict('records') + preservadas.to_dict('records'))
+    acompanhador.confirmar()
+    return situacao, df, preservadas
@@ -0,0 +1,142 @@
+"""
+Ajuste das forças de Poisson por máxima verossimilhança.
+
+Ao contrário de calcular_forcas_poisson (razões entre médias brutas), o ajuste estima conjuntamente
+a média da liga, a vantagem de jogar em casa e o ataque/defesa de cada time, levando em conta a
+qualidade dos adversários:
+
+    log λ_mandante  = μ + casa + ataque[mandante]  - defesa[visitante]
+    log λ_visitante = μ        + ataque[visitante] - defesa[mandante]
+
+A matriz de desenho é esparsa (cada gol depende de um ataque e uma defesa) e fica implícita nos
+vetores de índices; os produtos com ela são np.bincount. O solver é IRLS por blocos: a Hessiana de
+cada bloco (ataques, defesas) é diagonal, então cada passo de Newton é exato e custa O(partidas).
+A penalidade ridge opcional encolhe times com poucos jogos (ex.: promovidos) em direção à média,
+e o ajuste pode partir de um resultado anterior quando chegam partidas novas.
+
+O resultado é convertido para o formato de calcular_forcas_poisson, e pode ser usado diretamente
+em prever_partida_hibrido.
+"""
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+
+MAX_ITERACOES = 200
+TOLERANCIA = 1e-8
+
+
+def ajustar_poisson_mle(df, ridge=0.0, inicial=None, max_iteracoes=MAX_ITERACOES, tolerancia=TOLERANCIA):
+    """
+    Ajusta o modelo de Poisson por máxima verossimilhança (com penalidade ridge opcional).
+
+    Parâmetros:
+        df (pd.DataFrame): Partidas com mandante, visitante, gols_mandante e gols_visitante.
+        ridge (float): Peso da penalidade ridge sobre ataques e defesas (0 = MLE puro).
+        inicial (dict): Resultado anterior de ajustar_poisson_mle para partida a quente; times novos começam em 0.
+        max_iteracoes (int): Limite de iterações.
+        tolerancia (float): Critério de parada sobre o maior passo dos parâmetros.
+    Retorna:
+        dict: 'times', 'ataque', 'defesa' (arrays), 'mu', 'casa', 'iteracoes', 'log_verossimilhanca'.
+    """
+    codigos, times = pd.factorize(pd.concat([df['mandante'], df['visitante']], ignore_index=True), sort=True)
+    n_partidas, n_times = len(df), len(times)
+    mandante, visitante = codigos[:n_partidas], codigos[n_partidas:]
+
+    # Formato longo: cada partida gera duas observações (gols do mandante e gols do visitante)
+    gols = np.concatenate([df['gols_mandante'].to_numpy(dtype=np.float64), df['gols_visitante'].to_numpy(dtype=np.float64)])
+    atacante = np.concatenate([mandante, visitante])
+    defensor = np.concatenate([visitante, mandante])
+    em_casa = np.r_[np.ones(n_partidas, dtype=bool), np.zeros(n_partidas, dtype=bool)]
+
+    ataque, defesa = np.zeros(n_times), np.zeros(n_times)
+    mu, casa = np.log(max(gols.mean(), 1e-9)), 0.0
+    if inicial is not None:
+        anteriores = {t: i for i, t in enumerate(inicial['times'])}
+        for i, t in enumerate(times):
+            if t in anteriores:
+                ataque[i] = inicial['ataque'][anteriores[t]]
+                defesa[i] = inicial['defesa'][anteriores[t]]
+        mu, casa = inicial['mu'], inicial['casa']
+
+    lam = np.exp(mu + casa * em_casa + ataque[atacante] - defesa[defensor])
+    iteracao = 0
+    for iteracao in range(1, max_iteracoes + 1):
+        passo_mu = np.log(gols.sum() / lam.sum())
+        mu += passo_mu
+        lam *= np.exp(passo_mu)
+
+        passo_casa = np.log(gols[em_casa].sum() / lam[em_casa].sum())
+        casa += passo_casa
+        lam[em_casa] *= np.exp(passo_casa)
+
+        residuo = np.bincount(atacante, weights=gols - lam, minlength=n_times)
+        passo_ataque = (residuo - ridge * ataque) / (np.bincount(atacante, weights=lam, minlength=n_times) + ridge)
+        ataque += passo_ataque
+        lam *= np.exp(passo_ataque[atacante])
+
+        residuo = np.bincount(defensor, weights=gols - lam, minlength=n_times)
+        passo_defesa = (-residuo - ridge * defesa) / (np.bincount(defensor, weights=lam, minlength=n_times) + ridge)
+        defesa += passo_defesa
+        lam *= np.exp(-passo_defesa[defensor])
+
+        # Identificabilidade: ataques e defesas centrados em zero, com a média absorvida por μ
+        media_ataque, media_defesa = ataque.mean(), defesa.mean()
+        ataque -= media_ataque
+        defesa -= media_defesa
+        mu += media_ataque - media_defesa
+
+        maior_passo = max(abs(passo_mu), abs(passo_casa), np.abs(passo_ataque).max(initial=0), np.abs(passo_defesa).max(initial=0))
+        if maior_passo < tolerancia:
+            break
+
+    lam = np.exp(mu + casa * em_casa + ataque[atacante] - defesa[defensor])
+    log_verossimilhanca = float(np.sum(gols * np.log(lam) - lam))
+    return {
+        'times': list(times),
+        'ataque': ataque,
+        'defesa': defesa,
+        'mu': float(mu),
+        'casa': float(casa),
+        'iteracoes': iteracao,
+        'log_verossimilhanca': log_verossimilhanca,
+    }
+
+
+def forcas_mle(resultado):
+    """
+    Converte o ajuste para o formato de calcular_forcas_poisson: (forcas_poisson, medias_liga).
+    ataque_* = exp(ataque) e defesa_* = exp(-defesa), ou seja, defesa acima de 1 significa sofrer
+    mais gols que a média, como nas razões originais.
+    """
+    ataque = np.exp(resultado['ataque'])
+    defesa = np.exp(-resultado['defesa'])
+    forcas = {t: {'ataque_casa': ataque[i], 'defesa_casa': defesa[i], 'ataque_fora': ataque[i], 'defesa_fora': defesa[i]}
+              for i, t in enumerate(resultado['times'])}
+    medias_liga = {'gols_casa': np.exp(resultado['mu'] + resultado['casa']), 'gols_fora': np.exp(resultado['mu'])}
+    return forcas, medias_liga
+
+
+def main(argv=None):
+    from modelo import abrir_registro, calcular_forcas_poisson
+    parser = argparse.ArgumentParser(description="Ajusta as forças de Poisson por máxima verossimilhança.")
+    parser.add_argument('--ridge', type=float, default=0.0, help="Peso da penalidade ridge (padrão: 0)")
+    args = parser.parse_args(argv)
+
+    df = abrir_registro().para_dataframe()
+    resultado = ajustar_poisson_mle(df, ridge=args.ridge)
+    forcas, medias = forcas_mle(resultado)
+    forcas_razao, _ = calcular_forcas_poisson(df)
+    print(f"# Forças de Poisson por Máxima Verossimilhança (ridge={args.ridge}, {resultado['iteracoes']} iterações)\n")
+    print(f"Gols esperados: mandante {medias['gols_casa']:.3f}, visitante {medias['gols_fora']:.3f}\n")
+    tabela = pd.DataFrame({
+        'Ataque (MLE)': {t: f['ataque_casa'] for t, f in forcas.items()},
+        'Defesa (MLE)': {t: f['defesa_casa'] for t, f in forcas.items()},
+        'Ataque Casa (razão)': {t: f['ataque_casa'] for t, f in forcas_razao.items()},
+        'Defesa Casa (razão)': {t: f['defesa_casa'] for t, f in forcas_razao.items()},
+    }).sort_values('Ataque (MLE)', ascending=False)
+    print(tabela.round(3).to_markdown())
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,91 @@
+"""
+Utilitários de arquivo compartilhados: trava entre processos, gravação atômica e impressões
+digitais de arquivos e do registro de partidas, usadas para validar caches (checkpoint do modelo,
+índice de confrontos, partições dos CSVs e resultados de simulação).
+"""
+import os
+import json
+import zlib
+import hashlib
+import tempfile
+
+_BYTES_IMPRESSAO = 65536
+
+
+class TravaArquivo:
+    """
+    Trava exclusiva entre processos baseada em um arquivo auxiliar (fcntl no POSIX, msvcrt no Windows).
+    """
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._arquivo = None
+
+    def __enter__(self):
+        self._arquivo = open(self.caminho, 'a+b')
+        if os.name == 'nt':
+            import msvcrt
+            self._arquivo.seek(0)
+            msvcrt.locking(self._arquivo.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(self._arquivo.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            if os.name == 'nt':
+                import msvcrt
+                self._arquivo.seek(0)
+                msvcrt.locking(self._arquivo.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self._arquivo.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._arquivo.close()
+            self._arquivo = None
+
+
+def gravar_atomico(caminho, conteudo):
+    """
+    Grava o conteúdo (bytes) em um temporário exclusivo no mesmo diretório e o move sobre o destino,
+    de modo que gravações concorrentes nunca se misturam.
+    """
+    descritor, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(caminho)),
+                                      prefix=os.path.basename(caminho) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(descritor, 'wb') as f:
+            f.write(conteudo)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, caminho)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def impressao_arquivo(caminho):
+    """
+    Impressão digital barata de um arquivo: tamanho, data de modificação e hash do início e do fim.
+    """
+    info = os.stat(caminho)
+    h = hashlib.blake2b(digest_size=16)
+    with open(caminho, 'rb') as f:
+        h.update(f.read(_BYTES_IMPRESSAO))
+        if info.st_size > _BYTES_IMPRESSAO:
+            f.seek(max(_BYTES_IMPRESSAO, info.st_size - _BYTES_IMPRESSAO))
+            h.update(f.read())
+    return {'tamanho': info.st_size, 'mtime_ns': info.st_mtime_ns, 'hash': h.hexdigest()}
+
+
+def impressao_registro(registro, n_partidas):
+    """
+    Impressão digital das primeiras n_partidas de um RegistroPartidas: CRC de todas as partidas
+    cobertas (lidas direto da memória mapeada) e da tabela de times correspondente, de modo que
+    qualquer alteração no trecho, inclusive por reescrita do registro, é detectada.
+    """
+    partidas = registro.ler()[:n_partidas]
+    crc = zlib.crc32(partidas)
+    usados = int(max(partidas['mandante'].max(), partidas['visitante'].max())) + 1 if n_partidas else 0
+    crc = zlib.crc32(json.dumps(registro.times[:usados], ensure_ascii=False).encode('utf-8'), crc)
+    return {'n_partidas': int(n_partidas), 'crc': crc}
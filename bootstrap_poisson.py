@@ -0,0 +1,206 @@
+"""
+Incerteza das forças de Poisson por bootstrap.
+
+As partidas são reamostradas com reposição milhares de vezes. Cada réplica é representada por um
+vetor de pesos multinomiais (quantas vezes cada partida foi sorteada), e todas as somas por time de
+uma leva de réplicas saem de um único produto matricial pesos × (indicadores por time × gols), sem
+laço Python por réplica. As levas podem ser divididas entre processos, cada um com seu próprio fluxo
+de números aleatórios derivado de uma semente comum.
+
+Os ratings Elo não são reamostrados (a reconstrução é sequencial); usa-se o Elo do histórico completo.
+"""
+import sys
+import argparse
+import multiprocessing
+import numpy as np
+import pandas as pd
+
+from modelo import ELO_RATING_INICIAL, calcular_vantagens_casa, calcular_elo_dinamico
+from estado_modelo import gols_esperados, probabilidades_resultado, vantagens_de_somas
+
+N_REPLICAS_PADRAO = 10000
+TAMANHO_LEVA = 250
+NIVEL_CREDIBILIDADE = 0.90
+
+FORCAS = ['ataque_casa', 'defesa_casa', 'ataque_fora', 'defesa_fora']
+
+
+def _matriz_somas(df, times):
+    """
+    Monta a matriz (partidas × colunas) cujo produto com os pesos de uma réplica fornece todas as
+    somas por time: jogos, gols marcados e sofridos em casa e fora, além dos totais da liga.
+    """
+    indice = {t: i for i, t in enumerate(times)}
+    n, n_times = len(df), len(times)
+    casa = df['mandante'].map(indice).to_numpy()
+    fora = df['visitante'].map(indice).to_numpy()
+    gm = df['gols_mandante'].to_numpy(dtype=np.float64)
+    gv = df['gols_visitante'].to_numpy(dtype=np.float64)
+    linhas = np.arange(n)
+
+    m = np.zeros((n, 6 * n_times + 2))
+    m[linhas, casa] = 1.0                      # jogos em casa
+    m[linhas, n_times + casa] = gm             # gols marcados em casa
+    m[linhas, 2 * n_times + casa] = gv         # gols sofridos em casa
+    m[linhas, 3 * n_times + fora] = 1.0        # jogos fora
+    m[linhas, 4 * n_times + fora] = gv         # gols marcados fora
+    m[linhas, 5 * n_times + fora] = gm         # gols sofridos fora
+    m[:, -2] = gm
+    m[:, -1] = gv
+    return m
+
+
+def _forcas_de_somas(somas, n_partidas, n_times):
+    """
+    Converte as somas de uma leva de réplicas (réplicas × colunas) em forças por time, com a mesma
+    definição de calcular_forcas_poisson. Times sem jogos em casa/fora numa réplica ficam com NaN.
+    """
+    blocos = [somas[:, k * n_times:(k + 1) * n_times] for k in range(6)]
+    jogos_casa, marcados_casa, sofridos_casa, jogos_fora, marcados_fora, sofridos_fora = blocos
+    media_casa = somas[:, -2:-1] / n_partidas
+    media_fora = somas[:, -1:] / n_partidas
+    with np.errstate(invalid='ignore', divide='ignore'):
+        forcas = {
+            'ataque_casa': marcados_casa / jogos_casa / media_casa,
+            'defesa_casa': sofridos_casa / jogos_casa / media_fora,
+            'ataque_fora': marcados_fora / jogos_fora / media_fora,
+            'defesa_fora': sofridos_fora / jogos_fora / media_casa,
+        }
+    return forcas, media_casa[:, 0], media_fora[:, 0], vantagens_de_somas(jogos_casa, marcados_casa, sofridos_casa)
+
+
+def _rodar_levas(args):
+    matriz, n_times, n_replicas, semente, jogos_idx, elo = args
+    rng = np.random.default_rng(semente)
+    n_partidas = matriz.shape[0]
+    forcas_todas = {f: [] for f in FORCAS}
+    probs_todas = []
+    for inicio in range(0, n_replicas, TAMANHO_LEVA):
+        b = min(TAMANHO_LEVA, n_replicas - inicio)
+        # Pesos multinomiais: contagem de sorteios de cada partida em cada réplica
+        sorteios = rng.integers(0, n_partidas, size=(b, n_partidas)) + (np.arange(b) * n_partidas)[:, None]
+        pesos = np.bincount(sorteios.ravel(), minlength=b * n_partidas).reshape(b, n_partidas).astype(np.float64)
+        forcas, media_casa, media_fora, vantagens = _forcas_de_somas(pesos @ matriz, n_partidas, n_times)
+        for f in FORCAS:
+            forcas_todas[f].append(forcas[f])
+
+        if len(jogos_idx):
+            c, v = jogos_idx[:, 0], jogos_idx[:, 1]
+            lambda_casa, lambda_fora = gols_esperados(
+                forcas['ataque_casa'][:, c], forcas['defesa_fora'][:, v], forcas['ataque_fora'][:, v],
+                forcas['defesa_casa'][:, c], media_casa[:, None], media_fora[:, None], elo[c], elo[v], vantagens[:, c])
+            probs_todas.append(np.stack(probabilidades_resultado(lambda_casa, lambda_fora), axis=-1))
+
+    forcas_todas = {f: np.concatenate(v) for f, v in forcas_todas.items()}
+    probs = np.concatenate(probs_todas) if probs_todas else np.zeros((0, 0, 3))
+    return forcas_todas, probs
+
+
+def bootstrap_forcas(df, jogos=(), n_replicas=N_REPLICAS_PADRAO, semente=None, processos=1,
+                     nivel=NIVEL_CREDIBILIDADE, estado=None):
+    """
+    Estima intervalos de credibilidade para as forças de Poisson e para as probabilidades de
+    vitória/empate/derrota de cada jogo por bootstrap de partidas.
+
+    Parâmetros:
+        df (pd.DataFrame): Partidas com mandante, visitante, gols_mandante e gols_visitante.
+        jogos (list): Tuplas (mandante, visitante) a prever em cada réplica.
+        n_replicas (int): Número de réplicas bootstrap.
+        semente (int): Semente para reprodutibilidade.
+        processos (int): Número de processos para dividir as réplicas.
+        nivel (float): Nível do intervalo (ex.: 0.90 para percentis 5%-95%).
+        estado (EstadoModelo): Estado já ajustado sobre df (ex.: do checkpoint), de onde vêm os
+            ratings Elo; sem ele, o Elo é recalculado sobre todo o histórico.
+    Retorna:
+        tuple: (DataFrame de forças por time, DataFrame de probabilidades por jogo), com colunas
+        de estimativa mediana e limites inferior/superior.
+    Lança:
+        ValueError: Se algum time de jogos não aparecer em df.
+    """
+    times = sorted(pd.unique(df[['mandante', 'visitante']].values.ravel('K')))
+    indice = {t: i for i, t in enumerate(times)}
+    matriz = _matriz_somas(df, times)
+
+    if estado is not None:
+        elo_dict = estado.elo_ratings()
+    else:
+        elo_dict = calcular_elo_dinamico(df, calcular_vantagens_casa(df))
+    elo = np.array([elo_dict.get(t, ELO_RATING_INICIAL) for t in times])
+    desconhecidos = sorted({t for jogo in jogos for t in jogo if t not in indice})
+    if desconhecidos:
+        raise ValueError(f"Times sem partidas no histórico: {', '.join(desconhecidos)}")
+    jogos_idx = np.array([(indice[c], indice[v]) for c, v in jogos], dtype=np.int64).reshape(-1, 2)
+
+    processos = max(1, processos or multiprocessing.cpu_count())
+    sementes = np.random.SeedSequence(semente).spawn(processos)
+    partes = [n_replicas // processos + (1 if i < n_replicas % processos else 0) for i in range(processos)]
+    tarefas = [(matriz, len(times), p, s, jogos_idx, elo) for p, s in zip(partes, sementes) if p > 0]
+    if len(tarefas) == 1:
+        resultados = [_rodar_levas(tarefas[0])]
+    else:
+        with multiprocessing.Pool(processes=len(tarefas)) as pool:
+            resultados = pool.map(_rodar_levas, tarefas)
+
+    q_inf, q_sup = (1 - nivel) / 2 * 100, (1 + nivel) / 2 * 100
+    colunas_forcas = {}
+    for f in FORCAS:
+        amostras = np.concatenate([r[0][f] for r in resultados])
+        colunas_forcas[f] = np.nanmedian(amostras, axis=0)
+        colunas_forcas[f + '_inf'] = np.nanpercentile(amostras, q_inf, axis=0)
+        colunas_forcas[f + '_sup'] = np.nanpercentile(amostras, q_sup, axis=0)
+    df_forcas = pd.DataFrame(colunas_forcas, index=pd.Index(times, name='time'))
+    df_forcas['jogos_casa'] = matriz[:, :len(times)].sum(axis=0).astype(int)
+    df_forcas['jogos_fora'] = matriz[:, 3 * len(times):4 * len(times)].sum(axis=0).astype(int)
+
+    linhas_jogos = []
+    if jogos:
+        probs = np.concatenate([r[1] for r in resultados])
+        for j, (c, v) in enumerate(jogos):
+            linha = {'mandante': c, 'visitante': v}
+            for k, nome in enumerate(['prob_mandante', 'prob_empate', 'prob_visitante']):
+                amostras = probs[:, j, k]
+                linha[nome] = np.nanmedian(amostras)
+                linha[nome + '_inf'] = np.nanpercentile(amostras, q_inf)
+                linha[nome + '_sup'] = np.nanpercentile(amostras, q_sup)
+            linhas_jogos.append(linha)
+    return df_forcas, pd.DataFrame(linhas_jogos)
+
+
+def main(argv=None):
+    from modelo import CHECKPOINT_PATH, abrir_registro
+    from checkpoint_modelo import carregar_estado
+    from dados import normalizar_time
+    parser = argparse.ArgumentParser(description="Intervalos bootstrap para forças de Poisson e previsões.")
+    parser.add_argument('jogos', nargs='*', help="Jogos no formato mandante:visitante")
+    parser.add_argument('--replicas', type=int, default=N_REPLICAS_PADRAO)
+    parser.add_argument('--semente', type=int, default=None)
+    parser.add_argument('--processos', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    jogos = []
+    for texto in args.jogos:
+        mandante, _, visitante = texto.partition(':')
+        mandante, visitante = normalizar_time(mandante), normalizar_time(visitante)
+        if mandante is None or visitante is None:
+            parser.error(f"jogo inválido '{texto}' (use mandante:visitante)")
+        jogos.append((mandante, visitante))
+
+    registro = abrir_registro()
+    estado, _ = carregar_estado(registro, CHECKPOINT_PATH)
+    try:
+        df_forcas, df_jogos = bootstrap_forcas(registro.para_dataframe(), jogos, args.replicas, args.semente,
+                                               args.processos, estado=estado)
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    print(f"# Forças de Poisson - Bootstrap ({args.replicas} réplicas, IC {NIVEL_CREDIBILIDADE:.0%})\n")
+    print(df_forcas.round(3).to_markdown())
+    if not df_jogos.empty:
+        print("\n# Previsões com Intervalos\n")
+        print(df_jogos.round(3).to_markdown(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main(sys.argv[1:]))
@@ -1,7 +1,10 @@
+import os
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import math
+from confrontos import IndiceConfrontos
+from dados import carregar_csv
 
 # Clubes-foco
 clubes_foco = [
@@ -11,14 +14,15 @@ clubes_foco = [
 ]
 
 # Carregar e normalizar dados
-df = pd.read_csv('sassamaru-br-25\campeonato-brasileiro-full.csv', sep=',', encoding='utf-8')
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'campeonato-brasileiro-full.csv')
+# Leitura da cópia particionada por temporada, já em ordem de data
+df = carregar_csv(CSV_PATH)
 df['mandante'] = df['mandante'].str.strip().str.lower()
 df['visitante'] = df['visitante'].str.strip().str.lower()
 df['vencedor'] = df['vencedor'].str.strip().str.lower()
 
 if 'data' in df.columns:
     df['data'] = pd.to_datetime(df['data'], dayfirst=True)
-    df = df.sort_values('data')
     df['ano'] = df['data'].dt.year
 else:
     df['ano'] = 2000
@@ -79,11 +83,9 @@ total_fora = df[df['visitante'].isin(clubes_foco)].groupby('visitante').size()
 percent_empate_fora = (empates_fora / total_fora).fillna(0)
 
 # Confrontos grandes mais desequilibrados
-confrontos = df[df['mandante'].isin(clubes_foco) & df['visitante'].isin(clubes_foco)]
-grupo = confrontos.groupby(['mandante','visitante']).agg({
-    'mandante_Placar':'sum','visitante_Placar':'sum','vencedor':'count'
-})
-grupo['diff_media_gols'] = (grupo['mandante_Placar'] - grupo['visitante_Placar']).abs() / grupo['vencedor']
+indice_confrontos = IndiceConfrontos.de_dataframe(df.rename(columns={'mandante_Placar': 'gols_mandante', 'visitante_Placar': 'gols_visitante'}))
+grupo = indice_confrontos.tabela(clubes_foco)
+grupo['diff_media_gols'] = (grupo['gols_mandante'] - grupo['gols_visitante']).abs() / grupo['jogos']
 top_confrontos = grupo['diff_media_gols'].sort_values(ascending=False).head(5)
 
 # Markdown de insights
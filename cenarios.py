@@ -0,0 +1,155 @@
+"""
+Cenários hipotéticos ("e se o Flamengo perder no domingo?") sobre o estado atual do modelo.
+
+Um Cenario aplica resultados hipotéticos como delta copy-on-write sobre um EstadoModelo: o estado
+base só é copiado na primeira alteração e nunca é modificado, e nada é gravado no registro de
+partidas. avaliar_combinacoes enumera todas as 3^k combinações de vitória/empate/derrota de uma
+rodada e avalia todas de uma vez com operações vetorizadas sobre os times envolvidos.
+"""
+import itertools
+import numpy as np
+import pandas as pd
+
+from estado_modelo import (
+    SOMAS, atualizar_ratings_elo_vetor, vantagens_de_somas, gols_esperados, probabilidades_resultado
+)
+
+# Placar usado para representar cada desfecho na enumeração: vitória do mandante, empate, vitória do visitante
+PLACARES_REPRESENTATIVOS = ((1, 0), (1, 1), (0, 1))
+DESFECHOS = ('Mandante', 'Empate', 'Visitante')
+TAMANHO_BLOCO = 8192
+
+
+class Cenario:
+    """
+    Conjunto de resultados hipotéticos aplicados sobre um estado base.
+
+    Parâmetros:
+        base (EstadoModelo): Estado atual do modelo (não é alterado).
+    """
+    def __init__(self, base):
+        self.base = base
+        self._estado = None
+        self.resultados = []
+
+    @property
+    def estado(self):
+        return self._estado if self._estado is not None else self.base
+
+    def aplicar(self, mandante, gols_mandante, visitante, gols_visitante):
+        if self._estado is None:
+            self._estado = self.base.copiar()
+        self._estado.aplicar_partida(mandante, visitante, gols_mandante, gols_visitante)
+        self.resultados.append((mandante, gols_mandante, visitante, gols_visitante))
+        return self
+
+    def comparar_previsoes(self, jogos):
+        """
+        Previsões dos jogos no estado base e no cenário, lado a lado.
+        """
+        jogos = list(jogos)
+        antes = self.base.prever_jogos(jogos)
+        depois = self.estado.prever_jogos(jogos)
+        linhas = []
+        for j, (mandante, visitante) in enumerate(jogos):
+            linha = {'mandante': mandante, 'visitante': visitante}
+            for chave in ('prob_mandante', 'prob_empate', 'prob_visitante'):
+                linha[chave] = antes[chave][j]
+                linha[chave + '_cenario'] = depois[chave][j]
+            linhas.append(linha)
+        return pd.DataFrame(linhas)
+
+    def comparar_ranking(self):
+        """
+        Ranking Elo no estado base e no cenário, com a variação de rating e de posição.
+        """
+        elo_base = pd.Series(self.base.elo, index=self.base.times)
+        elo_cenario = pd.Series(self.estado.elo, index=self.estado.times)
+        ranking = pd.DataFrame({'elo': elo_base, 'elo_cenario': elo_cenario})
+        ranking['elo'] = ranking['elo'].fillna(ranking['elo_cenario'])
+        ranking['posicao'] = ranking['elo'].rank(ascending=False, method='min').astype(int)
+        ranking['posicao_cenario'] = ranking['elo_cenario'].rank(ascending=False, method='min').astype(int)
+        ranking['variacao'] = ranking['elo_cenario'] - ranking['elo']
+        return ranking.sort_values('elo_cenario', ascending=False)
+
+
+def avaliar_combinacoes(base, rodada, jogos_previsao=(), placares=PLACARES_REPRESENTATIVOS, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Avalia todas as combinações de desfecho dos jogos de uma rodada sobre o estado base.
+
+    Parâmetros:
+        base (EstadoModelo): Estado atual do modelo.
+        rodada (list): Jogos (mandante, visitante) cujos desfechos são enumerados.
+        jogos_previsao (list): Jogos (mandante, visitante) a prever em cada cenário.
+        placares (tuple): Placar representativo de cada desfecho (mandante, empate, visitante).
+        tamanho_bloco (int): Número de cenários processados por vez.
+    Retorna:
+        dict: 'desfechos' (cenários × jogos da rodada, 0=mandante, 1=empate, 2=visitante),
+        'times' (times envolvidos), 'elo' e 'posicao_elo' (cenários × times envolvidos) e
+        'probs' (cenários × jogos_previsao × 3).
+    """
+    rodada, jogos_previsao = list(rodada), list(jogos_previsao)
+    envolvidos = list(dict.fromkeys(t for jogo in rodada + jogos_previsao for t in jogo))
+    idx = np.array([base.indice[t] for t in envolvidos], dtype=np.int64)
+    local = {t: i for i, t in enumerate(envolvidos)}
+    rodada_local = [(local[m], local[v]) for m, v in rodada]
+    previsao_c = np.array([local[m] for m, _ in jogos_previsao], dtype=np.int64)
+    previsao_v = np.array([local[v] for _, v in jogos_previsao], dtype=np.int64)
+    placares = np.asarray(placares, dtype=np.float64)
+
+    # Ratings dos times fora da rodada ficam fixos: a posição no ranking é obtida por busca ordenada
+    demais = np.ones(len(base.times), dtype=bool)
+    demais[idx] = False
+    elo_demais = np.sort(base.elo[demais])
+
+    n_cenarios = 3 ** len(rodada)
+    desfechos = np.array(list(itertools.product(range(3), repeat=len(rodada))), dtype=np.int8).reshape(n_cenarios, len(rodada))
+    elo_saida = np.empty((n_cenarios, len(envolvidos)))
+    probs_saida = np.empty((n_cenarios, len(jogos_previsao), 3))
+
+    for inicio in range(0, n_cenarios, tamanho_bloco):
+        bloco = desfechos[inicio:inicio + tamanho_bloco]
+        b = len(bloco)
+        somas = {k: np.broadcast_to(base.somas[k][idx], (b, len(envolvidos))).copy() for k in SOMAS}
+        elo = np.broadcast_to(base.elo[idx], (b, len(envolvidos))).copy()
+        gols_casa = np.full(b, base.total_gols_casa)
+        gols_fora = np.full(b, base.total_gols_fora)
+
+        for j, (c, v) in enumerate(rodada_local):
+            gc, gv = placares[bloco[:, j], 0], placares[bloco[:, j], 1]
+            vantagem = vantagens_de_somas(somas['jogos_casa'][:, c], somas['marcados_casa'][:, c], somas['sofridos_casa'][:, c])
+            elo[:, c], elo[:, v] = atualizar_ratings_elo_vetor(elo[:, c], elo[:, v], gc, gv, vantagem)
+            somas['jogos_casa'][:, c] += 1
+            somas['marcados_casa'][:, c] += gc
+            somas['sofridos_casa'][:, c] += gv
+            somas['jogos_fora'][:, v] += 1
+            somas['marcados_fora'][:, v] += gv
+            somas['sofridos_fora'][:, v] += gc
+            gols_casa += gc
+            gols_fora += gv
+        elo_saida[inicio:inicio + b] = elo
+
+        if len(jogos_previsao):
+            n_partidas = base.n_partidas + len(rodada)
+            media_casa = (gols_casa / n_partidas)[:, None]
+            media_fora = (gols_fora / n_partidas)[:, None]
+            c, v = previsao_c, previsao_v
+            with np.errstate(invalid='ignore', divide='ignore'):
+                ataque_casa = somas['marcados_casa'][:, c] / somas['jogos_casa'][:, c] / media_casa
+                defesa_casa = somas['sofridos_casa'][:, c] / somas['jogos_casa'][:, c] / media_fora
+                ataque_fora = somas['marcados_fora'][:, v] / somas['jogos_fora'][:, v] / media_fora
+                defesa_fora = somas['sofridos_fora'][:, v] / somas['jogos_fora'][:, v] / media_casa
+            vantagem = vantagens_de_somas(somas['jogos_casa'][:, c], somas['marcados_casa'][:, c], somas['sofridos_casa'][:, c])
+            lambda_c, lambda_v = gols_esperados(ataque_casa, defesa_fora, ataque_fora, defesa_casa, media_casa, media_fora,
+                                                elo[:, c], elo[:, v], vantagem)
+            probs_saida[inicio:inicio + b] = np.stack(probabilidades_resultado(lambda_c, lambda_v), axis=-1)
+
+    acima_demais = len(elo_demais) - np.searchsorted(elo_demais, elo_saida, side='right')
+    acima_envolvidos = (elo_saida[:, None, :] > elo_saida[:, :, None]).sum(axis=2)
+    return {
+        'desfechos': desfechos,
+        'times': envolvidos,
+        'elo': elo_saida,
+        'posicao_elo': 1 + acima_demais + acima_envolvidos,
+        'probs': probs_saida,
+    }
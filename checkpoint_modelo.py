@@ -0,0 +1,111 @@
+"""
+Checkpoint versionado do modelo ajustado, para abrir a interface (e rodar previsao.py) sem refazer o ajuste.
+
+O checkpoint guarda, em um .npz compacto, os arrays do modelo (ratings, forças/somas por time,
+médias da liga e vantagens de casa), o conjunto de parâmetros usado e uma impressão digital dos
+dados (CRC de todo o registro). Na abertura, se a versão, os parâmetros e a impressão digital
+conferem, o modelo é carregado diretamente; caso contrário, o modelo é ajustado do zero e o
+checkpoint é regravado. Partidas aplicadas incrementalmente durante a sessão (que usam a vantagem
+de casa vigente no momento) ficam só em memória e nunca são gravadas como checkpoint.
+"""
+import io
+import os
+import json
+import numpy as np
+
+import modelo
+from arquivos import gravar_atomico, impressao_arquivo, impressao_registro
+from estado_modelo import EstadoModelo
+
+VERSAO_CHECKPOINT = 3
+
+
+def _salvar(caminho, metadados, arrays):
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, metadados=np.array(json.dumps(metadados, sort_keys=True)), **arrays)
+    gravar_atomico(caminho, buffer.getvalue())
+
+
+def _carregar(caminho):
+    if not os.path.exists(caminho):
+        return None, None
+    try:
+        with np.load(caminho, allow_pickle=False) as dados:
+            metadados = json.loads(str(dados['metadados']))
+            arrays = {k: dados[k] for k in dados.files if k != 'metadados'}
+    except (OSError, ValueError, KeyError):
+        return None, None
+    if metadados.get('versao') != VERSAO_CHECKPOINT:
+        return None, None
+    return metadados, arrays
+
+
+def parametros_modelo():
+    return {
+        'ELO_RATING_INICIAL': modelo.ELO_RATING_INICIAL,
+        'ELO_K_FACTOR_BASE': modelo.ELO_K_FACTOR_BASE,
+        'ELO_VANTAGEM_CASA_PADRAO': modelo.ELO_VANTAGEM_CASA_PADRAO,
+        'ELO_INFLUENCE': modelo.ELO_INFLUENCE,
+        'MAX_GOLS_CONSIDERADOS': modelo.MAX_GOLS_CONSIDERADOS,
+    }
+
+
+def carregar_estado(registro, caminho):
+    """
+    Abre o EstadoModelo do registro a partir do checkpoint, ou ajusta o modelo do zero (e regrava o
+    checkpoint) se ele não existir, não for compatível ou não cobrir exatamente o registro atual.
+    Retorna:
+        tuple: (EstadoModelo, origem), com origem 'checkpoint' ou 'ajuste'.
+    """
+    metadados, arrays = _carregar(caminho)
+    if (metadados is not None and metadados.get('parametros') == parametros_modelo()
+            and metadados.get('dados') == impressao_registro(registro, len(registro))):
+        return EstadoModelo.de_arrays(arrays), 'checkpoint'
+
+    estado = EstadoModelo.de_dataframe(registro.para_dataframe())
+    salvar_estado(estado, registro, caminho)
+    return estado, 'ajuste'
+
+
+def salvar_estado(estado, registro, caminho):
+    metadados = {'versao': VERSAO_CHECKPOINT, 'parametros': parametros_modelo(),
+                 'dados': impressao_registro(registro, estado.n_partidas)}
+    _salvar(caminho, metadados, estado.para_arrays())
+
+
+def carregar_contexto(caminho_dados, caminho, parametros, ajustar):
+    """
+    Contexto de previsão (dicionários elo_ratings, forcas_poisson, medias_liga e vantagens_casa)
+    a partir do checkpoint, se a impressão digital do arquivo de dados e os parâmetros conferirem;
+    caso contrário chama ajustar() e grava o checkpoint.
+    Retorna:
+        tuple: (contexto, True se veio do checkpoint)
+    """
+    impressao = impressao_arquivo(caminho_dados)
+    metadados, arrays = _carregar(caminho)
+    if metadados is not None and metadados.get('parametros') == parametros and metadados.get('dados') == impressao:
+        times = arrays['times'].tolist()
+        forcas = arrays['forcas']
+        contexto = {
+            'elo_ratings': {t: float(e) for t, e in zip(times, arrays['elo']) if not np.isnan(e)},
+            'forcas_poisson': {t: {'ataque_casa': float(forcas[i, 0]), 'defesa_casa': float(forcas[i, 1]),
+                                   'ataque_fora': float(forcas[i, 2]), 'defesa_fora': float(forcas[i, 3])}
+                               for i, t in enumerate(times)},
+            'medias_liga': {'gols_casa': float(arrays['medias'][0]), 'gols_fora': float(arrays['medias'][1])},
+            'vantagens_casa': {t: float(v) for t, v in zip(times, arrays['vantagens']) if not np.isnan(v)},
+        }
+        return contexto, True
+
+    contexto = ajustar()
+    times = sorted(set(contexto['forcas_poisson']) | set(contexto['elo_ratings']) | set(contexto['vantagens_casa']))
+    chaves = ['ataque_casa', 'defesa_casa', 'ataque_fora', 'defesa_fora']
+    arrays = {
+        'times': np.array(times, dtype=str),
+        'elo': np.array([contexto['elo_ratings'].get(t, np.nan) for t in times], dtype=np.float64),
+        'forcas': np.array([[contexto['forcas_poisson'].get(t, {}).get(k, np.nan) for k in chaves] for t in times],
+                           dtype=np.float64).reshape(len(times), 4),
+        'medias': np.array([contexto['medias_liga']['gols_casa'], contexto['medias_liga']['gols_fora']], dtype=np.float64),
+        'vantagens': np.array([contexto['vantagens_casa'].get(t, np.nan) for t in times], dtype=np.float64),
+    }
+    _salvar(caminho, {'versao': VERSAO_CHECKPOINT, 'parametros': parametros, 'dados': impressao}, arrays)
+    return contexto, False
@@ -0,0 +1,224 @@
+"""
+Índice de confrontos diretos (head-to-head) por par ordenado mandante × visitante.
+
+As estatísticas ficam em arrays densos times × times (jogos, vitórias, empates, derrotas e gols
+do ponto de vista do mandante), mais um buffer circular com os últimos N resultados de cada par.
+O índice é construído em uma passada vetorizada, atualizado incrementalmente a cada partida e pode
+ser salvo em disco junto com o número de partidas do registro que já cobre e a impressão digital
+desse trecho, de forma que só as partidas novas precisam ser aplicadas ao reabri-lo (e um registro
+reescrito invalida o cache).
+"""
+import io
+import os
+import numpy as np
+import pandas as pd
+
+from arquivos import gravar_atomico, impressao_registro
+
+ULTIMOS_N = 5
+VERSAO_INDICE = 2
+
+# Resultados no buffer, do ponto de vista do mandante
+VITORIA, EMPATE, DERROTA = 0, 1, 2
+SEM_JOGO = -1
+_SIMBOLOS = {VITORIA: 'V', EMPATE: 'E', DERROTA: 'D'}
+
+CONTADORES = ['jogos', 'vitorias', 'empates', 'derrotas', 'gols_mandante', 'gols_visitante']
+
+
+class IndiceConfrontos:
+    """
+    Estatísticas de confronto direto para todos os pares ordenados de times.
+
+    Parâmetros:
+        times (list): Nomes dos times; a posição na lista é o índice nas matrizes.
+        ultimos_n (int): Quantidade de resultados recentes guardados por par.
+    """
+    def __init__(self, times, ultimos_n=ULTIMOS_N):
+        self.times = list(times)
+        self.indice = {t: i for i, t in enumerate(self.times)}
+        self.ultimos_n = ultimos_n
+        n = len(self.times)
+        self.contadores = {k: np.zeros((n, n), dtype=np.int32) for k in CONTADORES}
+        self.ultimos = np.full((n, n, ultimos_n), SEM_JOGO, dtype=np.int8)
+        self.n_partidas = 0
+
+    # --- Construção ---
+
+    @classmethod
+    def de_dataframe(cls, df, ultimos_n=ULTIMOS_N):
+        """
+        Constrói o índice a partir de um DataFrame de partidas (mandante, visitante, gols_mandante, gols_visitante).
+        """
+        times = sorted(pd.unique(df[['mandante', 'visitante']].values.ravel('K')))
+        indice = cls(times, ultimos_n)
+        mapa = {t: i for i, t in enumerate(times)}
+        indice._aplicar_arrays(df['mandante'].map(mapa).to_numpy(), df['visitante'].map(mapa).to_numpy(),
+                               df['gols_mandante'].to_numpy(), df['gols_visitante'].to_numpy())
+        return indice
+
+    @classmethod
+    def de_registro(cls, registro, caminho_cache=None, ultimos_n=ULTIMOS_N):
+        """
+        Abre o índice de um RegistroPartidas, reaproveitando o cache em disco (se existir e a
+        impressão digital do trecho coberto ainda conferir) e aplicando apenas as partidas anexadas
+        depois dele. Os ids de time do registro são usados diretamente como índices.
+        """
+        indice, salvar = None, False
+        if caminho_cache and os.path.exists(caminho_cache):
+            try:
+                indice, crc = cls._carregar(caminho_cache)
+            except (ValueError, KeyError, OSError):
+                indice = None
+            if indice is not None and (indice.n_partidas > len(registro) or indice.ultimos_n != ultimos_n
+                                       or crc != impressao_registro(registro, indice.n_partidas)['crc']):
+                indice = None
+        if indice is None:
+            indice, salvar = cls([], ultimos_n), bool(caminho_cache)
+        if indice.atualizar_de_registro(registro):
+            salvar = bool(caminho_cache)
+        if salvar:
+            indice.salvar(caminho_cache, registro)
+        return indice
+
+    def atualizar_de_registro(self, registro):
+        """
+        Aplica as partidas do registro ainda não cobertas pelo índice.
+        """
+        novos = registro.ler(self.n_partidas)
+        if len(novos) == 0:
+            return 0
+        times = registro.times
+        if self.times != times[:len(self.times)]:
+            raise ValueError("Tabela de times do registro não corresponde ao índice de confrontos.")
+        for time in times[len(self.times):]:
+            self._incluir_time(time)
+        self._aplicar_arrays(novos['mandante'].astype(np.int64), novos['visitante'].astype(np.int64),
+                             novos['gols_mandante'], novos['gols_visitante'])
+        return len(novos)
+
+    def _incluir_time(self, time):
+        n = len(self.times)
+        self.times.append(time)
+        self.indice[time] = n
+        self.contadores = {k: np.pad(v, ((0, 1), (0, 1))) for k, v in self.contadores.items()}
+        self.ultimos = np.pad(self.ultimos, ((0, 1), (0, 1), (0, 0)), constant_values=SEM_JOGO)
+
+    def _aplicar_arrays(self, casa, fora, gols_casa, gols_fora):
+        casa = np.asarray(casa, dtype=np.int64)
+        fora = np.asarray(fora, dtype=np.int64)
+        gols_casa = np.asarray(gols_casa, dtype=np.int64)
+        gols_fora = np.asarray(gols_fora, dtype=np.int64)
+        n = len(self.times)
+        par = casa * n + fora
+        resultado = np.where(gols_casa > gols_fora, VITORIA, np.where(gols_casa == gols_fora, EMPATE, DERROTA))
+
+        # Posição de cada partida na sequência do seu par (0 = primeiro jogo do par neste lote)
+        ordem = np.argsort(par, kind='stable')
+        par_ordenado = par[ordem]
+        inicio_grupo = np.r_[0, np.flatnonzero(np.diff(par_ordenado)) + 1]
+        tamanho_grupo = np.diff(np.r_[inicio_grupo, len(par)])
+        posicao = np.empty(len(par), dtype=np.int64)
+        posicao[ordem] = np.arange(len(par)) - np.repeat(inicio_grupo, tamanho_grupo)
+        total_no_lote = np.bincount(par, minlength=n * n)[par]
+        jogos_antes = self.contadores['jogos'].ravel()[par]
+
+        # Só os últimos N jogos de cada par no lote entram no buffer circular
+        recentes = posicao >= total_no_lote - self.ultimos_n
+        slot = (jogos_antes + posicao) % self.ultimos_n
+        self.ultimos.reshape(n * n, self.ultimos_n)[par[recentes], slot[recentes]] = resultado[recentes]
+
+        def somar(chave, valores):
+            self.contadores[chave].ravel()[:] += np.bincount(par, weights=valores, minlength=n * n).astype(np.int32)
+
+        somar('jogos', np.ones(len(par)))
+        somar('vitorias', resultado == VITORIA)
+        somar('empates', resultado == EMPATE)
+        somar('derrotas', resultado == DERROTA)
+        somar('gols_mandante', gols_casa)
+        somar('gols_visitante', gols_fora)
+        self.n_partidas += len(par)
+
+    def aplicar_partida(self, mandante, visitante, gols_mandante, gols_visitante):
+        for time in (mandante, visitante):
+            if time not in self.indice:
+                self._incluir_time(time)
+        self._aplicar_arrays([self.indice[mandante]], [self.indice[visitante]], [gols_mandante], [gols_visitante])
+
+    # --- Consultas ---
+
+    def consultar(self, mandante, visitante):
+        """
+        Estatísticas do par ordenado (mandante em casa contra visitante), com os últimos resultados
+        do mais antigo para o mais recente ('V', 'E' ou 'D' do ponto de vista do mandante).
+        """
+        if mandante not in self.indice or visitante not in self.indice:
+            return dict({k: 0 for k in CONTADORES}, mandante=mandante, visitante=visitante, ultimos=[])
+        i, j = self.indice[mandante], self.indice[visitante]
+        dados = {k: int(v[i, j]) for k, v in self.contadores.items()}
+        jogos = dados['jogos']
+        inicio = jogos % self.ultimos_n if jogos >= self.ultimos_n else 0
+        buffer = np.roll(self.ultimos[i, j], -inicio)[:min(jogos, self.ultimos_n)]
+        dados.update(mandante=mandante, visitante=visitante, ultimos=[_SIMBOLOS[int(r)] for r in buffer])
+        return dados
+
+    def consultar_par(self, time_a, time_b):
+        """
+        Retrospecto completo de time_a contra time_b, somando os jogos em casa e fora.
+        """
+        casa = self.consultar(time_a, time_b)
+        fora = self.consultar(time_b, time_a)
+        return {
+            'time': time_a,
+            'adversario': time_b,
+            'jogos': casa['jogos'] + fora['jogos'],
+            'vitorias': casa['vitorias'] + fora['derrotas'],
+            'empates': casa['empates'] + fora['empates'],
+            'derrotas': casa['derrotas'] + fora['vitorias'],
+            'gols_pro': casa['gols_mandante'] + fora['gols_visitante'],
+            'gols_contra': casa['gols_visitante'] + fora['gols_mandante'],
+            'ultimos_casa': casa['ultimos'],
+            'ultimos_fora': [{'V': 'D', 'D': 'V', 'E': 'E'}[r] for r in fora['ultimos']],
+        }
+
+    def tabela(self, times=None):
+        """
+        DataFrame com os contadores de todos os pares (mandante, visitante) com ao menos um jogo,
+        opcionalmente restrito a uma lista de times.
+        """
+        idx = np.array([self.indice[t] for t in (times if times is not None else self.times) if t in self.indice], dtype=np.int64)
+        jogos = self.contadores['jogos'][np.ix_(idx, idx)]
+        i, j = np.nonzero(jogos)
+        nomes = np.asarray(self.times, dtype=object)[idx]
+        dados = {k: v[np.ix_(idx, idx)][i, j] for k, v in self.contadores.items()}
+        indice = pd.MultiIndex.from_arrays([nomes[i], nomes[j]], names=['mandante', 'visitante'])
+        return pd.DataFrame(dados, index=indice).sort_index()
+
+    # --- Persistência ---
+
+    def salvar(self, caminho, registro=None):
+        """
+        Grava o índice. Com o registro de origem, guarda também a impressão digital das partidas
+        cobertas, conferida por de_registro.
+        """
+        crc = impressao_registro(registro, self.n_partidas)['crc'] if registro is not None else -1
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, versao=VERSAO_INDICE, times=np.array(self.times, dtype=str), ultimos=self.ultimos,
+                            n_partidas=self.n_partidas, crc_registro=crc, **self.contadores)
+        gravar_atomico(caminho, buffer.getvalue())
+
+    @classmethod
+    def _carregar(cls, caminho):
+        with np.load(caminho, allow_pickle=False) as dados:
+            if int(dados['versao']) != VERSAO_INDICE:
+                raise ValueError(f"Versão do índice de confrontos incompatível: {caminho}")
+            indice = cls(dados['times'].tolist(), dados['ultimos'].shape[2])
+            indice.contadores = {k: dados[k].astype(np.int32) for k in CONTADORES}
+            indice.ultimos = dados['ultimos'].copy()
+            indice.n_partidas = int(dados['n_partidas'])
+            crc = int(dados['crc_registro'])
+        return indice, crc
+
+    @classmethod
+    def carregar(cls, caminho):
+        return cls._carregar(caminho)[0]
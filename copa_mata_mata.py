@@ -0,0 +1,198 @@
+"""
+Simulação de copas em mata-mata (Copa do Brasil, Libertadores) com o modelo híbrido.
+
+Os gols esperados de cada confronto vêm do EstadoModelo (os mesmos de prever_partida_hibrido),
+pré-calculados para todos os pares de times da chave. Cada fase é sorteada para todas as
+simulações de uma vez: os times vivos são uma matriz (simulações × vagas) e os placares de cada
+confronto são arrays. Confrontos de ida e volta somam o agregado, com gols fora como critério
+opcional; empates vão para a prorrogação (taxas de gol proporcionais aos 30 minutos extras) e depois
+para os pênaltis. A final pode ser em jogo único em campo neutro.
+
+Como em simulacao_dinamica, as simulações são divididas em blocos com fluxos aleatórios próprios
+derivados da semente, e o resultado não depende do número de processos.
+
+Uso:
+    python copa_mata_mata.py flamengo palmeiras botafogo bahia ... --simulacoes 1000000 [--gols-fora]
+"""
+import sys
+import argparse
+import multiprocessing
+import numpy as np
+import pandas as pd
+
+from estado_modelo import gols_esperados
+from execucao_blocos import executar_em_blocos
+
+N_SIMULACOES_PADRAO = 1000000
+TAMANHO_BLOCO_SIMULACOES = 50000
+FATOR_PRORROGACAO = 30 / 90
+COBRANCAS_PENALTIS = 5
+CONVERSAO_PENALTI = 0.75
+
+IDA_E_VOLTA, JOGO_UNICO = 'ida_e_volta', 'jogo_unico'
+_NOMES_FASES = {2: 'final', 4: 'semifinal', 8: 'quartas', 16: 'oitavas'}
+
+
+def nome_fase(n_times):
+    return _NOMES_FASES.get(n_times, f'fase de {n_times}')
+
+
+def _matrizes_gols(estado, times):
+    """
+    Gols esperados para todos os pares: casa[i, j] (mandante i contra j), fora[i, j] (visitante j
+    na casa de i) e neutro[i, j] (i contra j em campo neutro, média geométrica dos dois mandos).
+    """
+    idx = np.array([estado.indice[t] for t in times], dtype=np.int64)
+    ataque_casa, defesa_casa, ataque_fora, defesa_fora = estado.forcas_vetor()
+    media_casa, media_fora = estado.medias()
+    c, v = np.meshgrid(idx, idx, indexing='ij')
+    casa, fora = gols_esperados(ataque_casa[c], defesa_fora[v], ataque_fora[v], defesa_casa[c],
+                                media_casa, media_fora, estado.elo[c], estado.elo[v], estado.vantagens_vetor()[c])
+    return casa, fora, np.sqrt(casa * fora.T)
+
+
+def _penaltis(rng, n):
+    """
+    Disputa de pênaltis: cinco cobranças por lado; persistindo o empate, as alternadas são simétricas.
+    Retorna True onde o primeiro time vence.
+    """
+    a = rng.binomial(COBRANCAS_PENALTIS, CONVERSAO_PENALTI, n)
+    b = rng.binomial(COBRANCAS_PENALTIS, CONVERSAO_PENALTI, n)
+    return np.where(a != b, a > b, rng.random(n) < 0.5)
+
+
+def _decidir_empate(rng, vence_a, decidido, lambda_a, lambda_b, gols_fora_a=False):
+    """
+    Prorrogação (e pênaltis) só para os confrontos ainda empatados. Com gols_fora_a, os gols de A
+    na prorrogação (disputada na casa de B) desempatam quando a prorrogação termina empatada.
+    """
+    vence_a = vence_a.copy()
+    pendentes = np.flatnonzero(~decidido)
+    lambda_a, lambda_b = lambda_a.ravel()[pendentes], lambda_b.ravel()[pendentes]
+    extra_a = rng.poisson(lambda_a * FATOR_PRORROGACAO)
+    extra_b = rng.poisson(lambda_b * FATOR_PRORROGACAO)
+    resultado = extra_a > extra_b
+    resolvido = extra_a != extra_b
+    if gols_fora_a:
+        resultado |= ~resolvido & (extra_a > 0)
+        resolvido |= extra_a > 0
+    sem_decisao = np.flatnonzero(~resolvido)
+    resultado[sem_decisao] = _penaltis(rng, len(sem_decisao))
+    vence_a.ravel()[pendentes] = resultado
+    return vence_a
+
+
+def _simular_bloco(args):
+    parametros, n_simulacoes, semente = args
+    rng = np.random.default_rng(semente)
+    casa, fora, neutro = parametros['casa'], parametros['fora'], parametros['neutro']
+    n_times = len(casa)
+    vivos = np.broadcast_to(np.arange(n_times, dtype=np.int16), (n_simulacoes, n_times))
+    alcance = np.zeros((n_times, len(parametros['fases']) + 1), dtype=np.int64)
+    alcance[:, 0] = n_simulacoes
+
+    for f, (formato, campo_neutro) in enumerate(parametros['fases']):
+        a, b = vivos[:, 0::2], vivos[:, 1::2]
+        if formato == IDA_E_VOLTA:
+            # Ida na casa de A, volta na casa de B
+            ida_a, ida_b = rng.poisson(casa[a, b]), rng.poisson(fora[a, b])
+            volta_b, volta_a = rng.poisson(casa[b, a]), rng.poisson(fora[b, a])
+            agregado_a, agregado_b = ida_a + volta_a, ida_b + volta_b
+            vence_a, decidido = agregado_a > agregado_b, agregado_a != agregado_b
+            if parametros['gols_fora']:
+                vence_a = np.where(~decidido & (volta_a != ida_b), volta_a > ida_b, vence_a)
+                decidido = decidido | (volta_a != ida_b)
+            vence_a = _decidir_empate(rng, vence_a, decidido, fora[b, a], casa[b, a], parametros['gols_fora'])
+        else:
+            lambda_a, lambda_b = (neutro[a, b], neutro[b, a]) if campo_neutro else (casa[a, b], fora[a, b])
+            gols_a, gols_b = rng.poisson(lambda_a), rng.poisson(lambda_b)
+            vence_a = _decidir_empate(rng, gols_a > gols_b, gols_a != gols_b, lambda_a, lambda_b)
+        vivos = np.where(vence_a, a, b)
+        alcance[:, f + 1] = np.bincount(vivos.ravel(), minlength=n_times)
+    return alcance, vivos[:, 0]
+
+
+def simular_copa(estado, chave, fases=None, gols_fora=False, final_neutra=True,
+                 n_simulacoes=N_SIMULACOES_PADRAO, semente=None, processos=1):
+    """
+    Simula uma chave de mata-mata.
+
+    Parâmetros:
+        estado (EstadoModelo): Estado atual do modelo (todos os times da chave precisam existir nele).
+        chave (list): Times na ordem da chave (potência de 2); vizinhos se enfrentam e o primeiro de
+            cada par manda o jogo de ida.
+        fases (list): Formato de cada fase, IDA_E_VOLTA ou JOGO_UNICO (padrão: ida e volta, final em jogo único).
+        gols_fora (bool): Aplica o critério de gols fora de casa nos confrontos de ida e volta.
+        final_neutra (bool): Final em jogo único disputada em campo neutro.
+        n_simulacoes (int): Número de copas simuladas.
+        semente (int): Semente para reprodutibilidade.
+        processos (int): Número de processos.
+    Retorna:
+        dict: 'times', 'fases' (nomes), 'alcance' (times × fases+1, contagens de quem chega a cada
+        fase; a última coluna é o título) e 'campeao' (índice do campeão em cada simulação).
+    """
+    chave = list(chave)
+    n_fases = len(chave).bit_length() - 1
+    if len(chave) < 2 or len(chave) != 2 ** n_fases:
+        raise ValueError("A chave precisa ter uma potência de 2 times (2, 4, 8, 16...).")
+    if fases is None:
+        fases = [IDA_E_VOLTA] * (n_fases - 1) + [JOGO_UNICO]
+    if len(fases) != n_fases:
+        raise ValueError(f"Uma chave de {len(chave)} times tem {n_fases} fases.")
+    desconhecidos = [t for t in chave if t not in estado.indice]
+    if desconhecidos:
+        raise ValueError(f"Times sem partidas no registro: {', '.join(desconhecidos)}")
+
+    casa, fora, neutro = _matrizes_gols(estado, chave)
+    parametros = {
+        'casa': casa, 'fora': fora, 'neutro': neutro, 'gols_fora': gols_fora,
+        'fases': [(formato, final_neutra and f == n_fases - 1) for f, formato in enumerate(fases)],
+    }
+
+    blocos = executar_em_blocos(_simular_bloco, parametros, n_simulacoes, semente, processos, TAMANHO_BLOCO_SIMULACOES)
+
+    return {
+        'times': chave,
+        'fases': [nome_fase(len(chave) >> f) for f in range(n_fases)] + ['campeao'],
+        'alcance': sum(b[0] for b in blocos),
+        'campeao': np.concatenate([b[1] for b in blocos]),
+    }
+
+
+def resumir_copa(resultado):
+    """
+    Probabilidade de cada time chegar a cada fase (a primeira coluna, a fase inicial, é omitida).
+    """
+    alcance = resultado['alcance'] / resultado['alcance'][:, :1]
+    resumo = pd.DataFrame(alcance[:, 1:], columns=[f'prob_{f}' for f in resultado['fases'][1:]],
+                          index=pd.Index(resultado['times'], name='time'))
+    return resumo.sort_values(resumo.columns[-1], ascending=False)
+
+
+def main(argv=None):
+    from modelo import CHECKPOINT_PATH, abrir_registro
+    from checkpoint_modelo import carregar_estado
+    from dados import normalizar_time
+    parser = argparse.ArgumentParser(description="Simula uma copa em mata-mata com o modelo híbrido.")
+    parser.add_argument('chave', nargs='+', help="Times na ordem da chave (vizinhos se enfrentam)")
+    parser.add_argument('--simulacoes', type=int, default=N_SIMULACOES_PADRAO)
+    parser.add_argument('--semente', type=int, default=None)
+    parser.add_argument('--processos', type=int, default=1)
+    parser.add_argument('--gols-fora', action='store_true', help="Critério de gols fora de casa")
+    parser.add_argument('--jogo-unico', action='store_true', help="Todas as fases em jogo único")
+    parser.add_argument('--final-ida-e-volta', action='store_true', help="Final em ida e volta")
+    args = parser.parse_args(argv)
+
+    n_fases = len(args.chave).bit_length() - 1
+    fases = [JOGO_UNICO if args.jogo_unico else IDA_E_VOLTA] * (n_fases - 1)
+    fases.append(IDA_E_VOLTA if args.final_ida_e_volta else JOGO_UNICO)
+    estado, _ = carregar_estado(abrir_registro(), CHECKPOINT_PATH)
+    resultado = simular_copa(estado, [normalizar_time(t) for t in args.chave], fases, args.gols_fora,
+                             n_simulacoes=args.simulacoes, semente=args.semente, processos=args.processos)
+    print(f"# Simulação de Copa em Mata-Mata ({args.simulacoes} simulações)\n")
+    print(resumir_copa(resultado).round(4).to_markdown())
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main(sys.argv[1:])
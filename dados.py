@@ -0,0 +1,273 @@
+"""
+Carregamento e normalização dos datasets de partidas.
+
+Os arquivos do projeto usam esquemas diferentes (br-25.csv, brasileiro-2025.csv e
+campeonato-brasileiro-full.csv); este módulo converte todos para um formato comum com as colunas
+mandante, visitante, gols_mandante, gols_visitante, rodada, data e temporada.
+
+CSVs com coluna de data são lidos a partir de uma cópia particionada por temporada (diretório
+<arquivo>.particoes), ordenada por data, com um índice das faixas de datas e das posições (linhas e
+bytes) de cada temporada. Pedir temporadas ou um intervalo de datas lê só as partições
+correspondentes; partições vizinhas são lidas em um único trecho contíguo do arquivo. A cópia é
+refeita automaticamente quando o CSV de origem muda.
+"""
+import io
+import os
+import csv
+import json
+import pandas as pd
+
+from arquivos import TravaArquivo, gravar_atomico, impressao_arquivo
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DATASETS_PADRAO = [
+    os.path.join(BASE_DIR, 'br-25.csv'),
+    os.path.join(BASE_DIR, 'brasileiro-2025.csv'),
+    os.path.join(BASE_DIR, 'campeonato-brasileiro-full.csv'),
+]
+
+COLUNAS_NORMALIZADAS = ['mandante', 'visitante', 'gols_mandante', 'gols_visitante', 'rodada', 'data', 'temporada']
+COLUNAS_OBRIGATORIAS = ['mandante', 'visitante', 'gols_mandante', 'gols_visitante']
+COLUNAS_CLASSIFICACAO = ['pontos', 'vitorias', 'saldo', 'gols_pro']
+_RENOMEAR_COLUNAS = {'mandante_Placar': 'gols_mandante', 'visitante_Placar': 'gols_visitante', 'rodata': 'rodada'}
+
+VERSAO_PARTICOES = 1
+_ARQUIVO_PARTIDAS = 'partidas.csv'
+_ARQUIVO_INDICE = 'indice.json'
+_ARQUIVO_TRAVA = 'trava'
+
+
+def temporada_das_datas(datas):
+    """
+    Temporada de cada data. Temporadas que atravessam o ano (ex.: 2020, encerrada em fevereiro
+    de 2021) ficam no ano de início.
+    """
+    ano = datas.dt.year
+    return ano.where(datas.dt.month > 2, ano - 1).astype('Int64')
+
+
+def normalizar_time(nome):
+    """
+    Nome de time no formato usado em todo o projeto: sem espaços nas pontas e em minúsculas.
+    Valores ausentes (None, NaN) e nomes em branco devolvem None: continuam ausentes, e não 'nan'.
+    """
+    if nome is None or (not isinstance(nome, str) and pd.isna(nome)):
+        return None
+    nome = str(nome).strip().lower()
+    return nome or None
+
+
+def normalizar_colunas(df, origem=''):
+    """
+    Normalizador único das entradas de partidas (CSVs do projeto, importação em lote, registro):
+    renomeia as colunas do esquema completo, mantém só mandante, visitante, gols e, se houver,
+    rodada e data, e normaliza os nomes dos times com normalizar_time. Placares não são convertidos.
+    Lança:
+        ValueError: Se faltar alguma das COLUNAS_OBRIGATORIAS.
+    """
+    df = df.rename(columns=_RENOMEAR_COLUNAS)
+    faltando = [c for c in COLUNAS_OBRIGATORIAS if c not in df.columns]
+    if faltando:
+        raise ValueError(f"Colunas ausentes em {origem}: {', '.join(faltando)}")
+    colunas = COLUNAS_OBRIGATORIAS + [c for c in ('rodada', 'data') if c in df.columns]
+    df = df[colunas].copy()
+    df['mandante'] = df['mandante'].map(normalizar_time)
+    df['visitante'] = df['visitante'].map(normalizar_time)
+    return df.reset_index(drop=True)
+
+
+def normalizar_partidas(df):
+    """
+    Converte um DataFrame em qualquer dos esquemas do projeto para o formato comum.
+    Nomes de times são normalizados (normalizar_colunas) e linhas sem placar são descartadas.
+    Parâmetros:
+        df (pd.DataFrame): DataFrame lido de um dos CSVs do projeto.
+    Retorna:
+        pd.DataFrame: DataFrame com as colunas de COLUNAS_NORMALIZADAS.
+    """
+    df = normalizar_colunas(df).dropna(subset=['gols_mandante', 'gols_visitante'])
+    saida = pd.DataFrame({
+        'mandante': df['mandante'],
+        'visitante': df['visitante'],
+        'gols_mandante': df['gols_mandante'].astype(int),
+        'gols_visitante': df['gols_visitante'].astype(int),
+    })
+    saida['rodada'] = df['rodada'].astype(int) if 'rodada' in df.columns else 0
+    if 'data' in df.columns:
+        saida['data'] = pd.to_datetime(df['data'], dayfirst=True, errors='coerce')
+        saida['temporada'] = temporada_das_datas(saida['data'])
+    else:
+        saida['data'] = pd.NaT
+        saida['temporada'] = pd.array([pd.NA] * len(saida), dtype='Int64')
+    return saida.reset_index(drop=True)
+
+
+def ler_classificacao(caminho):
+    """
+    Lê a classificação atual de um CSV com colunas time e pontos e, opcionalmente, vitorias, saldo
+    e gols_pro (critérios de desempate; colunas ausentes valem 0).
+    Retorna:
+        dict: Por time (nomes normalizados), dicionário com COLUNAS_CLASSIFICACAO.
+    Lança:
+        ValueError: Se faltar a coluna time ou pontos.
+    """
+    df = pd.read_csv(caminho)
+    faltando = [c for c in ('time', 'pontos') if c not in df.columns]
+    if faltando:
+        raise ValueError(f"Colunas ausentes em {caminho}: {', '.join(faltando)}")
+    for coluna in COLUNAS_CLASSIFICACAO:
+        if coluna not in df.columns:
+            df[coluna] = 0
+    df[COLUNAS_CLASSIFICACAO] = df[COLUNAS_CLASSIFICACAO].fillna(0)
+    return {normalizar_time(linha['time']): {c: int(linha[c]) for c in COLUNAS_CLASSIFICACAO}
+            for linha in df.to_dict('records')}
+
+
+def ler_pontos_iniciais(caminho):
+    """
+    Lê a classificação atual de um CSV com colunas time e pontos.
+    Retorna:
+        dict: Pontos por time (nomes normalizados).
+    """
+    return {t: c['pontos'] for t, c in ler_classificacao(caminho).items()}
+
+
+def _caminho_particoes(caminho):
+    return caminho + '.particoes'
+
+
+def particionar_csv(caminho):
+    """
+    Grava a cópia do CSV ordenada por data e particionada por temporada, com o índice das partições.
+    Linhas sem data válida ficam em uma última partição com temporada None.
+    Retorna:
+        dict: O índice gravado.
+    """
+    diretorio = _caminho_particoes(caminho)
+    os.makedirs(diretorio, exist_ok=True)
+    # Reparticionamentos concorrentes são serializados; a impressão digital é tirada antes da
+    # leitura, para que uma alteração durante a cópia force um novo particionamento
+    with TravaArquivo(os.path.join(diretorio, _ARQUIVO_TRAVA)):
+        fonte = impressao_arquivo(caminho)
+        bruto = pd.read_csv(caminho, sep=',', encoding='utf-8', dtype=str, keep_default_na=False)
+        datas = pd.to_datetime(bruto['data'].str.strip(), dayfirst=True, errors='coerce')
+        temporadas = temporada_das_datas(datas)
+        ordem = datas.reset_index(drop=True).sort_values(kind='stable', na_position='last').index
+        bruto, datas, temporadas = bruto.iloc[ordem], datas.iloc[ordem], temporadas.iloc[ordem]
+
+        cabecalho = bruto.iloc[:0].to_csv(index=False, quoting=csv.QUOTE_MINIMAL).encode('utf-8')
+        trechos, particoes, posicao, linha = [cabecalho], [], len(cabecalho), 0
+        # Após a ordenação por data cada temporada é um trecho contíguo (sem data por último)
+        chave = temporadas.fillna(-1).to_numpy()
+        inicios = [0] + [i for i in range(1, len(chave)) if chave[i] != chave[i - 1]] + [len(chave)]
+        for inicio, fim in zip(inicios[:-1], inicios[1:]):
+            trecho = bruto.iloc[inicio:fim].to_csv(index=False, header=False, quoting=csv.QUOTE_MINIMAL).encode('utf-8')
+            trechos.append(trecho)
+            temporada = temporadas.iloc[inicio]
+            datas_particao = datas.iloc[inicio:fim]
+            particoes.append({
+                'temporada': None if pd.isna(temporada) else int(temporada),
+                'inicio': posicao, 'fim': posicao + len(trecho),
+                'primeira_linha': linha, 'n_linhas': fim - inicio,
+                'data_min': None if datas_particao.isna().all() else datas_particao.min().strftime('%Y-%m-%d'),
+                'data_max': None if datas_particao.isna().all() else datas_particao.max().strftime('%Y-%m-%d'),
+            })
+            posicao += len(trecho)
+            linha += fim - inicio
+        gravar_atomico(os.path.join(diretorio, _ARQUIVO_PARTIDAS), b''.join(trechos))
+
+        # O índice é gravado por último: é ele que torna a nova cópia válida
+        indice = {'versao': VERSAO_PARTICOES, 'fonte': fonte, 'particoes': particoes}
+        gravar_atomico(os.path.join(diretorio, _ARQUIVO_INDICE), json.dumps(indice, indent=1).encode('utf-8'))
+    return indice
+
+
+def indice_particoes(caminho):
+    """
+    Índice das partições do CSV, (re)particionando se necessário. Retorna None se o CSV não
+    tem coluna de data (ex.: br-25.csv).
+    """
+    if 'data' not in pd.read_csv(caminho, sep=',', encoding='utf-8', nrows=0).columns:
+        return None
+    try:
+        with open(os.path.join(_caminho_particoes(caminho), _ARQUIVO_INDICE), 'r', encoding='utf-8') as f:
+            indice = json.load(f)
+        if indice.get('versao') == VERSAO_PARTICOES and indice.get('fonte') == impressao_arquivo(caminho):
+            return indice
+    except (OSError, ValueError):
+        pass
+    return particionar_csv(caminho)
+
+
+def temporadas_disponiveis(caminho):
+    """
+    Temporadas presentes no CSV, em ordem (lista vazia se o arquivo não tem datas).
+    """
+    indice = indice_particoes(caminho)
+    return [p['temporada'] for p in indice['particoes'] if p['temporada'] is not None] if indice else []
+
+
+def carregar_csv(caminho, temporadas=None, desde=None, ate=None):
+    """
+    Lê o CSV no esquema original (sem normalizar), em ordem de data, opcionalmente restrito a
+    temporadas e/ou a um intervalo de datas. Só as partições necessárias são lidas do disco.
+
+    Parâmetros:
+        caminho (str): CSV de partidas.
+        temporadas (iterable): Temporadas desejadas (ano de início).
+        desde, ate (str ou date): Limites inclusivos de data ('aaaa-mm-dd' ou date).
+    Retorna:
+        pd.DataFrame: As linhas selecionadas, com as mesmas colunas do CSV.
+    """
+    indice = indice_particoes(caminho)
+    if indice is None:
+        if temporadas is not None or desde is not None or ate is not None:
+            raise ValueError(f"{caminho} não tem coluna de data para filtrar por temporada ou período.")
+        return pd.read_csv(caminho, sep=',', encoding='utf-8')
+
+    desde = pd.Timestamp(desde) if desde is not None else None
+    ate = pd.Timestamp(ate) if ate is not None else None
+    temporadas = set(temporadas) if temporadas is not None else None
+    filtrado = temporadas is not None or desde is not None or ate is not None
+    trechos = []
+    for p in indice['particoes']:
+        if filtrado and p['data_min'] is None:
+            continue
+        if temporadas is not None and p['temporada'] not in temporadas:
+            continue
+        if desde is not None and pd.Timestamp(p['data_max']) < desde:
+            continue
+        if ate is not None and pd.Timestamp(p['data_min']) > ate:
+            continue
+        # Partições vizinhas no arquivo viram um único trecho
+        if trechos and trechos[-1][1] == p['inicio']:
+            trechos[-1][1] = p['fim']
+        else:
+            trechos.append([p['inicio'], p['fim']])
+
+    with open(os.path.join(_caminho_particoes(caminho), _ARQUIVO_PARTIDAS), 'rb') as f:
+        conteudo = [f.readline()]
+        for inicio, fim in trechos:
+            f.seek(inicio)
+            conteudo.append(f.read(fim - inicio))
+    df = pd.read_csv(io.BytesIO(b''.join(conteudo)), sep=',', encoding='utf-8')
+
+    if desde is not None or ate is not None:
+        # Só as partições das pontas precisam do filtro por linha
+        datas = pd.to_datetime(df['data'], dayfirst=True, errors='coerce')
+        mascara = pd.Series(True, index=df.index)
+        if desde is not None:
+            mascara &= datas >= desde
+        if ate is not None:
+            mascara &= datas <= ate
+        df = df[mascara].reset_index(drop=True)
+    return df
+
+
+def carregar_dataset(caminho, temporadas=None, desde=None, ate=None):
+    """
+    Lê um CSV de partidas em qualquer dos esquemas do projeto e retorna o DataFrame normalizado,
+    opcionalmente restrito a temporadas e/ou a um intervalo de datas (ver carregar_csv).
+    """
+    return normalizar_partidas(carregar_csv(caminho, temporadas, desde, ate))
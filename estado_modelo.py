@@ -0,0 +1,278 @@
+"""
+Estado do modelo híbrido (Elo dinâmico + forças de Poisson) indexado por time.
+
+As forças de Poisson e as vantagens de casa são derivadas de somas por time (jogos, gols marcados
+e sofridos em casa e fora), de modo que novas partidas atualizam o estado em tempo constante, sem
+recarregar o histórico. Os valores derivados são idênticos aos de calcular_forcas_poisson e
+calcular_vantagens_casa; o Elo de partidas aplicadas incrementalmente usa a vantagem de casa
+vigente no momento da partida (a reconstrução completa usa a do histórico inteiro).
+"""
+import math
+import numpy as np
+import pandas as pd
+
+from modelo import (
+    ELO_RATING_INICIAL, ELO_K_FACTOR_BASE, ELO_VANTAGEM_CASA_PADRAO, ELO_INFLUENCE, MAX_GOLS_CONSIDERADOS,
+    calcular_vantagens_casa, calcular_elo_dinamico
+)
+
+SOMAS = ['jogos_casa', 'marcados_casa', 'sofridos_casa', 'jogos_fora', 'marcados_fora', 'sofridos_fora']
+
+
+def atualizar_ratings_elo_vetor(rating_casa, rating_visitante, placar_casa, placar_visitante, vantagem_casa_time):
+    """
+    Versão vetorizada de atualizar_ratings_elo: aceita arrays de mesmo formato e retorna os novos ratings.
+    """
+    margem_gols = np.abs(placar_casa - placar_visitante)
+    resultado_real_casa = np.where(placar_casa > placar_visitante, 1.0, np.where(placar_casa < placar_visitante, 0.0, 0.5))
+    k_ajustado = np.where(margem_gols > 0, ELO_K_FACTOR_BASE * np.log(margem_gols + 1), ELO_K_FACTOR_BASE)
+    expectativa_casa = 1 / (1 + 10 ** ((rating_visitante - (rating_casa + vantagem_casa_time)) / 400))
+    delta = k_ajustado * (resultado_real_casa - expectativa_casa)
+    return rating_casa + delta, rating_visitante - delta
+
+
+def vantagens_de_somas(jogos_casa, marcados_casa, sofridos_casa):
+    """
+    Vantagem de casa (pontos Elo) a partir das somas por time, com a regra de calcular_vantagens_casa.
+    Times sem jogos como mandante recebem ELO_VANTAGEM_CASA_PADRAO.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        saldo_medio = (marcados_casa - sofridos_casa) / jogos_casa
+    vantagens = np.where(saldo_medio > 0, 60 * np.abs(saldo_medio) ** 0.8, 0.0)
+    return np.where(jogos_casa > 0, vantagens, ELO_VANTAGEM_CASA_PADRAO)
+
+
+def gols_esperados(ataque_casa, defesa_fora, ataque_fora, defesa_casa, media_casa, media_fora,
+                   elo_casa, elo_visitante, vantagem_casa):
+    """
+    Gols esperados de mandante e visitante como em prever_partida_hibrido, para escalares ou arrays.
+    """
+    elo_diff = (elo_casa + vantagem_casa) - elo_visitante
+    gols_casa = ataque_casa * defesa_fora * media_casa * np.maximum(0.1, 1 + (elo_diff / 1000) * ELO_INFLUENCE)
+    gols_visitante = ataque_fora * defesa_casa * media_fora * np.maximum(0.1, 1 - (elo_diff / 1000) * ELO_INFLUENCE)
+    return gols_casa, gols_visitante
+
+
+def probabilidades_resultado(lambda_casa, lambda_fora):
+    """
+    Probabilidades (vitória mandante, empate, vitória visitante) para vetores de gols esperados,
+    somando a matriz de placares até MAX_GOLS_CONSIDERADOS e normalizando como prever_partida_hibrido.
+    """
+    placares = matriz_placares(lambda_casa, lambda_fora)
+    vitoria_casa = np.tril(placares, -1).sum(axis=(-2, -1))
+    empate = np.trace(placares, axis1=-2, axis2=-1)
+    vitoria_fora = np.triu(placares, 1).sum(axis=(-2, -1))
+    total = vitoria_casa + empate + vitoria_fora
+    return vitoria_casa / total, empate / total, vitoria_fora / total
+
+
+def matriz_placares(lambda_casa, lambda_fora):
+    """
+    Matriz de probabilidades de placar (gols mandante × gols visitante) até MAX_GOLS_CONSIDERADOS,
+    sem normalizar. Aceita escalares ou arrays; as duas últimas dimensões são os placares.
+    """
+    gols = np.arange(MAX_GOLS_CONSIDERADOS + 1)
+    fatoriais = np.array([math.factorial(g) for g in gols], dtype=np.float64)
+    lambda_casa = np.asarray(lambda_casa, dtype=np.float64)[..., None]
+    lambda_fora = np.asarray(lambda_fora, dtype=np.float64)[..., None]
+    pmf_casa = np.exp(-lambda_casa) * lambda_casa ** gols / fatoriais
+    pmf_fora = np.exp(-lambda_fora) * lambda_fora ** gols / fatoriais
+    return pmf_casa[..., :, None] * pmf_fora[..., None, :]
+
+
+class EstadoModelo:
+    """
+    Ratings Elo e somas por time que determinam as forças de Poisson e as vantagens de casa.
+
+    Parâmetros:
+        times (list): Nomes dos times; a posição na lista é o índice nos arrays.
+        somas (dict): Arrays por time para cada chave de SOMAS.
+        elo (np.ndarray): Rating Elo de cada time.
+        n_partidas (int): Total de partidas consideradas.
+        total_gols_casa (float): Soma dos gols de mandantes.
+        total_gols_fora (float): Soma dos gols de visitantes.
+        jogos_pares (np.ndarray): Contagem de jogos por par (mandante × visitante), usada no xG.
+    """
+    def __init__(self, times, somas, elo, n_partidas, total_gols_casa, total_gols_fora, jogos_pares=None):
+        self.times = list(times)
+        self.indice = {t: i for i, t in enumerate(self.times)}
+        self.somas = {k: np.asarray(somas[k], dtype=np.float64) for k in SOMAS}
+        self.elo = np.asarray(elo, dtype=np.float64)
+        n = len(self.times)
+        self.jogos_pares = np.zeros((n, n), dtype=np.int32) if jogos_pares is None else np.asarray(jogos_pares, dtype=np.int32)
+        self.n_partidas = n_partidas
+        self.total_gols_casa = total_gols_casa
+        self.total_gols_fora = total_gols_fora
+
+    @classmethod
+    def de_dataframe(cls, df, calcular_elo=True):
+        """
+        Constrói o estado a partir das partidas (reconstrução completa do Elo). Com calcular_elo=False
+        os ratings ficam no valor inicial, para quem só precisa das forças.
+        """
+        times = sorted(pd.unique(df[['mandante', 'visitante']].values.ravel('K')))
+        indice = {t: i for i, t in enumerate(times)}
+        casa = df['mandante'].map(indice).to_numpy()
+        fora = df['visitante'].map(indice).to_numpy()
+        gm = df['gols_mandante'].to_numpy(dtype=np.float64)
+        gv = df['gols_visitante'].to_numpy(dtype=np.float64)
+        n = len(times)
+        somas = {
+            'jogos_casa': np.bincount(casa, minlength=n).astype(np.float64),
+            'marcados_casa': np.bincount(casa, weights=gm, minlength=n),
+            'sofridos_casa': np.bincount(casa, weights=gv, minlength=n),
+            'jogos_fora': np.bincount(fora, minlength=n).astype(np.float64),
+            'marcados_fora': np.bincount(fora, weights=gv, minlength=n),
+            'sofridos_fora': np.bincount(fora, weights=gm, minlength=n),
+        }
+        jogos_pares = np.bincount(casa * n + fora, minlength=n * n).reshape(n, n)
+        if calcular_elo:
+            elo_dict = calcular_elo_dinamico(df, calcular_vantagens_casa(df))
+            elo = np.array([elo_dict.get(t, ELO_RATING_INICIAL) for t in times])
+        else:
+            elo = np.full(n, ELO_RATING_INICIAL, dtype=np.float64)
+        return cls(times, somas, elo, len(df), float(gm.sum()), float(gv.sum()), jogos_pares)
+
+    def copiar(self):
+        return EstadoModelo(self.times, {k: v.copy() for k, v in self.somas.items()}, self.elo.copy(),
+                            self.n_partidas, self.total_gols_casa, self.total_gols_fora, self.jogos_pares.copy())
+
+    # --- Atualização incremental ---
+
+    def indice_time(self, time):
+        """
+        Retorna o índice do time, incluindo-o no estado (sem jogos, Elo inicial) se ainda não existir.
+        """
+        if time not in self.indice:
+            self.indice[time] = len(self.times)
+            self.times.append(time)
+            self.somas = {k: np.append(v, 0.0) for k, v in self.somas.items()}
+            self.elo = np.append(self.elo, ELO_RATING_INICIAL)
+            self.jogos_pares = np.pad(self.jogos_pares, ((0, 1), (0, 1)))
+        return self.indice[time]
+
+    def aplicar_partida(self, mandante, visitante, gols_mandante, gols_visitante):
+        c = self.indice_time(mandante)
+        v = self.indice_time(visitante)
+        vantagem_c = self.vantagem(c)
+        self.elo[c], self.elo[v] = atualizar_ratings_elo_vetor(self.elo[c], self.elo[v], gols_mandante, gols_visitante, vantagem_c)
+        self.somas['jogos_casa'][c] += 1
+        self.somas['marcados_casa'][c] += gols_mandante
+        self.somas['sofridos_casa'][c] += gols_visitante
+        self.somas['jogos_fora'][v] += 1
+        self.somas['marcados_fora'][v] += gols_visitante
+        self.somas['sofridos_fora'][v] += gols_mandante
+        self.jogos_pares[c, v] += 1
+        self.n_partidas += 1
+        self.total_gols_casa += gols_mandante
+        self.total_gols_fora += gols_visitante
+
+    def aplicar_partidas(self, df):
+        """
+        Aplica as partidas de um DataFrame em ordem, atualizando Elo e somas incrementalmente.
+        """
+        for time_c, time_v, placar_c, placar_v in zip(df['mandante'], df['visitante'], df['gols_mandante'], df['gols_visitante']):
+            self.aplicar_partida(time_c, time_v, int(placar_c), int(placar_v))
+
+    # --- Valores derivados ---
+
+    def medias(self):
+        return self.total_gols_casa / self.n_partidas, self.total_gols_fora / self.n_partidas
+
+    def forcas_vetor(self):
+        """
+        Forças por time como arrays (ataque_casa, defesa_casa, ataque_fora, defesa_fora).
+        """
+        s = self.somas
+        media_casa, media_fora = self.medias()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (s['marcados_casa'] / s['jogos_casa'] / media_casa,
+                    s['sofridos_casa'] / s['jogos_casa'] / media_fora,
+                    s['marcados_fora'] / s['jogos_fora'] / media_fora,
+                    s['sofridos_fora'] / s['jogos_fora'] / media_casa)
+
+    def vantagens_vetor(self):
+        return vantagens_de_somas(self.somas['jogos_casa'], self.somas['marcados_casa'], self.somas['sofridos_casa'])
+
+    def vantagem(self, i):
+        return float(vantagens_de_somas(self.somas['jogos_casa'][i:i + 1], self.somas['marcados_casa'][i:i + 1],
+                                        self.somas['sofridos_casa'][i:i + 1])[0])
+
+    def forcas_poisson(self):
+        """
+        Forças no formato de calcular_forcas_poisson.
+        """
+        ataque_casa, defesa_casa, ataque_fora, defesa_fora = self.forcas_vetor()
+        return {t: {'ataque_casa': ataque_casa[i], 'defesa_casa': defesa_casa[i],
+                    'ataque_fora': ataque_fora[i], 'defesa_fora': defesa_fora[i]}
+                for i, t in enumerate(self.times)}
+
+    def medias_liga(self):
+        media_casa, media_fora = self.medias()
+        return {'gols_casa': media_casa, 'gols_fora': media_fora}
+
+    def vantagens_casa(self):
+        """
+        Vantagens no formato de calcular_vantagens_casa (apenas times com jogos como mandante).
+        """
+        vantagens = self.vantagens_vetor()
+        return {t: vantagens[i] for i, t in enumerate(self.times) if self.somas['jogos_casa'][i] > 0}
+
+    def elo_ratings(self):
+        return {t: self.elo[i] for i, t in enumerate(self.times)}
+
+    def prever_jogos(self, jogos):
+        """
+        Previsão vetorizada para uma lista de jogos (mandante, visitante) conhecidos pelo estado.
+        Retorna:
+            dict: Arrays 'gols_esperados_mandante', 'gols_esperados_visitante', 'prob_mandante',
+            'prob_empate' e 'prob_visitante', na ordem dos jogos.
+        """
+        c = np.array([self.indice[m] for m, _ in jogos], dtype=np.int64)
+        v = np.array([self.indice[vis] for _, vis in jogos], dtype=np.int64)
+        ataque_casa, defesa_casa, ataque_fora, defesa_fora = self.forcas_vetor()
+        media_casa, media_fora = self.medias()
+        gols_c, gols_v = gols_esperados(ataque_casa[c], defesa_fora[v], ataque_fora[v], defesa_casa[c],
+                                        media_casa, media_fora, self.elo[c], self.elo[v], self.vantagens_vetor()[c])
+        prob_c, prob_e, prob_v = probabilidades_resultado(gols_c, gols_v)
+        return {'gols_esperados_mandante': gols_c, 'gols_esperados_visitante': gols_v,
+                'prob_mandante': prob_c, 'prob_empate': prob_e, 'prob_visitante': prob_v}
+
+    def xg_por_clube(self):
+        """
+        xG total e médio por jogo de cada clube sobre todas as partidas do estado, com a mesma
+        convenção de calcular_xg_por_clube (sem Elo e com a vantagem de casa padrão). Cada soma
+        sobre partidas vira um produto da matriz de jogos por par pelos vetores de forças.
+        Retorna:
+            tuple: (dict xG total por clube, dict xG médio por jogo)
+        """
+        ataque_casa, defesa_casa, ataque_fora, defesa_fora = self.forcas_vetor()
+        media_casa, media_fora = self.medias()
+        fator_casa, fator_fora = gols_esperados(1.0, 1.0, 1.0, 1.0, media_casa, media_fora,
+                                                ELO_RATING_INICIAL, ELO_RATING_INICIAL, ELO_VANTAGEM_CASA_PADRAO)
+        pares = self.jogos_pares.astype(np.float64)
+        # Times sem jogos fora/em casa têm força NaN, mas a linha/coluna correspondente de pares é zero
+        xg_casa = fator_casa * ataque_casa * (pares @ np.nan_to_num(defesa_fora))
+        xg_fora = fator_fora * ataque_fora * (pares.T @ np.nan_to_num(defesa_casa))
+        xg_casa = np.where(self.somas['jogos_casa'] > 0, xg_casa, 0.0)
+        xg_fora = np.where(self.somas['jogos_fora'] > 0, xg_fora, 0.0)
+        jogos = self.somas['jogos_casa'] + self.somas['jogos_fora']
+        xg_total = xg_casa + xg_fora
+        xg_medio = np.divide(xg_total, jogos, out=np.zeros_like(xg_total), where=jogos > 0)
+        com_jogos = [i for i in range(len(self.times)) if jogos[i] > 0]
+        return ({self.times[i]: xg_total[i] for i in com_jogos}, {self.times[i]: xg_medio[i] for i in com_jogos})
+
+    # --- Serialização ---
+
+    def para_arrays(self):
+        """
+        Arrays que descrevem completamente o estado (usados pelo checkpoint).
+        """
+        return dict(self.somas, times=np.array(self.times, dtype=str), elo=self.elo, jogos_pares=self.jogos_pares,
+                    totais=np.array([self.n_partidas, self.total_gols_casa, self.total_gols_fora], dtype=np.float64))
+
+    @classmethod
+    def de_arrays(cls, arrays):
+        n_partidas, total_gols_casa, total_gols_fora = arrays['totais']
+        return cls(arrays['times'].tolist(), {k: arrays[k] for k in SOMAS}, arrays['elo'],
+                   int(n_partidas), float(total_gols_casa), float(total_gols_fora), arrays['jogos_pares'])
@@ -0,0 +1,32 @@
+"""
+Execução de simulações em blocos reprodutíveis.
+
+As simulações são divididas em blocos de tamanho fixo, cada um com um fluxo de números aleatórios
+próprio derivado da semente (SeedSequence.spawn). Os blocos podem ser distribuídos entre processos
+sem alterar o resultado, que depende só da semente e do tamanho do bloco.
+"""
+import multiprocessing
+import numpy as np
+
+
+def executar_em_blocos(funcao, parametros, n_simulacoes, semente, processos, tamanho_bloco):
+    """
+    Parâmetros:
+        funcao (callable): Função de nível de módulo (para ser enviada aos processos) que recebe a
+            tupla (parametros, n_simulacoes_do_bloco, semente_do_bloco).
+        parametros: Dados comuns a todos os blocos.
+        n_simulacoes (int): Total de simulações.
+        semente (int): Semente para reprodutibilidade.
+        processos (int): Número de processos.
+        tamanho_bloco (int): Simulações por bloco.
+    Retorna:
+        list: O resultado de cada bloco, na ordem dos blocos.
+    """
+    n_blocos = -(-n_simulacoes // tamanho_bloco)
+    sementes = np.random.SeedSequence(semente).spawn(n_blocos)
+    tamanhos = [min(tamanho_bloco, n_simulacoes - b * tamanho_bloco) for b in range(n_blocos)]
+    tarefas = [(parametros, n, s) for n, s in zip(tamanhos, sementes)]
+    if processos == 1 or len(tarefas) == 1:
+        return [funcao(t) for t in tarefas]
+    with multiprocessing.Pool(processes=processos) as pool:
+        return pool.map(funcao, tarefas, chunksize=1)
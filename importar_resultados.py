@@ -0,0 +1,105 @@
+"""
+Importação em lote de resultados (uma rodada ou uma temporada) a partir de CSV ou JSON lines.
+
+Os resultados são validados contra os times conhecidos, gravados no registro de partidas em uma
+única anexação atômica e aplicados incrementalmente, na ordem das partidas, ao estado do modelo e
+ao índice de confrontos, sem reconstruir o histórico.
+
+Uso:
+    python importar_resultados.py rodada.csv [--permitir-novos]
+    python importar_resultados.py rodada.jsonl
+"""
+import os
+import sys
+import argparse
+import pandas as pd
+
+from dados import normalizar_colunas, normalizar_time
+
+
+def ler_resultados(caminho):
+    """
+    Lê resultados de um CSV (esquema de br-25.csv ou de campeonato-brasileiro-full.csv) ou de um
+    arquivo JSON lines (.jsonl/.json, um objeto por linha com as mesmas chaves).
+    Retorna:
+        pd.DataFrame: Colunas mandante, visitante, gols_mandante, gols_visitante e, se houver, rodada e data.
+    """
+    if os.path.splitext(caminho)[1].lower() in ('.jsonl', '.json'):
+        df = pd.read_json(caminho, lines=True, dtype=False)
+    else:
+        df = pd.read_csv(caminho, dtype=str)
+    return normalizar_colunas(df, caminho)
+
+
+def validar_resultados(df, times_validos, permitir_novos=False):
+    """
+    Valida nomes de times e placares. Retorna a lista de erros (vazia se tudo estiver correto)
+    e converte os gols para inteiros no próprio DataFrame.
+    """
+    erros = []
+    for linha, (mandante, visitante) in enumerate(zip(df['mandante'], df['visitante']), start=1):
+        if normalizar_time(mandante) is None or normalizar_time(visitante) is None:
+            erros.append(f"Linha {linha}: mandante e visitante são obrigatórios.")
+        elif mandante == visitante:
+            erros.append(f"Linha {linha}: mandante e visitante iguais ({mandante}).")
+        elif not permitir_novos:
+            for time in (mandante, visitante):
+                if time not in times_validos:
+                    erros.append(f"Linha {linha}: time desconhecido '{time}'.")
+    for coluna in ('gols_mandante', 'gols_visitante'):
+        gols = pd.to_numeric(df[coluna], errors='coerce')
+        invalidos = gols.isna() | (gols < 0) | (gols != gols.round())
+        for linha in (invalidos[invalidos].index + 1):
+            erros.append(f"Linha {linha}: {coluna} deve ser inteiro positivo ou zero.")
+        if not invalidos.any():
+            df[coluna] = gols.astype(int)
+    return erros
+
+
+def importar_resultados(df, registro, estado=None, confrontos=None, permitir_novos=False):
+    """
+    Grava os resultados no registro em uma única anexação e atualiza estado e confrontos.
+
+    Parâmetros:
+        df (pd.DataFrame): Resultados lidos por ler_resultados.
+        registro (RegistroPartidas): Registro de partidas de destino.
+        estado (EstadoModelo): Estado do modelo a atualizar incrementalmente (opcional).
+        confrontos (IndiceConfrontos): Índice de confrontos a atualizar (opcional).
+        permitir_novos (bool): Aceita times que ainda não aparecem no registro.
+    Retorna:
+        pd.DataFrame: Os resultados importados, com gols inteiros.
+    Lança:
+        ValueError: Se houver erros de validação (nada é gravado nesse caso).
+    """
+    times_validos = set(estado.times) if estado is not None else set(registro.times)
+    erros = validar_resultados(df, times_validos, permitir_novos)
+    if erros:
+        raise ValueError("\n".join(erros))
+    if df.empty:
+        return df
+    registro.anexar_lote(df.to_dict('records'))
+    if estado is not None:
+        estado.aplicar_partidas(df)
+    if confrontos is not None:
+        confrontos.atualizar_de_registro(registro)
+    return df
+
+
+def main(argv=None):
+    from modelo import abrir_registro
+    parser = argparse.ArgumentParser(description="Importa resultados em lote para o registro de partidas.")
+    parser.add_argument('arquivo', help="CSV ou JSON lines com mandante, visitante, gols_mandante e gols_visitante")
+    parser.add_argument('--permitir-novos', action='store_true', help="Aceita times que ainda não existem no registro")
+    args = parser.parse_args(argv)
+
+    try:
+        df = importar_resultados(ler_resultados(args.arquivo), abrir_registro(), permitir_novos=args.permitir_novos)
+    except ValueError as e:
+        print(f"Erro na importação:\n{e}", file=sys.stderr)
+        return 1
+    print(f"{len(df)} partidas importadas de {args.arquivo}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,152 @@
+"""
+Núcleo do modelo híbrido (Elo dinâmico + Poisson), sem dependência da interface.
+
+Reúne os parâmetros do modelo, o cálculo de vantagens de casa, Elo e forças de Poisson, a previsão
+de uma partida e a abertura do registro de partidas. A interface (sassamaru.py) e as ferramentas de
+linha de comando importam daqui.
+"""
+import sys
+import os
+import math
+import pandas as pd
+from registro_partidas import RegistroPartidas
+
+def get_base_dir():
+    try:
+        if getattr(sys, 'frozen', False):
+            base_dir = os.path.dirname(sys.executable)
+        else:
+            base_dir = os.path.dirname(os.path.abspath(__file__))
+    except Exception:
+        base_dir = os.getcwd()
+    return base_dir
+
+BASE_DIR = get_base_dir()
+CSV_PATH = os.path.join(BASE_DIR, 'br-25.csv')
+REGISTRO_PATH = os.path.join(BASE_DIR, 'br-25.partidas')
+CONFRONTOS_PATH = os.path.join(BASE_DIR, 'br-25.confrontos.npz')
+CHECKPOINT_PATH = os.path.join(BASE_DIR, 'br-25.modelo.npz')
+
+MAX_GOLS_CONSIDERADOS = 8
+
+# Elo parameters
+ELO_RATING_INICIAL = 1500
+ELO_K_FACTOR_BASE = 30
+ELO_VANTAGEM_CASA_PADRAO = 80
+ELO_INFLUENCE = 0.35
+
+# --- Elo dynamic calculation functions ---
+
+def calcular_vantagens_casa(df):
+    vantagens = {}
+    times = pd.unique(df['mandante'])
+    for time in times:
+        jogos_casa = df[df['mandante'] == time]
+        saldo_de_gols_medio = (jogos_casa['gols_mandante'] - jogos_casa['gols_visitante']).mean()
+        vantagem_rating = 60 * (saldo_de_gols_medio ** 0.8) if saldo_de_gols_medio > 0 else 0
+        vantagens[time] = max(0, vantagem_rating)
+    return vantagens
+
+def atualizar_ratings_elo(rating_casa, rating_visitante, placar_casa, placar_visitante, vantagem_casa_time):
+    if placar_casa > placar_visitante:
+        resultado_real_casa, margem_gols = 1.0, placar_casa - placar_visitante
+    elif placar_casa < placar_visitante:
+        resultado_real_casa, margem_gols = 0.0, placar_visitante - placar_casa
+    else:
+        resultado_real_casa, margem_gols = 0.5, 0
+
+    k_ajustado = ELO_K_FACTOR_BASE * math.log(margem_gols + 1) if margem_gols > 0 else ELO_K_FACTOR_BASE
+
+    expectativa_casa = 1 / (1 + 10 ** ((rating_visitante - (rating_casa + vantagem_casa_time)) / 400))
+
+    novo_rating_casa = rating_casa + k_ajustado * (resultado_real_casa - expectativa_casa)
+    novo_rating_visitante = rating_visitante + k_ajustado * ((1.0 - resultado_real_casa) - (1 - expectativa_casa))
+    return novo_rating_casa, novo_rating_visitante
+
+def calcular_elo_dinamico(df, vantagens_casa):
+    elo_ratings = {}
+    for time_c, time_v, placar_c, placar_v in zip(df['mandante'], df['visitante'], df['gols_mandante'], df['gols_visitante']):
+        rating_c = elo_ratings.get(time_c, ELO_RATING_INICIAL)
+        rating_v = elo_ratings.get(time_v, ELO_RATING_INICIAL)
+        vantagem_c = vantagens_casa.get(time_c, ELO_VANTAGEM_CASA_PADRAO)
+        novo_rating_c, novo_rating_v = atualizar_ratings_elo(rating_c, rating_v, placar_c, placar_v, vantagem_c)
+        elo_ratings[time_c], elo_ratings[time_v] = novo_rating_c, novo_rating_v
+    return elo_ratings
+
+# --- Poisson force calculation ---
+
+def calcular_forcas_poisson(df):
+    forcas = {}
+    media_gols_marcados_casa = df['gols_mandante'].mean()
+    media_gols_sofridos_casa = df['gols_visitante'].mean()
+    media_gols_marcados_fora = df['gols_visitante'].mean()
+    media_gols_sofridos_fora = df['gols_mandante'].mean()
+    times = pd.unique(df[['mandante', 'visitante']].values.ravel('K'))
+
+    for time in times:
+        forcas[time] = {
+            'ataque_casa': (df[df['mandante'] == time]['gols_mandante'].mean() / media_gols_marcados_casa),
+            'defesa_casa': (df[df['mandante'] == time]['gols_visitante'].mean() / media_gols_sofridos_casa),
+            'ataque_fora': (df[df['visitante'] == time]['gols_visitante'].mean() / media_gols_marcados_fora),
+            'defesa_fora': (df[df['visitante'] == time]['gols_mandante'].mean() / media_gols_sofridos_fora)
+        }
+    medias_liga = {'gols_casa': media_gols_marcados_casa, 'gols_fora': media_gols_marcados_fora}
+    return forcas, medias_liga
+
+def poisson(gols_esperados, num_gols):
+    return (gols_esperados ** num_gols) * math.exp(-gols_esperados) / math.factorial(num_gols)
+
+# --- Híbrido: previsão usando Elo dinâmico + Poisson ---
+
+def prever_partida_hibrido(time_casa, time_visitante, elo_ratings, forcas_poisson, medias_liga, vantagens_casa):
+    if time_casa not in forcas_poisson or time_visitante not in forcas_poisson:
+        return None
+
+    ataque_casa = forcas_poisson[time_casa]['ataque_casa']
+    defesa_visitante = forcas_poisson[time_visitante]['defesa_fora']
+    gols_base_casa = ataque_casa * defesa_visitante * medias_liga['gols_casa']
+
+    ataque_visitante = forcas_poisson[time_visitante]['ataque_fora']
+    defesa_casa = forcas_poisson[time_casa]['defesa_casa']
+    gols_base_visitante = ataque_visitante * defesa_casa * medias_liga['gols_fora']
+
+    rating_casa = elo_ratings.get(time_casa, ELO_RATING_INICIAL)
+    rating_visitante = elo_ratings.get(time_visitante, ELO_RATING_INICIAL)
+    vantagem_time_casa = vantagens_casa.get(time_casa, ELO_VANTAGEM_CASA_PADRAO)
+
+    elo_diff = (rating_casa + vantagem_time_casa) - rating_visitante
+    fator_ajuste_casa = 1 + (elo_diff / 1000) * ELO_INFLUENCE
+    fator_ajuste_visitante = 1 - (elo_diff / 1000) * ELO_INFLUENCE
+
+    gols_finais_casa = gols_base_casa * max(0.1, fator_ajuste_casa)
+    gols_finais_visitante = gols_base_visitante * max(0.1, fator_ajuste_visitante)
+
+    prob_vitoria_casa, prob_empate, prob_vitoria_visitante = 0, 0, 0
+    for g_c in range(MAX_GOLS_CONSIDERADOS + 1):
+        for g_v in range(MAX_GOLS_CONSIDERADOS + 1):
+            prob_placar = poisson(gols_finais_casa, g_c) * poisson(gols_finais_visitante, g_v)
+            if g_c > g_v: prob_vitoria_casa += prob_placar
+            elif g_c == g_v: prob_empate += prob_placar
+            else: prob_vitoria_visitante += prob_placar
+
+    total_prob = prob_vitoria_casa + prob_empate + prob_vitoria_visitante
+    prob_vitoria_casa /= total_prob
+    prob_empate /= total_prob
+    prob_vitoria_visitante /= total_prob
+
+    return {
+        'mandante': time_casa,
+        'visitante': time_visitante,
+        'prob_mandante': prob_vitoria_casa,
+        'prob_empate': prob_empate,
+        'prob_visitante': prob_vitoria_visitante,
+        'gols_esperados_mandante': gols_finais_casa,
+        'gols_esperados_visitante': gols_finais_visitante
+    }
+
+def abrir_registro():
+    registro = RegistroPartidas(REGISTRO_PATH)
+    if len(registro) == 0:
+        # Na primeira execução o registro binário é preenchido a partir do CSV (uma única vez, sob a trava)
+        registro = RegistroPartidas.importar_csv(CSV_PATH, REGISTRO_PATH, se_vazio=True)
+    return registro
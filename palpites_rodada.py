@@ -0,0 +1,118 @@
+"""
+Distribuição exata do número de palpites certos em uma rodada e probabilidades de bilhetes combinados.
+
+Cada jogo é um acerto independente com probabilidade p_i (a do resultado ou do placar escolhido),
+então o total de acertos segue uma Poisson-binomial. A distribuição é obtida por programação
+dinâmica, convoluindo um jogo de cada vez: O(n²) para n jogos, sem simulação e sem ruído de
+Monte Carlo. Os bilhetes podem ser por resultado (Mandante/Empate/Visitante, inclusive duplos
+como 'ME') ou por placar exato, usando a matriz de placares de cada jogo.
+"""
+import numpy as np
+import pandas as pd
+
+RESULTADOS = {'M': 0, 'E': 1, 'V': 2}
+_PALPITE_PARA_CODIGO = {'Mandante': 'M', 'Empate': 'E', 'Visitante': 'V'}
+
+
+def distribuicao_acertos(probs_acerto):
+    """
+    Distribuição exata do número de acertos (Poisson-binomial).
+
+    Parâmetros:
+        probs_acerto (array-like): Probabilidade de acerto de cada jogo; dimensões extras à
+            esquerda são tratadas como rodadas independentes (shape (..., n)).
+    Retorna:
+        np.ndarray: shape (..., n + 1), com P(exatamente k acertos) na posição k.
+    """
+    p = np.asarray(probs_acerto, dtype=np.float64)
+    n = p.shape[-1]
+    dist = np.zeros(p.shape[:-1] + (n + 1,))
+    dist[..., 0] = 1.0
+    for i in range(n):
+        pi = p[..., i, None]
+        # Convolução com (1 - p_i, p_i): ou o jogo i erra (k fica) ou acerta (k sobe um)
+        dist[..., 1:i + 2] = dist[..., 1:i + 2] * (1 - pi) + dist[..., :i + 1] * pi
+        dist[..., 0] *= 1 - p[..., i]
+    return dist
+
+
+def probs_palpites(probs_resultado, palpites=None):
+    """
+    Probabilidade de acerto de cada jogo para bilhetes por resultado.
+
+    Parâmetros:
+        probs_resultado (array-like): shape (n, 3), com P(mandante), P(empate) e P(visitante).
+        palpites (list): Por jogo, uma string com os resultados marcados ('M', 'E', 'V' ou
+            combinações como 'ME'); 'Mandante'/'Empate'/'Visitante' também são aceitos.
+            Padrão: o resultado mais provável de cada jogo (o Palpite das tabelas).
+    Retorna:
+        np.ndarray: Probabilidade de acerto de cada jogo.
+    """
+    probs = np.asarray(probs_resultado, dtype=np.float64)
+    if palpites is None:
+        return probs.max(axis=1)
+    marcados = np.zeros(probs.shape, dtype=bool)
+    for i, palpite in enumerate(palpites):
+        for codigo in _PALPITE_PARA_CODIGO.get(palpite, palpite):
+            marcados[i, RESULTADOS[codigo]] = True
+    return np.where(marcados, probs, 0.0).sum(axis=1)
+
+
+def placares_mais_provaveis(matrizes):
+    """
+    Placar mais provável de cada jogo a partir das matrizes de placares (shape (n, G, G)).
+    Retorna:
+        list: Tuplas (gols mandante, gols visitante).
+    """
+    matrizes = np.asarray(matrizes)
+    posicoes = matrizes.reshape(len(matrizes), -1).argmax(axis=1)
+    return [tuple(int(g) for g in divmod(p, matrizes.shape[-1])) for p in posicoes]
+
+
+def probs_placares(matrizes, placares=None):
+    """
+    Probabilidade de acerto de cada jogo para bilhetes de placar exato.
+
+    Parâmetros:
+        matrizes (array-like): Matrizes de placares por jogo (shape (n, G, G)), normalizadas ou não.
+        placares (list): Placar marcado em cada jogo (gols mandante, gols visitante); padrão: o mais provável.
+    Retorna:
+        np.ndarray: Probabilidade de acerto de cada jogo (0 para placares fora da matriz).
+    """
+    matrizes = np.asarray(matrizes, dtype=np.float64)
+    matrizes = matrizes / matrizes.sum(axis=(-2, -1), keepdims=True)
+    if placares is None:
+        placares = placares_mais_provaveis(matrizes)
+    limite = matrizes.shape[-1]
+    return np.array([matrizes[i, gc, gv] if gc < limite and gv < limite else 0.0
+                     for i, (gc, gv) in enumerate(placares)])
+
+
+def resumo_acertos(probs_acerto):
+    """
+    Tabela com P(exatamente k) e P(pelo menos k) acertos, para k = 0..n.
+    """
+    dist = distribuicao_acertos(probs_acerto)
+    return pd.DataFrame({
+        'Acertos': np.arange(len(dist)),
+        'P(exatamente) %': dist * 100,
+        'P(pelo menos) %': dist[::-1].cumsum()[::-1] * 100,
+    })
+
+
+def texto_md_acertos(probs_acerto, titulo):
+    """
+    Seção em Markdown com o número esperado de acertos, a chance de gabaritar e a distribuição completa.
+    """
+    probs_acerto = np.asarray(probs_acerto, dtype=np.float64)
+    tabela = resumo_acertos(probs_acerto)
+    linhas = [
+        f"## {titulo}\n",
+        f"Acertos esperados: {probs_acerto.sum():.2f} de {len(probs_acerto)} | "
+        f"P(acertar todos): {np.prod(probs_acerto) * 100:.4f}%\n",
+        "| Acertos | P(exatamente) % | P(pelo menos) % |",
+        "|--------:|----------------:|----------------:|",
+    ]
+    for k, exato, pelo_menos in tabela.itertuples(index=False):
+        linhas.append(f"| {k:7d} | {exato:15.2f} | {pelo_menos:15.2f} |")
+    return "\n".join(linhas) + "\n"
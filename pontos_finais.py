@@ -0,0 +1,149 @@
+"""
+Distribuição exata dos pontos finais de cada time por convolução sobre os jogos restantes.
+
+Cada jogo contribui para o mandante com o polinômio P(vitória)·x³ + P(empate)·x + P(derrota)
+(e o simétrico para o visitante); a distribuição dos pontos de um time é o produto dos polinômios
+dos seus jogos. As convoluções são feitas para todos os times ao mesmo tempo: os jogos de cada
+time são alinhados em colunas (com o polinômio identidade como preenchimento) e cada coluna é
+aplicada ao array times × pontos com três deslocamentos. O resultado é exato (dadas as
+probabilidades fixas de cada jogo, sem Elo dinâmico) e serve de referência sem ruído para as
+simulações.
+
+Uso:
+    python pontos_finais.py jogos_restantes.csv --corte 70 --corte 45
+"""
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+
+PONTOS_VITORIA, PONTOS_EMPATE = 3, 1
+QUANTIS_PADRAO = (0.05, 0.5, 0.95)
+
+
+def distribuicao_pontos(times, jogos, prob_mandante, prob_empate, prob_visitante):
+    """
+    Distribuição dos pontos a conquistar por time nos jogos informados.
+
+    Parâmetros:
+        times (list): Times considerados (linhas do resultado).
+        jogos (list): Tuplas (mandante, visitante).
+        prob_mandante, prob_empate, prob_visitante (array-like): Probabilidades de cada jogo.
+    Retorna:
+        np.ndarray: shape (times, 3 * max_jogos + 1), com P(time faz k pontos) na coluna k.
+    """
+    indice = {t: i for i, t in enumerate(times)}
+    n_times = len(times)
+    prob_mandante = np.asarray(prob_mandante, dtype=np.float64)
+    prob_empate = np.asarray(prob_empate, dtype=np.float64)
+    prob_visitante = np.asarray(prob_visitante, dtype=np.float64)
+
+    # Coeficientes por (time, jogo do time): P(3 pontos), P(1 ponto), P(0 ponto)
+    equipe = np.array([indice[t] for m, v in jogos for t in (m, v)], dtype=np.int64)
+    vitoria = np.ravel(np.column_stack([prob_mandante, prob_visitante]))
+    empate = np.repeat(prob_empate, 2)
+    derrota = np.ravel(np.column_stack([prob_visitante, prob_mandante]))
+    jogos_por_time = np.bincount(equipe, minlength=n_times)
+    max_jogos = int(jogos_por_time.max(initial=0))
+
+    # Coluna de cada jogo dentro da lista de jogos do seu time
+    ordem = np.argsort(equipe, kind='stable')
+    coluna = np.empty(len(equipe), dtype=np.int64)
+    coluna[ordem] = np.arange(len(equipe)) - np.repeat(np.cumsum(jogos_por_time) - jogos_por_time, jogos_por_time)
+    p3, p1 = np.zeros((n_times, max_jogos)), np.zeros((n_times, max_jogos))
+    p0 = np.ones((n_times, max_jogos))
+    p3[equipe, coluna], p1[equipe, coluna], p0[equipe, coluna] = vitoria, empate, derrota
+
+    dist = np.zeros((n_times, PONTOS_VITORIA * max_jogos + 1))
+    dist[:, 0] = 1.0
+    for j in range(max_jogos):
+        anterior = dist.copy()
+        dist *= p0[:, j, None]
+        dist[:, PONTOS_EMPATE:] += anterior[:, :-PONTOS_EMPATE] * p1[:, j, None]
+        dist[:, PONTOS_VITORIA:] += anterior[:, :-PONTOS_VITORIA] * p3[:, j, None]
+    return dist
+
+
+def distribuicao_pontos_estado(estado, jogos):
+    """
+    distribuicao_pontos com as probabilidades de cada jogo previstas pelo EstadoModelo.
+    Retorna:
+        tuple: (times, matriz de distribuição)
+    """
+    previsao = estado.prever_jogos(jogos)
+    times = sorted({t for jogo in jogos for t in jogo})
+    return times, distribuicao_pontos(times, jogos, previsao['prob_mandante'], previsao['prob_empate'],
+                                      previsao['prob_visitante'])
+
+
+def resumir_pontos(times, dist, pontos_iniciais=None, quantis=QUANTIS_PADRAO, cortes=()):
+    """
+    Pontos esperados, quantis e P(pontos finais >= corte) por time.
+
+    Parâmetros:
+        times (list): Times (linhas de dist).
+        dist (np.ndarray): Saída de distribuicao_pontos.
+        pontos_iniciais (dict): Pontos já conquistados por time (padrão: 0).
+        quantis (tuple): Quantis dos pontos finais.
+        cortes (tuple): Linhas de corte (ex.: pontuação de título ou de rebaixamento).
+    Retorna:
+        pd.DataFrame: Uma linha por time, ordenada pelos pontos esperados.
+    """
+    iniciais = np.array([(pontos_iniciais or {}).get(t, 0) for t in times], dtype=np.int64)
+    pontos = np.arange(dist.shape[1])
+    acumulada = dist.cumsum(axis=1)
+    # P(pontos >= k) para k = 0..max, com P(>= 0) = 1
+    cauda = np.hstack([np.ones((len(times), 1)), 1 - acumulada[:, :-1]])
+    resumo = {
+        'pontos_atuais': iniciais,
+        'pontos_esperados': iniciais + dist @ pontos,
+        'desvio_padrao': np.sqrt(np.maximum(dist @ pontos ** 2 - (dist @ pontos) ** 2, 0)),
+    }
+    for q in quantis:
+        resumo[f'q{int(round(q * 100)):02d}'] = iniciais + (acumulada < q - 1e-12).sum(axis=1)
+    for corte in cortes:
+        necessario = np.clip(corte - iniciais, 0, dist.shape[1])
+        resumo[f'P(>={corte})'] = np.hstack([cauda, np.zeros((len(times), 1))])[np.arange(len(times)), necessario]
+    return pd.DataFrame(resumo, index=pd.Index(times, name='time')).sort_values('pontos_esperados', ascending=False)
+
+
+def comparar_com_amostras(times, dist, times_amostras, pontos_amostras):
+    """
+    Compara pontos amostrados (ex.: resultado['pontos'] de simulacao_dinamica) com a distribuição
+    exata: diferença das médias e maior distância entre as distribuições acumuladas (KS).
+    """
+    amostras = np.asarray(pontos_amostras, dtype=np.int64)
+    indice = {t: i for i, t in enumerate(times_amostras)}
+    linhas = {}
+    for i, t in enumerate(times):
+        p = amostras[:, indice[t]]
+        empirica = np.bincount(p, minlength=dist.shape[1])[:dist.shape[1]] / len(p)
+        linhas[t] = {
+            'media_exata': dist[i] @ np.arange(dist.shape[1]),
+            'media_amostras': p.mean(),
+            'ks': np.abs(np.cumsum(empirica) - np.cumsum(dist[i])).max(),
+        }
+    return pd.DataFrame.from_dict(linhas, orient='index').rename_axis('time')
+
+
+def main(argv=None):
+    from modelo import CHECKPOINT_PATH, abrir_registro
+    from checkpoint_modelo import carregar_estado
+    from dados import normalizar_time, ler_pontos_iniciais
+    parser = argparse.ArgumentParser(description="Distribuição exata dos pontos finais sobre os jogos restantes.")
+    parser.add_argument('jogos', help="CSV com colunas mandante e visitante")
+    parser.add_argument('--pontos', help="CSV com colunas time e pontos (pontuação atual)")
+    parser.add_argument('--corte', type=int, action='append', default=[], help="Linha de corte (pode repetir)")
+    args = parser.parse_args(argv)
+
+    df_jogos = pd.read_csv(args.jogos)
+    jogos = list(zip(df_jogos['mandante'].map(normalizar_time), df_jogos['visitante'].map(normalizar_time)))
+    pontos_iniciais = ler_pontos_iniciais(args.pontos) if args.pontos else None
+    estado, _ = carregar_estado(abrir_registro(), CHECKPOINT_PATH)
+    times, dist = distribuicao_pontos_estado(estado, jogos)
+    print(f"# Distribuição Exata dos Pontos Finais ({len(jogos)} jogos restantes)\n")
+    print(resumir_pontos(times, dist, pontos_iniciais, cortes=args.corte).round(3).to_markdown())
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -4,6 +4,8 @@ Inclui funções para calcular forças de ataque/defesa, vantagens de casa, prev
 """
 import math
 import pandas as pd
+from checkpoint_modelo import carregar_contexto
+from palpites_rodada import probs_palpites, texto_md_acertos
 
 ELO_RATING_INICIAL = 1500
 ELO_K_FACTOR_BASE = 30
@@ -132,7 +134,9 @@ def prever_partida_hibrido(time_casa, time_visitante, context):
         'P(Mandante)%': f"{prob_vitoria_casa / total_prob * 100:.1f}",
         'P(Empate)%': f"{prob_empate / total_prob * 100:.1f}",
         'P(Visitante)%': f"{prob_vitoria_visitante / total_prob * 100:.1f}",
-        'Palpite': palpite
+        'Palpite': palpite,
+        # Probabilidades sem arredondamento, para cálculos sobre a rodada
+        'Probabilidades': [p / total_prob for p in probs]
     }
 
 def atualizar_ratings_elo(rating_c, rating_v, placar_c, placar_v, vantagem_c):
@@ -164,8 +168,13 @@ def atualizar_ratings_elo(rating_c, rating_v, placar_c, placar_v, vantagem_c):
     novo_rating_v = rating_v + k * ((1 - resultado_real) - exp_v)
     return novo_rating_c, novo_rating_v
 
-def main():
-    df = pd.read_csv('sassamaru-br-25/br-25.csv')
+def ajustar_contexto(caminho_csv):
+    """
+    Lê o CSV de partidas e ajusta o modelo completo (forças, vantagens de casa e Elo dinâmico).
+    Retorna:
+        dict: Contexto no formato esperado por prever_partida_hibrido.
+    """
+    df = pd.read_csv(caminho_csv)
     df['mandante'] = df['mandante'].str.strip().str.lower()
     df['visitante'] = df['visitante'].str.strip().str.lower()
     df['gols_mandante'] = df['gols_mandante'].astype(int)
@@ -181,6 +190,25 @@ def main():
         vantagem_c = vantagens_casa.get(time_c, ELO_VANTAGEM_CASA_PADRAO)
         novo_rating_c, novo_rating_v = atualizar_ratings_elo(rating_c, rating_v, placar_c, placar_v, vantagem_c)
         elo_ratings[time_c], elo_ratings[time_v] = novo_rating_c, novo_rating_v
+    return {
+        'elo_ratings': elo_ratings,
+        'forcas_poisson': forcas_poisson,
+        'medias_liga': medias_liga,
+        'vantagens_casa': vantagens_casa
+    }
+
+def main():
+    caminho_csv = 'sassamaru-br-25/br-25.csv'
+    parametros = {
+        'ELO_RATING_INICIAL': ELO_RATING_INICIAL,
+        'ELO_K_FACTOR_BASE': ELO_K_FACTOR_BASE,
+        'ELO_VANTAGEM_CASA_PADRAO': ELO_VANTAGEM_CASA_PADRAO,
+        'POISSON_MAX_GOLS': POISSON_MAX_GOLS,
+        'ELO_INFLUENCE': ELO_INFLUENCE,
+    }
+    # O ajuste só é refeito quando o CSV ou os parâmetros mudam
+    context, _ = carregar_contexto(caminho_csv, caminho_csv + '.previsao.npz', parametros,
+                                   lambda: ajustar_contexto(caminho_csv))
 
     jogos = [
         ('internacional','vitoria'),
@@ -195,16 +223,12 @@ def main():
         ('mirassol','fluminense')
     ]
     resultados = []
-    context = {
-        'elo_ratings': elo_ratings,
-        'forcas_poisson': forcas_poisson,
-        'medias_liga': medias_liga,
-        'vantagens_casa': vantagens_casa
-    }
+    probs = []
     for casa, visita in jogos:
         try:
             r = prever_partida_hibrido(casa, visita, context)
             resultados.append(r)
+            probs.append(r['Probabilidades'])
         except Exception as e:
             print(f"Erro na previsão {casa} x {visita}: {e}")
     df_resultados = pd.DataFrame(resultados)
@@ -241,5 +265,8 @@ def main():
     print("# Previsão de Jogos - Modelo Híbrido Poisson + Elo\n")
     print(df_resultados.to_markdown(index=False))
 
+    print()
+    print(texto_md_acertos(probs_palpites(probs, df_resultados['Palpite'].tolist()), "Acertos de Palpites na Rodada"))
+
 if __name__ == "__main__":
     main()
@@ -1,5 +1,7 @@
+import os
 import pandas as pd
 import math
+from dados import carregar_dataset
 
 # Parâmetros do Elo
 ELO_INICIAL = 1500
@@ -14,10 +16,8 @@ clubes_foco = [
 ]
 
 # Carregar e normalizar dados
-df = pd.read_csv('sassamaru-br-25\campeonato-brasileiro-full.csv', sep=',', encoding='utf-8')
-df['mandante'] = df['mandante'].str.strip().str.lower()
-df['visitante'] = df['visitante'].str.strip().str.lower()
-df['resultado'] = df['resultado'].str.strip().str.lower()
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'campeonato-brasileiro-full.csv')
+df = carregar_dataset(CSV_PATH)
 
 def calcular_vantagens(df):
     v = {}
@@ -0,0 +1,315 @@
+"""
+Registro binário append-only de partidas.
+
+Cada partida ocupa um registro de largura fixa (ids dos times, gols, rodada e data), e a leitura
+é feita via memória mapeada, sem copiar os dados. As anexações são atômicas: os registros são
+gravados e sincronizados com fsync antes de o cabeçalho ser atualizado, e o cabeçalho possui dois
+slots com geração e CRC, de forma que uma queda no meio da gravação mantém o último estado válido.
+A tabela de nomes dos times fica em um arquivo lateral JSON, substituído atomicamente.
+"""
+import os
+import csv
+import json
+import struct
+import zlib
+import datetime
+import numpy as np
+import pandas as pd
+
+from arquivos import TravaArquivo, gravar_atomico
+from dados import normalizar_colunas, normalizar_time
+
+MAGIC_REGISTRO = b'SSMRLOG1'
+VERSAO_REGISTRO = 1
+
+DTYPE_PARTIDA = np.dtype([
+    ('mandante', '<u2'),
+    ('visitante', '<u2'),
+    ('gols_mandante', '<u1'),
+    ('gols_visitante', '<u1'),
+    ('rodada', '<u2'),
+    ('data', '<i4'),
+])
+
+# Cabeçalho: magic, versão, tamanho do registro, geração, número de registros e CRC32 dos campos anteriores
+_FORMATO_CABECALHO = '<8sIIQQ'
+_TAMANHO_SLOT = 64
+_OFFSET_DADOS = 2 * _TAMANHO_SLOT
+
+RODADA_AUSENTE = 0
+DATA_AUSENTE = -1
+_EPOCA = datetime.date(1970, 1, 1)
+
+COLUNAS_BR25 = ['mandante', 'visitante', 'resultado', 'gols_mandante', 'gols_visitante']
+COLUNAS_COMPLETO = [
+    'ID', 'rodata', 'data', 'hora', 'mandante', 'visitante', 'formacao_mandante', 'formacao_visitante',
+    'tecnico_mandante', 'tecnico_visitante', 'vencedor', 'arena', 'mandante_Placar', 'visitante_Placar',
+    'mandante_Estado', 'visitante_Estado'
+]
+
+
+def _empacotar_cabecalho(geracao, n_registros):
+    corpo = struct.pack(_FORMATO_CABECALHO, MAGIC_REGISTRO, VERSAO_REGISTRO, DTYPE_PARTIDA.itemsize, geracao, n_registros)
+    return (corpo + struct.pack('<I', zlib.crc32(corpo))).ljust(_TAMANHO_SLOT, b'\0')
+
+
+def _desempacotar_cabecalho(bruto):
+    tamanho_corpo = struct.calcsize(_FORMATO_CABECALHO)
+    if len(bruto) < tamanho_corpo + 4:
+        return None
+    corpo = bruto[:tamanho_corpo]
+    (crc,) = struct.unpack('<I', bruto[tamanho_corpo:tamanho_corpo + 4])
+    if zlib.crc32(corpo) != crc:
+        return None
+    magic, versao, tamanho_registro, geracao, n_registros = struct.unpack(_FORMATO_CABECALHO, corpo)
+    if magic != MAGIC_REGISTRO or versao != VERSAO_REGISTRO or tamanho_registro != DTYPE_PARTIDA.itemsize:
+        return None
+    return geracao, n_registros
+
+
+def data_para_dias(valor):
+    """
+    Converte uma data ('dd/mm/aaaa', 'aaaa-mm-dd', date ou Timestamp) em dias desde 1970-01-01.
+    Retorna DATA_AUSENTE quando a data não é informada ou não pode ser interpretada.
+    """
+    if valor is None or valor == '' or (not isinstance(valor, str) and pd.isna(valor)):
+        return DATA_AUSENTE
+    if isinstance(valor, (datetime.date, pd.Timestamp)):
+        data = valor.date() if isinstance(valor, (datetime.datetime, pd.Timestamp)) else valor
+    else:
+        texto = str(valor).strip()
+        formato = '%Y-%m-%d' if '-' in texto else '%d/%m/%Y'
+        try:
+            data = datetime.datetime.strptime(texto, formato).date()
+        except ValueError:
+            return DATA_AUSENTE
+    return (data - _EPOCA).days
+
+
+def dias_para_data(dias):
+    if dias == DATA_AUSENTE:
+        return None
+    return _EPOCA + datetime.timedelta(days=int(dias))
+
+
+class RegistroPartidas:
+    """
+    Registro de partidas em arquivo binário com registros de largura fixa.
+
+    Parâmetros:
+        caminho (str): Caminho do arquivo do registro (criado vazio se não existir).
+    """
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.caminho_times = caminho + '.times.json'
+        self.caminho_trava = caminho + '.lock'
+        if not os.path.exists(self.caminho):
+            with TravaArquivo(self.caminho_trava):
+                if not os.path.exists(self.caminho):
+                    gravar_atomico(self.caminho, _empacotar_cabecalho(0, 0) + _empacotar_cabecalho(0, 0))
+        self._times = None
+        self._indice_times = None
+
+    # --- Cabeçalho e tabela de times ---
+
+    def _ler_cabecalho(self):
+        with open(self.caminho, 'rb') as f:
+            bruto = f.read(_OFFSET_DADOS)
+        slots = [_desempacotar_cabecalho(bruto[i * _TAMANHO_SLOT:(i + 1) * _TAMANHO_SLOT]) for i in range(2)]
+        validos = [s for s in slots if s is not None]
+        if not validos:
+            raise ValueError(f"Registro de partidas corrompido: {self.caminho}")
+        return max(validos)
+
+    def _carregar_times(self):
+        if os.path.exists(self.caminho_times):
+            with open(self.caminho_times, 'r', encoding='utf-8') as f:
+                self._times = json.load(f)
+        else:
+            self._times = []
+        self._indice_times = {t: i for i, t in enumerate(self._times)}
+
+    @property
+    def times(self):
+        self._carregar_times()
+        return list(self._times)
+
+    def __len__(self):
+        return self._ler_cabecalho()[1]
+
+    # --- Escrita ---
+
+    def anexar(self, mandante, gols_mandante, visitante, gols_visitante, rodada=None, data=None):
+        """
+        Anexa uma única partida ao registro. Retorna o número total de partidas após a gravação.
+        """
+        return self.anexar_lote([{
+            'mandante': mandante, 'visitante': visitante,
+            'gols_mandante': gols_mandante, 'gols_visitante': gols_visitante,
+            'rodada': rodada, 'data': data
+        }])
+
+    def anexar_lote(self, partidas):
+        """
+        Anexa várias partidas em uma única gravação atômica.
+
+        Parâmetros:
+            partidas (iterable): Dicionários com 'mandante', 'visitante', 'gols_mandante',
+                'gols_visitante' e, opcionalmente, 'rodada' e 'data'.
+        Retorna:
+            int: Número total de partidas no registro após a gravação.
+        """
+        partidas = list(partidas)
+        with TravaArquivo(self.caminho_trava):
+            return self._anexar_sob_trava(partidas)
+
+    def _anexar_sob_trava(self, partidas):
+        geracao, n_registros = self._ler_cabecalho()
+        self._carregar_times()
+        registros, novos_times = self._montar_registros(partidas)
+
+        # A tabela de times é publicada antes dos registros que a referenciam
+        if novos_times:
+            gravar_atomico(self.caminho_times, json.dumps(self._times, ensure_ascii=False).encode('utf-8'))
+
+        with open(self.caminho, 'r+b') as f:
+            # Grava sempre após o último registro confirmado, sobrescrevendo eventuais restos de uma queda
+            f.seek(_OFFSET_DADOS + n_registros * DTYPE_PARTIDA.itemsize)
+            f.write(registros.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+            nova_geracao = geracao + 1
+            f.seek((nova_geracao % 2) * _TAMANHO_SLOT)
+            f.write(_empacotar_cabecalho(nova_geracao, n_registros + len(registros)))
+            f.flush()
+            os.fsync(f.fileno())
+        return n_registros + len(registros)
+
+    def _montar_registros(self, partidas):
+        # Validado antes de tocar na tabela de times, que não pode ganhar nomes de um lote recusado
+        for i, p in enumerate(partidas, start=1):
+            if normalizar_time(p['mandante']) is None or normalizar_time(p['visitante']) is None:
+                raise ValueError(f"Partida {i}: mandante e visitante são obrigatórios.")
+        registros = np.zeros(len(partidas), dtype=DTYPE_PARTIDA)
+        novos_times = False
+        for i, p in enumerate(partidas):
+            for lado in ('mandante', 'visitante'):
+                nome = normalizar_time(p[lado])
+                if nome not in self._indice_times:
+                    self._indice_times[nome] = len(self._times)
+                    self._times.append(nome)
+                    novos_times = True
+                registros[i][lado] = self._indice_times[nome]
+            registros[i]['gols_mandante'] = int(p['gols_mandante'])
+            registros[i]['gols_visitante'] = int(p['gols_visitante'])
+            rodada = p.get('rodada')
+            registros[i]['rodada'] = RODADA_AUSENTE if rodada is None or pd.isna(rodada) else int(rodada)
+            registros[i]['data'] = data_para_dias(p.get('data'))
+        return registros, novos_times
+
+    def reescrever(self, partidas):
+        """
+        Substitui todo o conteúdo do registro (ex.: quando o CSV de origem foi reescrito).
+
+        Os ids de times existentes são mantidos e a tabela só cresce, de forma que uma queda entre
+        a gravação da tabela e a do arquivo de dados deixa o registro antigo ainda válido. O novo
+        arquivo é montado à parte e substitui o anterior atomicamente.
+        Retorna:
+            int: Número total de partidas no registro após a gravação.
+        """
+        partidas = list(partidas)
+        with TravaArquivo(self.caminho_trava):
+            geracao, _ = self._ler_cabecalho()
+            self._carregar_times()
+            registros, novos_times = self._montar_registros(partidas)
+            if novos_times:
+                gravar_atomico(self.caminho_times, json.dumps(self._times, ensure_ascii=False).encode('utf-8'))
+            cabecalho = _empacotar_cabecalho(geracao + 1, len(registros))
+            gravar_atomico(self.caminho, cabecalho + cabecalho + registros.tobytes())
+            return len(registros)
+
+    # --- Leitura ---
+
+    def ler(self, inicio=0):
+        """
+        Retorna as partidas confirmadas como array estruturado mapeado em memória (somente leitura).
+        """
+        n_registros = len(self)
+        if inicio >= n_registros:
+            return np.zeros(0, dtype=DTYPE_PARTIDA)
+        return np.memmap(self.caminho, dtype=DTYPE_PARTIDA, mode='r',
+                         offset=_OFFSET_DADOS + inicio * DTYPE_PARTIDA.itemsize,
+                         shape=(n_registros - inicio,))
+
+    def para_dataframe(self, inicio=0):
+        """
+        Converte as partidas do registro em um DataFrame com nomes de times, gols, rodada e data.
+        """
+        registros = self.ler(inicio)
+        nomes = np.asarray(self.times + [''], dtype=object)
+        datas = registros['data'].astype('int64')
+        return pd.DataFrame({
+            'mandante': nomes[registros['mandante']],
+            'visitante': nomes[registros['visitante']],
+            'gols_mandante': registros['gols_mandante'].astype(int),
+            'gols_visitante': registros['gols_visitante'].astype(int),
+            'rodada': registros['rodada'].astype(int),
+            'data': pd.to_datetime(np.where(datas == DATA_AUSENTE, np.datetime64('NaT'),
+                                            datas.astype('datetime64[D]'))),
+        })
+
+    # --- Importação e exportação CSV ---
+
+    @classmethod
+    def importar_csv(cls, caminho_csv, caminho_registro, se_vazio=False):
+        """
+        Preenche um registro vazio (criando-o se preciso) a partir de um CSV no formato de br-25.csv
+        ou de campeonato-brasileiro-full.csv. Linhas sem placar são ignoradas. A verificação de que
+        o registro está vazio e a gravação são feitas sob a mesma trava, de modo que processos
+        concorrentes nunca importam o histórico duas vezes.
+
+        Parâmetros:
+            se_vazio (bool): Se o registro já tiver partidas, apenas o retorna, sem importar.
+        Lança:
+            ValueError: Se o registro já tiver partidas e se_vazio for False.
+        """
+        df = normalizar_colunas(pd.read_csv(caminho_csv), caminho_csv)
+        df = df.dropna(subset=['gols_mandante', 'gols_visitante'])
+        registro = cls(caminho_registro)
+        with TravaArquivo(registro.caminho_trava):
+            if len(registro):
+                if se_vazio:
+                    return registro
+                raise ValueError(f"O registro {caminho_registro} já tem partidas; importar o CSV de novo duplicaria o histórico.")
+            registro._anexar_sob_trava(df.to_dict('records'))
+        return registro
+
+    def exportar_csv(self, caminho_csv, esquema='br25'):
+        """
+        Exporta o registro para CSV no esquema de br-25.csv ('br25') ou de
+        campeonato-brasileiro-full.csv ('completo').
+        """
+        df = self.para_dataframe()
+        gm, gv = df['gols_mandante'], df['gols_visitante']
+        if esquema == 'br25':
+            vencedor = np.where(gm > gv, df['mandante'], np.where(gm < gv, df['visitante'], 'empate'))
+            saida = pd.DataFrame({
+                'mandante': df['mandante'], 'visitante': df['visitante'], 'resultado': vencedor,
+                'gols_mandante': gm, 'gols_visitante': gv
+            })[COLUNAS_BR25]
+        elif esquema == 'completo':
+            vencedor = np.where(gm > gv, df['mandante'], np.where(gm < gv, df['visitante'], '-'))
+            saida = pd.DataFrame({c: '' for c in COLUNAS_COMPLETO}, index=df.index)
+            saida['ID'] = np.arange(1, len(df) + 1)
+            saida['rodata'] = df['rodada'].replace(RODADA_AUSENTE, '')
+            saida['data'] = df['data'].dt.strftime('%d/%m/%Y').fillna('')
+            saida['mandante'] = df['mandante']
+            saida['visitante'] = df['visitante']
+            saida['vencedor'] = vencedor
+            saida['mandante_Placar'] = gm
+            saida['visitante_Placar'] = gv
+            saida = saida[COLUNAS_COMPLETO]
+        else:
+            raise ValueError(f"Esquema desconhecido: {esquema}")
+        saida.to_csv(caminho_csv, index=False, quoting=csv.QUOTE_MINIMAL, encoding='utf-8')
+        return caminho_csv
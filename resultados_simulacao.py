@@ -0,0 +1,339 @@
+"""
+Armazenamento dos resultados por simulação e consultas de probabilidades condicionais e conjuntas.
+
+Uma execução de simular_temporadas é gravada em um diretório com um arquivo de metadados (times,
+jogos, número de simulações, semente, parâmetros do modelo e impressão digital do registro de
+partidas) e blocos .npz comprimidos com os desfechos de cada jogo, pontos, saldo e posição final de
+cada time em cada simulação. Cada gravação usa uma nova geração de blocos e só é publicada quando
+os metadados, que listam os blocos da geração, são substituídos atomicamente; os blocos de
+gerações anteriores são removidos depois disso. Uma queda no meio da gravação deixa intactos os
+resultados anteriores. As consultas são máscaras booleanas vetorizadas sobre esses arrays,
+de modo que perguntas como "P(Palmeiras campeão | vence o Flamengo)" não exigem simular de novo.
+
+Uso:
+    python simulacao_dinamica.py jogos.csv --simulacoes 50000 --salvar sim_rodada30
+    python resultados_simulacao.py sim_rodada30 --evento campeao:palmeiras --dado vitoria:palmeiras:flamengo
+"""
+import io
+import os
+import sys
+import json
+import argparse
+import numpy as np
+import pandas as pd
+
+from arquivos import TravaArquivo, gravar_atomico, impressao_registro
+from checkpoint_modelo import parametros_modelo
+from dados import normalizar_time
+from simulacao_dinamica import posicoes_finais
+
+VERSAO_RESULTADOS = 3
+TAMANHO_BLOCO_ARQUIVO = 10000
+_ARQUIVO_METADADOS = 'metadados.json'
+_ARQUIVO_TRAVA = 'trava'
+
+MANDANTE, EMPATE, VISITANTE = 0, 1, 2
+
+
+class Evento:
+    """
+    Evento sobre as simulações: função que recebe um bloco (dict de arrays) e devolve uma máscara
+    booleana por simulação. Eventos podem ser combinados com &, | e ~.
+    """
+    def __init__(self, funcao, descricao):
+        self.funcao = funcao
+        self.descricao = descricao
+
+    def __call__(self, bloco):
+        return self.funcao(bloco)
+
+    def __and__(self, outro):
+        return Evento(lambda b: self(b) & outro(b), f"({self.descricao} e {outro.descricao})")
+
+    def __or__(self, outro):
+        return Evento(lambda b: self(b) | outro(b), f"({self.descricao} ou {outro.descricao})")
+
+    def __invert__(self):
+        return Evento(lambda b: ~self(b), f"não {self.descricao}")
+
+    def __repr__(self):
+        return f"Evento({self.descricao})"
+
+
+def salvar_resultados(resultado, caminho, semente=None, classificacao=None, registro=None,
+                      tamanho_bloco=TAMANHO_BLOCO_ARQUIVO):
+    """
+    Grava o resultado de simular_temporadas em blocos .npz comprimidos.
+
+    Parâmetros:
+        resultado (dict): Saída de simular_temporadas.
+        caminho (str): Diretório de destino (criado se não existir; resultados anteriores são substituídos).
+        semente (int): Semente usada na simulação (registrada nos metadados).
+        classificacao (dict): Classificação atual (ler_classificacao), usada nas posições finais.
+        registro (RegistroPartidas): Registro usado no ajuste, para a impressão digital dos dados.
+        tamanho_bloco (int): Simulações por arquivo.
+    """
+    os.makedirs(caminho, exist_ok=True)
+    posicoes = posicoes_finais(resultado, classificacao)
+    n_simulacoes = len(resultado['pontos'])
+    n_blocos = -(-n_simulacoes // tamanho_bloco)
+    with TravaArquivo(os.path.join(caminho, _ARQUIVO_TRAVA)):
+        anteriores = _ler_metadados(caminho)
+        geracao = anteriores.get('geracao', 0) + 1 if anteriores else 1
+        blocos = [f'bloco_{geracao:06d}_{b:05d}.npz' for b in range(n_blocos)]
+        for b, nome in enumerate(blocos):
+            fatia = slice(b * tamanho_bloco, (b + 1) * tamanho_bloco)
+            buffer = io.BytesIO()
+            np.savez_compressed(buffer,
+                                desfechos=resultado['desfechos'][fatia].astype(np.int8),
+                                pontos=resultado['pontos'][fatia].astype(np.int16),
+                                saldo=resultado['saldo'][fatia].astype(np.int16),
+                                posicoes=posicoes[fatia].astype(np.int16),
+                                elo_final=resultado['elo_final'][fatia].astype(np.float32))
+            gravar_atomico(os.path.join(caminho, nome), buffer.getvalue())
+
+        metadados = {
+            'versao': VERSAO_RESULTADOS,
+            'geracao': geracao,
+            'blocos': blocos,
+            'times': list(resultado['times']),
+            'jogos': [[m, v, None if r is None or pd.isna(r) else int(r)] for m, v, r in resultado['jogos']],
+            'n_simulacoes': n_simulacoes,
+            'semente': semente,
+            'classificacao': {t: {k: int(v) for k, v in c.items()} for t, c in (classificacao or {}).items()},
+            'parametros': parametros_modelo(),
+            'dados': impressao_registro(registro, len(registro)) if registro is not None else None,
+        }
+        # A troca dos metadados publica a nova geração de uma vez
+        gravar_atomico(os.path.join(caminho, _ARQUIVO_METADADOS),
+                       json.dumps(metadados, ensure_ascii=False, indent=1).encode('utf-8'))
+        for nome in os.listdir(caminho):
+            if nome.startswith('bloco_') and nome.endswith('.npz') and nome not in blocos:
+                os.remove(os.path.join(caminho, nome))
+
+
+def _ler_metadados(caminho):
+    try:
+        with open(os.path.join(caminho, _ARQUIVO_METADADOS), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class ResultadosSimulacao:
+    """
+    Resultados gravados por salvar_resultados, com consultas por máscaras vetorizadas.
+
+    Parâmetros:
+        caminho (str): Diretório dos resultados.
+        manter_em_memoria (bool): Mantém os blocos lidos em memória entre consultas.
+    """
+    def __init__(self, caminho, manter_em_memoria=True):
+        self.caminho = caminho
+        self.metadados = _ler_metadados(caminho)
+        if self.metadados is None:
+            raise ValueError(f"Resultados de simulação ausentes ou ilegíveis: {caminho}")
+        if self.metadados.get('versao') != VERSAO_RESULTADOS:
+            raise ValueError(f"Versão dos resultados de simulação incompatível: {caminho}")
+        self.times = self.metadados['times']
+        self.indice = {t: i for i, t in enumerate(self.times)}
+        self.jogos = [tuple(j) for j in self.metadados['jogos']]
+        self.n_simulacoes = self.metadados['n_simulacoes']
+        self.manter_em_memoria = manter_em_memoria
+        self._blocos = {}
+
+    def compativel(self, registro):
+        """
+        Indica se os resultados foram gerados com os dados atuais do registro e os parâmetros atuais do modelo.
+        """
+        return (self.metadados['parametros'] == parametros_modelo()
+                and self.metadados['dados'] == impressao_registro(registro, len(registro)))
+
+    def blocos(self):
+        for b, nome in enumerate(self.metadados['blocos']):
+            if b in self._blocos:
+                yield self._blocos[b]
+                continue
+            with np.load(os.path.join(self.caminho, nome)) as dados:
+                bloco = {k: dados[k] for k in dados.files}
+            if self.manter_em_memoria:
+                self._blocos[b] = bloco
+            yield bloco
+
+    # --- Eventos ---
+
+    def _time(self, time):
+        if time not in self.indice:
+            raise KeyError(f"Time sem jogos na simulação: {time}")
+        return self.indice[time]
+
+    def _pontos_atuais(self, time):
+        return self.metadados['classificacao'].get(time, {}).get('pontos', 0)
+
+    def _jogos_entre(self, time, adversario):
+        jogos = [(j, m == time) for j, (m, v, _) in enumerate(self.jogos) if {m, v} == {time, adversario}]
+        if not jogos:
+            raise KeyError(f"Nenhum jogo simulado entre {time} e {adversario}")
+        return jogos
+
+    def resultado_jogo(self, mandante, visitante, desfecho):
+        """
+        Desfecho do jogo mandante x visitante: MANDANTE, EMPATE ou VISITANTE.
+        """
+        j = next((j for j, (m, v, _) in enumerate(self.jogos) if m == mandante and v == visitante), None)
+        if j is None:
+            raise KeyError(f"Jogo não simulado: {mandante} x {visitante}")
+        nome = {MANDANTE: 'vence', EMPATE: 'empata com', VISITANTE: 'perde para'}[desfecho]
+        return Evento(lambda b: b['desfechos'][:, j] == desfecho, f"{mandante} {nome} {visitante} em casa")
+
+    def vitoria(self, time, adversario):
+        """
+        time vence todos os jogos simulados contra adversario (em casa ou fora).
+        """
+        jogos = self._jogos_entre(time, adversario)
+
+        def funcao(b):
+            mascara = np.ones(len(b['desfechos']), dtype=bool)
+            for j, em_casa in jogos:
+                mascara &= b['desfechos'][:, j] == (MANDANTE if em_casa else VISITANTE)
+            return mascara
+        return Evento(funcao, f"{time} vence {adversario}")
+
+    def empate(self, time, adversario):
+        jogos = self._jogos_entre(time, adversario)
+        return Evento(lambda b: np.all(b['desfechos'][:, [j for j, _ in jogos]] == EMPATE, axis=1),
+                      f"{time} empata com {adversario}")
+
+    def posicao_ate(self, time, posicao):
+        i = self._time(time)
+        return Evento(lambda b: b['posicoes'][:, i] <= posicao, f"{time} termina até {posicao}º")
+
+    def posicao_a_partir(self, time, posicao):
+        i = self._time(time)
+        return Evento(lambda b: b['posicoes'][:, i] >= posicao, f"{time} termina do {posicao}º para baixo")
+
+    def campeao(self, time):
+        return self.posicao_ate(time, 1)
+
+    def rebaixado(self, time, vagas=4):
+        return self.posicao_a_partir(time, len(self.times) - vagas + 1)
+
+    def pontos_pelo_menos(self, time, pontos):
+        """
+        time termina com pelo menos `pontos` (somando os pontos da classificação gravada nos metadados).
+        """
+        i = self._time(time)
+        necessario = pontos - self._pontos_atuais(time)
+        return Evento(lambda b: b['pontos'][:, i] >= necessario, f"{time} com {pontos}+ pontos")
+
+    # --- Consultas ---
+
+    def contar(self, evento):
+        return sum(int(np.count_nonzero(evento(b))) for b in self.blocos())
+
+    def probabilidade(self, evento, dado=None):
+        """
+        P(evento) ou P(evento | dado). Eventos conjuntos são formados com & (ex.: a & b).
+        Retorna NaN se a condição não ocorre em nenhuma simulação.
+        """
+        if dado is None:
+            return self.contar(evento) / self.n_simulacoes
+        ambos, condicao = 0, 0
+        for b in self.blocos():
+            mascara = dado(b)
+            condicao += int(np.count_nonzero(mascara))
+            ambos += int(np.count_nonzero(mascara & evento(b)))
+        return ambos / condicao if condicao else float('nan')
+
+    def resumo(self, dado=None, vagas_topo=4, vagas_rebaixamento=4):
+        """
+        Resumo por time (como resumir_simulacao), opcionalmente restrito às simulações em que `dado` ocorre.
+        """
+        n_times = len(self.times)
+        n, pontos, elo = 0, np.zeros(n_times), np.zeros(n_times)
+        titulo, topo, rebaixamento = np.zeros(n_times), np.zeros(n_times), np.zeros(n_times)
+        for b in self.blocos():
+            mascara = dado(b) if dado is not None else np.ones(len(b['pontos']), dtype=bool)
+            posicoes = b['posicoes'][mascara]
+            n += int(mascara.sum())
+            pontos += b['pontos'][mascara].sum(axis=0)
+            elo += b['elo_final'][mascara].sum(axis=0, dtype=np.float64)
+            titulo += (posicoes == 1).sum(axis=0)
+            topo += (posicoes <= vagas_topo).sum(axis=0)
+            rebaixamento += (posicoes > n_times - vagas_rebaixamento).sum(axis=0)
+        iniciais = np.array([self._pontos_atuais(t) for t in self.times])
+        n = n if n else float('nan')
+        resumo = pd.DataFrame({
+            'pontos_medios': iniciais + pontos / n,
+            'elo_final_medio': elo / n,
+            'prob_titulo': titulo / n,
+            f'prob_top{vagas_topo}': topo / n,
+            'prob_rebaixamento': rebaixamento / n,
+        }, index=pd.Index(self.times, name='time'))
+        return resumo.sort_values('pontos_medios', ascending=False)
+
+
+def interpretar_evento(resultados, texto):
+    """
+    Converte 'tipo:time[:argumento]' em Evento. Tipos: campeao, rebaixado, top:time:k,
+    vitoria:time:adversario, empate:time:adversario, pontos:time:minimo. Nomes de times são
+    normalizados com normalizar_time.
+    Lança:
+        ValueError: Se o tipo for desconhecido ou faltarem argumentos.
+        KeyError: Se o time ou o jogo não fizer parte da simulação.
+    """
+    partes = [p.strip() for p in texto.split(':')]
+    tipo, argumentos = partes[0].lower(), partes[1:]
+    aridade = {'campeao': 1, 'rebaixado': 1, 'top': 2, 'vitoria': 2, 'empate': 2, 'pontos': 2}
+    construtores = {
+        'campeao': lambda t: resultados.campeao(t),
+        'rebaixado': lambda t: resultados.rebaixado(t),
+        'top': lambda t, k: resultados.posicao_ate(t, int(k)),
+        'vitoria': lambda t, a: resultados.vitoria(t, a),
+        'empate': lambda t, a: resultados.empate(t, a),
+        'pontos': lambda t, p: resultados.pontos_pelo_menos(t, int(p)),
+    }
+    if tipo not in construtores:
+        raise ValueError(f"Tipo de evento desconhecido: {tipo}")
+    if len(argumentos) != aridade[tipo]:
+        raise ValueError(f"Evento '{texto}': {tipo} espera {aridade[tipo]} argumento(s) após o tipo.")
+    argumentos[0] = normalizar_time(argumentos[0])
+    if tipo in ('vitoria', 'empate'):
+        argumentos[1] = normalizar_time(argumentos[1])
+    return construtores[tipo](*argumentos)
+
+
+def _combinar_eventos(resultados, textos):
+    combinado = None
+    for texto in textos:
+        evento = interpretar_evento(resultados, texto)
+        combinado = evento if combinado is None else combinado & evento
+    return combinado
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Consulta resultados de simulação gravados.")
+    parser.add_argument('caminho', help="Diretório gravado com simulacao_dinamica.py --salvar")
+    parser.add_argument('--evento', action='append', default=[], help="Evento (pode repetir; são combinados com 'e')")
+    parser.add_argument('--dado', action='append', default=[], help="Condição (pode repetir; são combinadas com 'e')")
+    args = parser.parse_args(argv)
+
+    resultados = ResultadosSimulacao(args.caminho)
+    try:
+        dado = _combinar_eventos(resultados, args.dado)
+        evento = _combinar_eventos(resultados, args.evento)
+    except (ValueError, KeyError) as e:
+        print(f"Erro no evento: {e.args[0]}", file=sys.stderr)
+        return 1
+    if evento is not None:
+        condicao = f" | {dado.descricao}" if dado is not None else ""
+        print(f"P({evento.descricao}{condicao}) = {resultados.probabilidade(evento, dado):.4f}")
+    else:
+        titulo = f" dado {dado.descricao}" if dado is not None else ""
+        print(f"# Resumo de {resultados.n_simulacoes} simulações{titulo}\n")
+        print(resultados.resumo(dado).round(3).to_markdown())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
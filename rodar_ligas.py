@@ -0,0 +1,127 @@
+"""
+Execução paralela dos pipelines de rating (Elo dinâmico + forças de Poisson) sobre vários datasets.
+
+Cada arquivo de dados (ou cada temporada dele, com --por-temporada) é uma unidade independente,
+processada em um pool de processos. Os resultados são reunidos em um único relatório Markdown
+comparativo.
+
+Uso:
+    python rodar_ligas.py [arquivo.csv ...] [--por-temporada] [--processos N] [--saida relatorio.md]
+"""
+import os
+import sys
+import argparse
+import datetime
+import multiprocessing
+import pandas as pd
+
+from dados import DATASETS_PADRAO, carregar_dataset, temporadas_disponiveis
+from modelo import calcular_forcas_poisson, calcular_vantagens_casa, calcular_elo_dinamico
+
+TOP_N = 5
+
+
+def gerar_unidades(caminhos, por_temporada=False):
+    """
+    Divide os datasets em unidades de trabalho independentes (arquivo inteiro ou uma temporada).
+    Cada unidade carrega só os seus dados (a partição da temporada) no processo que a executa.
+    Retorna:
+        list: Tuplas (caminho do dataset, temporada ou None).
+    """
+    unidades = []
+    for caminho in caminhos:
+        temporadas = temporadas_disponiveis(caminho) if por_temporada else []
+        if temporadas:
+            unidades.extend((caminho, temporada) for temporada in temporadas)
+        else:
+            unidades.append((caminho, None))
+    return unidades
+
+
+def processar_unidade(unidade):
+    """
+    Roda o pipeline de rating completo para uma unidade e retorna um resumo serializável.
+    """
+    caminho, temporada = unidade
+    nome = os.path.basename(caminho)
+    df = carregar_dataset(caminho, temporadas=[temporada] if temporada is not None else None)
+    forcas_poisson, medias_liga = calcular_forcas_poisson(df)
+    vantagens_casa = calcular_vantagens_casa(df)
+    elo_ratings = calcular_elo_dinamico(df, vantagens_casa)
+
+    ranking_elo = sorted(elo_ratings.items(), key=lambda x: x[1], reverse=True)[:TOP_N]
+    ranking_ataque = sorted(
+        ((t, f['ataque_casa']) for t, f in forcas_poisson.items() if pd.notna(f['ataque_casa'])),
+        key=lambda x: x[1], reverse=True
+    )[:TOP_N]
+    n = len(df)
+    return {
+        'dataset': nome,
+        'temporada': temporada,
+        'partidas': n,
+        'times': len(forcas_poisson),
+        'gols_casa': medias_liga['gols_casa'],
+        'gols_fora': medias_liga['gols_fora'],
+        'vitorias_mandante': (df['gols_mandante'] > df['gols_visitante']).sum() / n if n else 0,
+        'empates': (df['gols_mandante'] == df['gols_visitante']).sum() / n if n else 0,
+        'top_elo': ranking_elo,
+        'top_ataque_casa': ranking_ataque,
+    }
+
+
+def rodar_unidades(unidades, processos=None):
+    """
+    Processa as unidades em paralelo, preservando a ordem de entrada nos resultados.
+    """
+    if len(unidades) <= 1 or processos == 1:
+        return [processar_unidade(u) for u in unidades]
+    with multiprocessing.Pool(processes=processos) as pool:
+        return pool.map(processar_unidade, unidades, chunksize=1)
+
+
+def gerar_relatorio(resumos):
+    """
+    Monta o relatório Markdown comparativo a partir dos resumos de cada unidade.
+    """
+    linhas = ["# Relatório Comparativo - Elo Dinâmico + Poisson\n"]
+    tabela = pd.DataFrame([{
+        'Dataset': r['dataset'],
+        'Temporada': r['temporada'] if r['temporada'] is not None else '-',
+        'Partidas': r['partidas'],
+        'Times': r['times'],
+        'Gols Casa': round(r['gols_casa'], 2),
+        'Gols Fora': round(r['gols_fora'], 2),
+        'Vitórias Mandante (%)': round(r['vitorias_mandante'] * 100, 1),
+        'Empates (%)': round(r['empates'] * 100, 1),
+        'Maior Elo': f"{r['top_elo'][0][0]} ({int(r['top_elo'][0][1])})" if r['top_elo'] else '-',
+    } for r in resumos])
+    linhas.append(tabela.to_markdown(index=False))
+    for r in resumos:
+        titulo = r['dataset'] + (f" - {r['temporada']}" if r['temporada'] is not None else '')
+        linhas.append(f"\n## {titulo}\n")
+        linhas.append(f"Top {TOP_N} Elo: " + ', '.join(f"{t} ({int(e)})" for t, e in r['top_elo']))
+        linhas.append(f"\nTop {TOP_N} ataque em casa: " + ', '.join(f"{t} ({a:.2f})" for t, a in r['top_ataque_casa']))
+    return '\n'.join(linhas) + '\n'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Roda os pipelines de rating em paralelo sobre vários datasets.")
+    parser.add_argument('arquivos', nargs='*', default=DATASETS_PADRAO, help="CSVs de partidas (padrão: datasets do projeto)")
+    parser.add_argument('--por-temporada', action='store_true', help="Processa cada temporada como unidade independente")
+    parser.add_argument('--processos', type=int, default=None, help="Número de processos (padrão: todos os núcleos)")
+    parser.add_argument('--saida', default=None, help="Arquivo Markdown de saída")
+    args = parser.parse_args(argv)
+
+    unidades = gerar_unidades(args.arquivos, args.por_temporada)
+    relatorio = gerar_relatorio(rodar_unidades(unidades, args.processos))
+
+    saida = args.saida or f"relatorio_ligas_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+    with open(saida, 'w', encoding='utf-8') as f:
+        f.write(relatorio)
+    print(f"Relatório gerado: {saida}")
+    return saida
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(0 if main() else 1)
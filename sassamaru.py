@@ -1,135 +1,27 @@
-import sys
 import os
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import threading
 import pandas as pd
 import datetime
-import math
-import csv
 from collections import defaultdict
 import multiprocessing
 import numpy as np
-
-def get_base_dir():
-    try:
-        if getattr(sys, 'frozen', False):
-            base_dir = os.path.dirname(sys.executable)
-        else:
-            base_dir = os.path.dirname(os.path.abspath(__file__))
-    except Exception:
-        base_dir = os.getcwd()
-    return base_dir
-
-BASE_DIR = get_base_dir()
-CSV_PATH = os.path.join(BASE_DIR, 'br-25.csv')
-
-MAX_GOLS_CONSIDERADOS = 8
-
-# Elo parameters
-ELO_RATING_INICIAL = 1500
-ELO_K_FACTOR_BASE = 30
-ELO_VANTAGEM_CASA_PADRAO = 80
-ELO_INFLUENCE = 0.35
-
-# --- Elo dynamic calculation functions ---
-
-def calcular_vantagens_casa(df):
-    vantagens = {}
-    times = pd.unique(df['mandante'])
-    for time in times:
-        jogos_casa = df[df['mandante'] == time]
-        saldo_de_gols_medio = (jogos_casa['gols_mandante'] - jogos_casa['gols_visitante']).mean()
-        vantagem_rating = 60 * (saldo_de_gols_medio ** 0.8) if saldo_de_gols_medio > 0 else 0
-        vantagens[time] = max(0, vantagem_rating)
-    return vantagens
-
-def atualizar_ratings_elo(rating_casa, rating_visitante, placar_casa, placar_visitante, vantagem_casa_time):
-    if placar_casa > placar_visitante:
-        resultado_real_casa, margem_gols = 1.0, placar_casa - placar_visitante
-    elif placar_casa < placar_visitante:
-        resultado_real_casa, margem_gols = 0.0, placar_visitante - placar_casa
-    else:
-        resultado_real_casa, margem_gols = 0.5, 0
-
-    k_ajustado = ELO_K_FACTOR_BASE * math.log(margem_gols + 1) if margem_gols > 0 else ELO_K_FACTOR_BASE
-
-    expectativa_casa = 1 / (1 + 10 ** ((rating_visitante - (rating_casa + vantagem_casa_time)) / 400))
-
-    novo_rating_casa = rating_casa + k_ajustado * (resultado_real_casa - expectativa_casa)
-    novo_rating_visitante = rating_visitante + k_ajustado * ((1.0 - resultado_real_casa) - (1 - expectativa_casa))
-    return novo_rating_casa, novo_rating_visitante
-
-# --- Poisson force calculation ---
-
-def calcular_forcas_poisson(df):
-    forcas = {}
-    media_gols_marcados_casa = df['gols_mandante'].mean()
-    media_gols_sofridos_casa = df['gols_visitante'].mean()
-    media_gols_marcados_fora = df['gols_visitante'].mean()
-    media_gols_sofridos_fora = df['gols_mandante'].mean()
-    times = pd.unique(df[['mandante', 'visitante']].values.ravel('K'))
-
-    for time in times:
-        forcas[time] = {
-            'ataque_casa': (df[df['mandante'] == time]['gols_mandante'].mean() / media_gols_marcados_casa),
-            'defesa_casa': (df[df['mandante'] == time]['gols_visitante'].mean() / media_gols_sofridos_casa),
-            'ataque_fora': (df[df['visitante'] == time]['gols_visitante'].mean() / media_gols_marcados_fora),
-            'defesa_fora': (df[df['visitante'] == time]['gols_mandante'].mean() / media_gols_sofridos_fora)
-        }
-    medias_liga = {'gols_casa': media_gols_marcados_casa, 'gols_fora': media_gols_marcados_fora}
-    return forcas, medias_liga
-
-def poisson(gols_esperados, num_gols):
-    return (gols_esperados ** num_gols) * math.exp(-gols_esperados) / math.factorial(num_gols)
-
-# --- Híbrido: previsão usando Elo dinâmico + Poisson ---
-
-def prever_partida_hibrido(time_casa, time_visitante, elo_ratings, forcas_poisson, medias_liga, vantagens_casa):
-    if time_casa not in forcas_poisson or time_visitante not in forcas_poisson:
-        return None
-
-    ataque_casa = forcas_poisson[time_casa]['ataque_casa']
-    defesa_visitante = forcas_poisson[time_visitante]['defesa_fora']
-    gols_base_casa = ataque_casa * defesa_visitante * medias_liga['gols_casa']
-
-    ataque_visitante = forcas_poisson[time_visitante]['ataque_fora']
-    defesa_casa = forcas_poisson[time_casa]['defesa_casa']
-    gols_base_visitante = ataque_visitante * defesa_casa * medias_liga['gols_fora']
-
-    rating_casa = elo_ratings.get(time_casa, ELO_RATING_INICIAL)
-    rating_visitante = elo_ratings.get(time_visitante, ELO_RATING_INICIAL)
-    vantagem_time_casa = vantagens_casa.get(time_casa, ELO_VANTAGEM_CASA_PADRAO)
-
-    elo_diff = (rating_casa + vantagem_time_casa) - rating_visitante
-    fator_ajuste_casa = 1 + (elo_diff / 1000) * ELO_INFLUENCE
-    fator_ajuste_visitante = 1 - (elo_diff / 1000) * ELO_INFLUENCE
-
-    gols_finais_casa = gols_base_casa * max(0.1, fator_ajuste_casa)
-    gols_finais_visitante = gols_base_visitante * max(0.1, fator_ajuste_visitante)
-
-    prob_vitoria_casa, prob_empate, prob_vitoria_visitante = 0, 0, 0
-    for g_c in range(MAX_GOLS_CONSIDERADOS + 1):
-        for g_v in range(MAX_GOLS_CONSIDERADOS + 1):
-            prob_placar = poisson(gols_finais_casa, g_c) * poisson(gols_finais_visitante, g_v)
-            if g_c > g_v: prob_vitoria_casa += prob_placar
-            elif g_c == g_v: prob_empate += prob_placar
-            else: prob_vitoria_visitante += prob_placar
-
-    total_prob = prob_vitoria_casa + prob_empate + prob_vitoria_visitante
-    prob_vitoria_casa /= total_prob
-    prob_empate /= total_prob
-    prob_vitoria_visitante /= total_prob
-
-    return {
-        'mandante': time_casa,
-        'visitante': time_visitante,
-        'prob_mandante': prob_vitoria_casa,
-        'prob_empate': prob_empate,
-        'prob_visitante': prob_vitoria_visitante,
-        'gols_esperados_mandante': gols_finais_casa,
-        'gols_esperados_visitante': gols_finais_visitante
-    }
+from modelo import (
+    BASE_DIR, CSV_PATH, CONFRONTOS_PATH, CHECKPOINT_PATH, ELO_RATING_INICIAL,
+    calcular_vantagens_casa, calcular_elo_dinamico, calcular_forcas_poisson, prever_partida_hibrido,
+    abrir_registro
+)
+from dados import normalizar_time
+from estado_modelo import EstadoModelo, matriz_placares
+from palpites_rodada import probs_palpites, probs_placares, placares_mais_provaveis, texto_md_acertos
+from checkpoint_modelo import carregar_estado
+from confrontos import IndiceConfrontos
+from acompanhar_csv import AcompanhadorCSV, ANEXADAS, REESCRITO, sincronizar
+from importar_resultados import ler_resultados, importar_resultados
+from cenarios import Cenario
+
+ACOMPANHAMENTO_INTERVALO_MS = 2000
 
 # --- Simulação paralela adaptada para híbrido ---
 
@@ -146,19 +38,7 @@ def rodar_simulacao_paralela(df, jogos, n_simulacoes, progress_callback=None):
     forcas_poisson, medias_liga = calcular_forcas_poisson(df)
     vantagens_casa = calcular_vantagens_casa(df)
 
-    elo_ratings = {}
-    for _, partida in df.iterrows():
-        time_c = partida['mandante']
-        time_v = partida['visitante']
-        placar_c = partida['gols_mandante']
-        placar_v = partida['gols_visitante']
-
-        rating_c = elo_ratings.get(time_c, ELO_RATING_INICIAL)
-        rating_v = elo_ratings.get(time_v, ELO_RATING_INICIAL)
-        vantagem_c = vantagens_casa.get(time_c, ELO_VANTAGEM_CASA_PADRAO)
-
-        novo_rating_c, novo_rating_v = atualizar_ratings_elo(rating_c, rating_v, placar_c, placar_v, vantagem_c)
-        elo_ratings[time_c], elo_ratings[time_v] = novo_rating_c, novo_rating_v
+    elo_ratings = calcular_elo_dinamico(df, vantagens_casa)
 
     total = n_simulacoes * len(jogos)
 
@@ -242,52 +122,40 @@ def salvar_md_resumo_simulacao_com_elo(resultados):
                     f"{media_gols_mandante:15.2f} | {media_gols_visitante:16.2f} | "
                     f"{media_prob_mandante*100:18.1f} | {media_prob_empate*100:17.1f} | {media_prob_visitante*100:20.1f} | {palpite:<9} |\n")
 
+        # Distribuição exata de acertos dos palpites e dos placares mais prováveis da rodada
+        if resumo:
+            dados = list(resumo.values())
+            probs = np.array([[d['prob_mandante'], d['prob_empate'], d['prob_visitante']] for d in dados]) / \
+                np.array([[d['contagem']] for d in dados])
+            matrizes = matriz_placares([d['gols_mandante'] / d['contagem'] for d in dados],
+                                       [d['gols_visitante'] / d['contagem'] for d in dados])
+            placares = placares_mais_provaveis(matrizes)
+            f.write("\n" + texto_md_acertos(probs_palpites(probs), "Acertos de Palpites na Rodada"))
+            f.write("\nPlacares mais prováveis: " + ", ".join(
+                f"{d['mandante']} {gc} x {gv} {d['visitante']}" for d, (gc, gv) in zip(dados, placares)) + "\n")
+            f.write("\n" + texto_md_acertos(probs_placares(matrizes, placares), "Acertos de Placares Exatos na Rodada"))
+
     return filename
 
 def calcular_xg_por_clube(df):
-    forcas_poisson, medias_liga = calcular_forcas_poisson(df)
-    xg_por_clube = defaultdict(float)
-    jogos_por_clube = defaultdict(int)
-
-    for _, row in df.iterrows():
-        mandante = row['mandante']
-        visitante = row['visitante']
-        res = prever_partida_hibrido(mandante, visitante, {}, forcas_poisson, medias_liga, {})
-        if res:
-            xg_por_clube[mandante] += res['gols_esperados_mandante']
-            xg_por_clube[visitante] += res['gols_esperados_visitante']
-            jogos_por_clube[mandante] += 1
-            jogos_por_clube[visitante] += 1
-
-    xg_medio = {}
-    for time in xg_por_clube:
-        xg_medio[time] = xg_por_clube[time] / jogos_por_clube[time] if jogos_por_clube[time] > 0 else 0
-
-    return xg_por_clube, xg_medio
-
-def append_to_csv(mandante, gols_mandante, visitante, gols_visitante):
+    # O xG não depende do Elo (usa ratings iguais e a vantagem padrão), então a reconstrução é dispensada
+    return EstadoModelo.de_dataframe(df, calcular_elo=False).xg_por_clube()
+
+def anexar_partida(mandante, gols_mandante, visitante, gols_visitante):
     try:
-        with open(CSV_PATH, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            headers = next(reader)
+        abrir_registro().anexar(mandante, gols_mandante, visitante, gols_visitante)
+        return True
     except Exception as e:
-        messagebox.showerror("Erro CSV", f"Erro ao ler CSV: {e}")
+        messagebox.showerror("Erro Registro", f"Erro ao salvar partida: {e}")
         return False
 
-    new_row = {col: '' for col in headers}
-    new_row['mandante'] = mandante
-    new_row['gols_mandante'] = gols_mandante
-    new_row['visitante'] = visitante
-    new_row['gols_visitante'] = gols_visitante
-
+def exportar_csv():
     try:
-        with open(CSV_PATH, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=headers)
-            writer.writerow(new_row)
-        return True
+        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+        return abrir_registro().exportar_csv(os.path.join(BASE_DIR, f'br-25_exportado_{timestamp}.csv'))
     except Exception as e:
-        messagebox.showerror("Erro CSV", f"Erro ao salvar CSV: {e}")
-        return False
+        messagebox.showerror("Erro CSV", f"Erro ao exportar CSV: {e}")
+        return None
 
 class SimuladorApp:
     def __init__(self, root):
@@ -300,6 +168,8 @@ class SimuladorApp:
         self.vantagens_casa = None
         self.forcas_poisson = None
         self.medias_liga = None
+        self.estado = None
+        self.confrontos = None
 
         self.carregar_csv()
 
@@ -324,39 +194,93 @@ class SimuladorApp:
 
         ttk.Button(btn_frame, text="Rodar 10 mil simulações", command=lambda: self.iniciar_simulacao(10000)).grid(row=0, column=0, padx=10)
         ttk.Button(btn_frame, text="Rodar 100 mil simulações", command=lambda: self.iniciar_simulacao(100000)).grid(row=0, column=1, padx=10)
-        ttk.Button(btn_frame, text="Adicionar partida ao CSV", command=self.abrir_janela_adicionar).grid(row=0, column=2, padx=10)
+        ttk.Button(btn_frame, text="Adicionar partida", command=self.abrir_janela_adicionar).grid(row=0, column=2, padx=10)
         ttk.Button(btn_frame, text="Mostrar Ranking xG dos Clubes", command=self.mostrar_xg_ranking).grid(row=0, column=3, padx=10)
         ttk.Button(btn_frame, text="Mostrar Ranking ELO dos Clubes", command=self.mostrar_elo_ranking).grid(row=0, column=4, padx=10)
+        ttk.Button(btn_frame, text="Exportar CSV", command=self.exportar_csv).grid(row=1, column=0, padx=10, pady=5)
+        ttk.Button(btn_frame, text="Cenários (e se...?)", command=self.abrir_janela_cenarios).grid(row=1, column=1, padx=10, pady=5)
+        ttk.Button(btn_frame, text="Confronto direto", command=self.abrir_janela_confronto).grid(row=1, column=2, padx=10, pady=5)
+        ttk.Button(btn_frame, text="Importar resultados", command=self.importar_resultados).grid(row=1, column=3, padx=10, pady=5)
 
         self.progress = ttk.Progressbar(root, orient='horizontal', length=700, mode='determinate')
         self.progress.pack(pady=10)
         self.progress_label = ttk.Label(root, text="")
         self.progress_label.pack()
 
+        self.acompanhador = None
+        self.root.after(ACOMPANHAMENTO_INTERVALO_MS, self.acompanhar_csv)
+
     def carregar_csv(self):
         try:
-            df = pd.read_csv(CSV_PATH)
-            df.dropna(subset=['gols_mandante', 'gols_visitante'], inplace=True)
-            df['gols_mandante'] = df['gols_mandante'].astype(int)
-            df['gols_visitante'] = df['gols_visitante'].astype(int)
-            self.df = df
-
-            self.forcas_poisson, self.medias_liga = calcular_forcas_poisson(df)
-            self.vantagens_casa = calcular_vantagens_casa(df)
-            self.elo_ratings = {}
-            for _, partida in df.iterrows():
-                time_c = partida['mandante']
-                time_v = partida['visitante']
-                placar_c = partida['gols_mandante']
-                placar_v = partida['gols_visitante']
-                rating_c = self.elo_ratings.get(time_c, ELO_RATING_INICIAL)
-                rating_v = self.elo_ratings.get(time_v, ELO_RATING_INICIAL)
-                vantagem_c = self.vantagens_casa.get(time_c, ELO_VANTAGEM_CASA_PADRAO)
-                novo_rating_c, novo_rating_v = atualizar_ratings_elo(rating_c, rating_v, placar_c, placar_v, vantagem_c)
-                self.elo_ratings[time_c], self.elo_ratings[time_v] = novo_rating_c, novo_rating_v
+            registro = abrir_registro()
+            self.df = registro.para_dataframe()
+            self.confrontos = IndiceConfrontos.de_registro(registro, CONFRONTOS_PATH)
+            self.estado, _ = carregar_estado(registro, CHECKPOINT_PATH)
+            self.atualizar_derivados()
+
+        except Exception as e:
+            messagebox.showerror("Erro", f"Não foi possível carregar as partidas:\n{e}")
+
+    def atualizar_derivados(self, novos=None):
+        # Partidas novas já aplicadas ao estado: só o DataFrame e os dicionários derivados são refeitos
+        if novos is not None and len(novos):
+            self.df = pd.concat([self.df, novos], ignore_index=True)
+        self.forcas_poisson, self.medias_liga = self.estado.forcas_poisson(), self.estado.medias_liga()
+        self.vantagens_casa = self.estado.vantagens_casa()
+        self.elo_ratings = self.estado.elo_ratings()
+        _cache_previsoes.clear()
+
+    def registrar_partida(self, mandante, gols_mandante, visitante, gols_visitante):
+        if not anexar_partida(mandante, gols_mandante, visitante, gols_visitante):
+            return False
+        self.estado.aplicar_partida(mandante, visitante, gols_mandante, gols_visitante)
+        self.confrontos.atualizar_de_registro(abrir_registro())
+        self.atualizar_derivados(pd.DataFrame([{'mandante': mandante, 'visitante': visitante,
+                                                'gols_mandante': gols_mandante, 'gols_visitante': gols_visitante}]))
+        return True
+
+    def acompanhar_csv(self):
+        # Resultados anexados ao CSV por outras ferramentas (ou à mão) entram sem reiniciar a interface
+        try:
+            if self.estado is not None:
+                if self.acompanhador is None:
+                    self.acompanhador = AcompanhadorCSV(CSV_PATH)
+                situacao, novos, preservadas = sincronizar(self.acompanhador, abrir_registro(), self.estado, self.confrontos)
+                if situacao == ANEXADAS:
+                    self.atualizar_derivados(novos)
+                    self.progress_label.config(text=f"{len(novos)} partidas novas lidas de {os.path.basename(CSV_PATH)}")
+                elif situacao == REESCRITO:
+                    # O registro foi refeito a partir do CSV; checkpoint e índice de confrontos se invalidam sozinhos
+                    self.carregar_csv()
+                    self.progress_label.config(text=f"{os.path.basename(CSV_PATH)} reescrito: modelo recalculado")
+                    if not preservadas.empty:
+                        messagebox.showwarning(
+                            "CSV reescrito",
+                            f"{len(preservadas)} partidas do registro não estão em {os.path.basename(CSV_PATH)} "
+                            "e foram mantidas:\n" + "\n".join(
+                                f"{p.mandante} {p.gols_mandante} x {p.gols_visitante} {p.visitante}"
+                                for p in preservadas.head(20).itertuples()))
+        except Exception as e:
+            self.progress_label.config(text=f"Erro ao ler {os.path.basename(CSV_PATH)}: {e}")
+        finally:
+            self.root.after(ACOMPANHAMENTO_INTERVALO_MS, self.acompanhar_csv)
 
+    def importar_resultados(self):
+        if self.estado is None:
+            messagebox.showerror("Erro", "CSV não carregado.")
+            return
+        caminho = filedialog.askopenfilename(
+            title="Importar resultados",
+            filetypes=[("CSV ou JSON lines", "*.csv *.jsonl *.json"), ("Todos os arquivos", "*.*")])
+        if not caminho:
+            return
+        try:
+            novos = importar_resultados(ler_resultados(caminho), abrir_registro(), self.estado, self.confrontos)
         except Exception as e:
-            messagebox.showerror("Erro", f"Não foi possível carregar o CSV:\n{e}")
+            messagebox.showerror("Erro na importação", str(e))
+            return
+        self.atualizar_derivados(novos)
+        messagebox.showinfo("Importação concluída", f"{len(novos)} partidas importadas.")
 
     def iniciar_simulacao(self, n_simulacoes):
         if self.df is None:
@@ -367,8 +291,8 @@ class SimuladorApp:
         times_validos = set(self.df['mandante']).union(set(self.df['visitante']))
 
         for mand_entry, vis_entry in self.entries:
-            mand = mand_entry.get().strip()
-            vis = vis_entry.get().strip()
+            mand = normalizar_time(mand_entry.get())
+            vis = normalizar_time(vis_entry.get())
             if mand and vis:
                 if mand not in times_validos or vis not in times_validos:
                     messagebox.showerror("Erro", f"Time inválido: {mand} ou {vis} não existe no campeonato.")
@@ -397,15 +321,35 @@ class SimuladorApp:
         self.progress['value'] = done
         self.progress_label.config(text=f"{done} / {total}")
 
+    def exportar_csv(self):
+        arquivo = exportar_csv()
+        if arquivo:
+            messagebox.showinfo("Exportação concluída", f"Arquivo gerado:\n{arquivo}")
+
     def abrir_janela_adicionar(self):
         JanelaAdicionar(self.root, self)
 
+    def abrir_janela_cenarios(self):
+        if self.estado is None:
+            messagebox.showerror("Erro", "CSV não carregado.")
+            return
+        JanelaCenarios(self.root, self)
+
+    def abrir_janela_confronto(self):
+        if self.confrontos is None:
+            messagebox.showerror("Erro", "CSV não carregado.")
+            return
+        JanelaConfronto(self.root, self)
+
+    def jogos_informados(self):
+        return [(normalizar_time(m.get()), normalizar_time(v.get())) for m, v in self.entries if m.get().strip() and v.get().strip()]
+
     def mostrar_xg_ranking(self):
         if self.df is None:
             messagebox.showerror("Erro", "CSV não carregado.")
             return
 
-        xg_total, xg_medio = calcular_xg_por_clube(self.df)
+        xg_total, xg_medio = self.estado.xg_por_clube()
 
         ranking = sorted(xg_total.items(), key=lambda x: x[1], reverse=True)
 
@@ -448,7 +392,7 @@ class JanelaAdicionar(tk.Toplevel):
     def __init__(self, master, app):
         super().__init__(master)
         self.app = app
-        self.title("Adicionar partida ao CSV")
+        self.title("Adicionar partida")
         self.geometry("400x300")
         self.resizable(False, False)
 
@@ -478,8 +422,8 @@ class JanelaAdicionar(tk.Toplevel):
         ttk.Button(btn_frame, text="Cancelar", command=self.destroy).pack(side='left', expand=True, fill='x', padx=5)
 
     def adicionar(self):
-        mandante = self.mandante_entry.get().strip()
-        visitante = self.visitante_entry.get().strip()
+        mandante = normalizar_time(self.mandante_entry.get())
+        visitante = normalizar_time(self.visitante_entry.get())
         gols_mandante = self.gols_mandante_entry.get().strip()
         gols_visitante = self.gols_visitante_entry.get().strip()
 
@@ -495,12 +439,115 @@ class JanelaAdicionar(tk.Toplevel):
             messagebox.showwarning("Aviso", "Gols devem ser inteiros positivos ou zero.")
             return
 
-        sucesso = append_to_csv(mandante, gols_mandante_int, visitante, gols_visitante_int)
+        sucesso = self.app.registrar_partida(mandante, gols_mandante_int, visitante, gols_visitante_int)
         if sucesso:
-            messagebox.showinfo("Sucesso", "Dados adicionados ao CSV.")
-            self.app.carregar_csv()
+            messagebox.showinfo("Sucesso", "Partida adicionada ao registro.")
             self.destroy()
 
+class JanelaConfronto(tk.Toplevel):
+    def __init__(self, master, app):
+        super().__init__(master)
+        self.app = app
+        self.title("Confronto direto")
+        self.geometry("450x350")
+
+        frame = ttk.Frame(self, padding=10)
+        frame.pack(fill='x')
+        ttk.Label(frame, text="Time:").grid(row=0, column=0, sticky='w')
+        self.time_entry = ttk.Entry(frame, width=25)
+        self.time_entry.grid(row=0, column=1, padx=5, pady=3)
+        ttk.Label(frame, text="Adversário:").grid(row=1, column=0, sticky='w')
+        self.adversario_entry = ttk.Entry(frame, width=25)
+        self.adversario_entry.grid(row=1, column=1, padx=5, pady=3)
+        ttk.Button(frame, text="Consultar", command=self.consultar).grid(row=2, column=0, columnspan=2, pady=8)
+
+        self.txt = tk.Text(self, wrap='none', font=("Courier", 10))
+        self.txt.pack(expand=True, fill='both')
+
+    def consultar(self):
+        time, adversario = normalizar_time(self.time_entry.get()), normalizar_time(self.adversario_entry.get())
+        if time not in self.app.confrontos.indice or adversario not in self.app.confrontos.indice:
+            messagebox.showerror("Erro", f"Time inválido: {time} ou {adversario} não existe no campeonato.", parent=self)
+            return
+        par = self.app.confrontos.consultar_par(time, adversario)
+        texto = f"{time} x {adversario}\n\n"
+        texto += f"Jogos: {par['jogos']}\n"
+        texto += f"Vitórias: {par['vitorias']}   Empates: {par['empates']}   Derrotas: {par['derrotas']}\n"
+        texto += f"Gols pró: {par['gols_pro']}   Gols contra: {par['gols_contra']}\n\n"
+        texto += f"Últimos em casa: {' '.join(par['ultimos_casa']) or '-'}\n"
+        texto += f"Últimos fora:    {' '.join(par['ultimos_fora']) or '-'}\n"
+
+        self.txt.config(state='normal')
+        self.txt.delete('1.0', 'end')
+        self.txt.insert('1.0', texto)
+        self.txt.config(state='disabled')
+
+class JanelaCenarios(tk.Toplevel):
+    def __init__(self, master, app):
+        super().__init__(master)
+        self.app = app
+        self.title("Cenários hipotéticos")
+        self.geometry("700x650")
+
+        frame = ttk.Frame(self, padding=10)
+        frame.pack(fill='x')
+        ttk.Label(frame, text="Resultados hipotéticos (não são gravados). As previsões usam os jogos da janela principal.").grid(row=0, column=0, columnspan=4, pady=5)
+        for col, texto in enumerate(["mandante", "gols", "visitante", "gols"]):
+            ttk.Label(frame, text=texto).grid(row=1, column=col)
+
+        self.linhas = []
+        for i in range(5):
+            entradas = (ttk.Entry(frame, width=22), ttk.Entry(frame, width=5), ttk.Entry(frame, width=22), ttk.Entry(frame, width=5))
+            for col, entrada in enumerate(entradas):
+                entrada.grid(row=i + 2, column=col, padx=3, pady=2)
+            self.linhas.append(entradas)
+
+        ttk.Button(frame, text="Avaliar cenário", command=self.avaliar).grid(row=7, column=0, columnspan=4, pady=8)
+
+        self.txt = tk.Text(self, wrap='none', font=("Courier", 10))
+        self.txt.pack(expand=True, fill='both')
+
+    def avaliar(self):
+        times_validos = set(self.app.estado.times)
+        cenario = Cenario(self.app.estado)
+        for mand, gm, vis, gv in self.linhas:
+            mandante, visitante = normalizar_time(mand.get()), normalizar_time(vis.get())
+            if not mandante and not visitante:
+                continue
+            if mandante not in times_validos or visitante not in times_validos:
+                messagebox.showerror("Erro", f"Time inválido: {mandante} ou {visitante} não existe no campeonato.", parent=self)
+                return
+            try:
+                gols_mandante, gols_visitante = int(gm.get()), int(gv.get())
+                if gols_mandante < 0 or gols_visitante < 0:
+                    raise ValueError
+            except ValueError:
+                messagebox.showwarning("Aviso", "Gols devem ser inteiros positivos ou zero.", parent=self)
+                return
+            cenario.aplicar(mandante, gols_mandante, visitante, gols_visitante)
+
+        texto = "Previsões (atual -> cenário):\n\n"
+        jogos = [(m, v) for m, v in self.app.jogos_informados() if m in times_validos and v in times_validos]
+        if jogos:
+            texto += f"{'Jogo':34} | {'Mandante %':15} | {'Empate %':15} | {'Visitante %':15}\n"
+            texto += "-" * 88 + "\n"
+            for _, r in cenario.comparar_previsoes(jogos).iterrows():
+                colunas = [f"{r[c]*100:5.1f} -> {r[c + '_cenario']*100:5.1f}" for c in ('prob_mandante', 'prob_empate', 'prob_visitante')]
+                texto += f"{r['mandante'] + ' x ' + r['visitante']:34} | " + " | ".join(f"{c:15}" for c in colunas) + "\n"
+        else:
+            texto += "(nenhum jogo informado na janela principal)\n"
+
+        texto += "\nRanking ELO no cenário:\n\n"
+        texto += f"{'Pos':>3} | {'Clube':20} | {'ELO':7} | {'Variação':8} | {'Pos. atual':10}\n"
+        texto += "-" * 60 + "\n"
+        for clube, r in cenario.comparar_ranking().iterrows():
+            texto += f"{int(r['posicao_cenario']):3d} | {clube:20} | {int(r['elo_cenario']):7d} | {r['variacao']:+8.1f} | {int(r['posicao']):10d}\n"
+
+        self.txt.config(state='normal')
+        self.txt.delete('1.0', 'end')
+        self.txt.insert('1.0', texto)
+        self.txt.config(state='disabled')
+
 if __name__ == "__main__":
     multiprocessing.freeze_support()
     root = tk.Tk()
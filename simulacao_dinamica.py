@@ -0,0 +1,210 @@
+"""
+Simulação de temporadas com Elo dinâmico dentro de cada simulação.
+
+Os jogos são processados rodada a rodada (coluna rodata/rodada; jogos sem rodada ficam para o
+fim, na ordem do arquivo). O estado de cada simulação é uma
+linha de uma matriz (simulações × times) de ratings Elo: os placares de todas as simulações de uma
+rodada são sorteados de uma vez a partir dos gols esperados do modelo híbrido, e a atualização de
+atualizar_ratings_elo é aplicada como operação vetorizada antes da rodada seguinte. As forças de
+Poisson e as vantagens de casa permanecem as do estado inicial.
+
+As simulações são divididas em blocos de tamanho fixo, cada um com um fluxo de números aleatórios
+próprio derivado da semente, de modo que o resultado é reprodutível independentemente do número
+de processos.
+
+Uso:
+    python simulacao_dinamica.py jogos.csv --simulacoes 50000 --semente 42 [--classificacao tabela.csv] [--processos N] [--salvar DIR]
+"""
+import sys
+import argparse
+import multiprocessing
+import numpy as np
+import pandas as pd
+
+from estado_modelo import atualizar_ratings_elo_vetor, gols_esperados
+from execucao_blocos import executar_em_blocos
+
+N_SIMULACOES_PADRAO = 50000
+TAMANHO_BLOCO_SIMULACOES = 5000
+
+
+def _rodadas_sem_conflito(jogos_idx, rodadas):
+    """
+    Agrupa os jogos por rodada, dividindo a rodada quando um time aparece mais de uma vez
+    (os jogos de um mesmo grupo são atualizados simultaneamente). Jogos sem rodada (None ou NaN)
+    formam uma última rodada.
+    """
+    ausente = [r is None or pd.isna(r) for r in rodadas]
+    rodadas_conhecidas = sorted({r for r, a in zip(rodadas, ausente) if not a})
+    sequencia = [[j for j, r in enumerate(rodadas) if not ausente[j] and r == rodada] for rodada in rodadas_conhecidas]
+    sequencia.append([j for j in range(len(rodadas)) if ausente[j]])
+    grupos = []
+    for pendentes in sequencia:
+        while pendentes:
+            grupo, usados, resto = [], set(), []
+            for j in pendentes:
+                c, v = jogos_idx[j]
+                if c in usados or v in usados:
+                    resto.append(j)
+                else:
+                    grupo.append(j)
+                    usados.update((c, v))
+            grupos.append(np.array(grupo, dtype=np.int64))
+            pendentes = resto
+    return grupos
+
+
+def _simular_bloco(args):
+    parametros, n_simulacoes, semente = args
+    rng = np.random.default_rng(semente)
+    jogos_idx = parametros['jogos_idx']
+    n_times = len(parametros['elo'])
+
+    elo = np.broadcast_to(parametros['elo'], (n_simulacoes, n_times)).copy()
+    pontos = np.zeros((n_simulacoes, n_times), dtype=np.int16)
+    saldo = np.zeros((n_simulacoes, n_times), dtype=np.int16)
+    gols = np.zeros((n_simulacoes, n_times), dtype=np.int16)
+    vitorias = np.zeros((n_simulacoes, n_times), dtype=np.int16)
+    desfechos = np.empty((n_simulacoes, len(jogos_idx)), dtype=np.int8)
+
+    for grupo in parametros['grupos']:
+        c, v = jogos_idx[grupo, 0], jogos_idx[grupo, 1]
+        lambda_c, lambda_v = gols_esperados(
+            parametros['ataque_casa'][c], parametros['defesa_fora'][v], parametros['ataque_fora'][v],
+            parametros['defesa_casa'][c], parametros['media_casa'], parametros['media_fora'],
+            elo[:, c], elo[:, v], parametros['vantagens'][c])
+        gols_c = rng.poisson(lambda_c)
+        gols_v = rng.poisson(lambda_v)
+
+        elo[:, c], elo[:, v] = atualizar_ratings_elo_vetor(elo[:, c], elo[:, v], gols_c, gols_v, parametros['vantagens'][c])
+        vitoria_c, vitoria_v, empate = gols_c > gols_v, gols_c < gols_v, gols_c == gols_v
+        pontos[:, c] += (3 * vitoria_c + empate).astype(np.int16)
+        pontos[:, v] += (3 * vitoria_v + empate).astype(np.int16)
+        vitorias[:, c] += vitoria_c
+        vitorias[:, v] += vitoria_v
+        saldo[:, c] += (gols_c - gols_v).astype(np.int16)
+        saldo[:, v] += (gols_v - gols_c).astype(np.int16)
+        gols[:, c] += gols_c.astype(np.int16)
+        gols[:, v] += gols_v.astype(np.int16)
+        desfechos[:, grupo] = np.where(vitoria_c, 0, np.where(empate, 1, 2))
+    return pontos, saldo, gols, vitorias, desfechos, elo
+
+
+def simular_temporadas(estado, jogos, n_simulacoes=N_SIMULACOES_PADRAO, semente=None, processos=1):
+    """
+    Simula os jogos restantes com Elo atualizado dentro de cada simulação.
+
+    Parâmetros:
+        estado (EstadoModelo): Estado atual do modelo (não é alterado).
+        jogos (list): Tuplas (mandante, visitante, rodada); rodada pode ser None.
+        n_simulacoes (int): Número de temporadas simuladas.
+        semente (int): Semente para reprodutibilidade.
+        processos (int): Número de processos (os blocos de simulações são distribuídos entre eles).
+    Retorna:
+        dict: 'times' (times com jogos), 'jogos', 'pontos', 'saldo', 'gols' (gols marcados) e
+        'vitorias' (simulações × times), 'desfechos' (simulações × jogos, 0=mandante, 1=empate, 2=visitante) e 'elo_final'.
+    """
+    jogos = list(jogos)
+    times = list(dict.fromkeys(t for m, v, _ in jogos for t in (m, v)))
+    local = {t: i for i, t in enumerate(times)}
+    idx = np.array([estado.indice[t] for t in times], dtype=np.int64)
+    jogos_idx = np.array([(local[m], local[v]) for m, v, _ in jogos], dtype=np.int64).reshape(-1, 2)
+
+    ataque_casa, defesa_casa, ataque_fora, defesa_fora = estado.forcas_vetor()
+    media_casa, media_fora = estado.medias()
+    parametros = {
+        'jogos_idx': jogos_idx,
+        'grupos': _rodadas_sem_conflito([tuple(j) for j in jogos_idx], [r for _, _, r in jogos]),
+        'elo': estado.elo[idx],
+        'vantagens': estado.vantagens_vetor()[idx],
+        'ataque_casa': ataque_casa[idx], 'defesa_casa': defesa_casa[idx],
+        'ataque_fora': ataque_fora[idx], 'defesa_fora': defesa_fora[idx],
+        'media_casa': media_casa, 'media_fora': media_fora,
+    }
+
+    blocos = executar_em_blocos(_simular_bloco, parametros, n_simulacoes, semente, processos, TAMANHO_BLOCO_SIMULACOES)
+
+    return {
+        'times': times,
+        'jogos': jogos,
+        'pontos': np.concatenate([b[0] for b in blocos]),
+        'saldo': np.concatenate([b[1] for b in blocos]),
+        'gols': np.concatenate([b[2] for b in blocos]),
+        'vitorias': np.concatenate([b[3] for b in blocos]),
+        'desfechos': np.concatenate([b[4] for b in blocos]),
+        'elo_final': np.concatenate([b[5] for b in blocos]),
+    }
+
+
+def _totais(resultado, classificacao, chave, coluna):
+    atuais = np.array([(classificacao or {}).get(t, {}).get(coluna, 0) for t in resultado['times']], dtype=np.int32)
+    return resultado[chave].astype(np.int32) + atuais
+
+
+def posicoes_finais(resultado, classificacao=None, semente=0):
+    """
+    Posição final de cada time em cada simulação (1 = campeão). À classificação atual (ler_classificacao)
+    são somados os pontos, vitórias, saldo e gols marcados nos jogos simulados, e a ordem é por
+    pontos, vitórias, saldo de gols e gols marcados; persistindo o empate, a ordem é sorteada em
+    cada simulação (com semente fixa, para que as posições sejam reprodutíveis).
+    """
+    pontos = _totais(resultado, classificacao, 'pontos', 'pontos')
+    vitorias = _totais(resultado, classificacao, 'vitorias', 'vitorias')
+    saldo = _totais(resultado, classificacao, 'saldo', 'saldo')
+    gols = _totais(resultado, classificacao, 'gols', 'gols_pro')
+    sorteio = np.random.default_rng(semente).random(pontos.shape)
+    # lexsort ordena pela última chave primeiro
+    ordem = np.lexsort((sorteio, -gols, -saldo, -vitorias, -pontos), axis=1)
+    posicoes = np.empty_like(ordem)
+    np.put_along_axis(posicoes, ordem, np.arange(1, ordem.shape[1] + 1)[None, :], axis=1)
+    return posicoes
+
+
+def resumir_simulacao(resultado, classificacao=None, vagas_topo=4, vagas_rebaixamento=4):
+    """
+    Resume as simulações em pontos médios, Elo médio final e probabilidades de título,
+    de terminar entre os primeiros e de terminar na zona de rebaixamento.
+    """
+    posicoes = posicoes_finais(resultado, classificacao)
+    n_times = len(resultado['times'])
+    resumo = pd.DataFrame({
+        'pontos_medios': _totais(resultado, classificacao, 'pontos', 'pontos').mean(axis=0),
+        'elo_final_medio': resultado['elo_final'].mean(axis=0),
+        'prob_titulo': (posicoes == 1).mean(axis=0),
+        f'prob_top{vagas_topo}': (posicoes <= vagas_topo).mean(axis=0),
+        'prob_rebaixamento': (posicoes > n_times - vagas_rebaixamento).mean(axis=0),
+    }, index=pd.Index(resultado['times'], name='time'))
+    return resumo.sort_values('pontos_medios', ascending=False)
+
+
+def main(argv=None):
+    from modelo import CHECKPOINT_PATH, abrir_registro
+    from checkpoint_modelo import carregar_estado
+    from dados import normalizar_time, ler_classificacao
+    parser = argparse.ArgumentParser(description="Simula temporadas com Elo dinâmico dentro de cada simulação.")
+    parser.add_argument('jogos', help="CSV com colunas mandante, visitante e rodada (ou rodata)")
+    parser.add_argument('--simulacoes', type=int, default=N_SIMULACOES_PADRAO)
+    parser.add_argument('--semente', type=int, default=None)
+    parser.add_argument('--processos', type=int, default=1)
+    parser.add_argument('--classificacao', '--pontos', dest='classificacao',
+                        help="CSV com a classificação atual: time e pontos e, para os desempates, vitorias, saldo e gols_pro")
+    parser.add_argument('--salvar', help="Diretório onde gravar os resultados por simulação para consultas posteriores")
+    args = parser.parse_args(argv)
+
+    df_jogos = pd.read_csv(args.jogos).rename(columns={'rodata': 'rodada'})
+    rodadas = df_jogos['rodada'] if 'rodada' in df_jogos.columns else [None] * len(df_jogos)
+    jogos = list(zip(df_jogos['mandante'].map(normalizar_time), df_jogos['visitante'].map(normalizar_time), rodadas))
+    classificacao = ler_classificacao(args.classificacao) if args.classificacao else None
+    registro = abrir_registro()
+    estado, _ = carregar_estado(registro, CHECKPOINT_PATH)
+    resultado = simular_temporadas(estado, jogos, args.simulacoes, args.semente, args.processos)
+    if args.salvar:
+        from resultados_simulacao import salvar_resultados
+        salvar_resultados(resultado, args.salvar, semente=args.semente, classificacao=classificacao, registro=registro)
+    print(f"# Simulação com Elo Dinâmico ({args.simulacoes} temporadas)\n")
+    print(resumir_simulacao(resultado, classificacao).round(3).to_markdown())
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main(sys.argv[1:])
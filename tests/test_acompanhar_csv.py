@@ -0,0 +1,110 @@
+import os
+
+import pytest
+
+import acompanhar_csv
+from acompanhar_csv import AcompanhadorCSV, sincronizar, SEM_MUDANCAS, ANEXADAS, REESCRITO
+from registro_partidas import RegistroPartidas
+from estado_modelo import EstadoModelo
+
+CABECALHO = "mandante,visitante,resultado,gols_mandante,gols_visitante\n"
+LINHAS = ["flamengo,vasco,flamengo,2,0\n", "palmeiras,santos,empate,1,1\n", "bahia,sport,sport,0,1\n"]
+
+
+@pytest.fixture
+def ambiente(tmp_path):
+    csv = tmp_path / 'jogos.csv'
+    csv.write_text(CABECALHO + ''.join(LINHAS), encoding='utf-8')
+    registro = RegistroPartidas.importar_csv(str(csv), str(tmp_path / 'jogos.partidas'))
+    acompanhador = AcompanhadorCSV(str(csv))
+    assert sincronizar(acompanhador, registro)[0] == SEM_MUDANCAS
+    return csv, registro, acompanhador
+
+
+def _anexar(csv, texto):
+    with open(csv, 'a', encoding='utf-8') as f:
+        f.write(texto)
+
+
+def _placares(registro):
+    df = registro.para_dataframe()
+    return list(zip(df['mandante'], df['visitante'], df['gols_mandante'], df['gols_visitante']))
+
+
+def test_linhas_anexadas(ambiente):
+    csv, registro, acompanhador = ambiente
+    estado = EstadoModelo.de_dataframe(registro.para_dataframe())
+    _anexar(csv, "vasco,flamengo,vasco,1,0\nsantos,palm")
+    situacao, df, _ = sincronizar(acompanhador, registro, estado)
+    assert situacao == ANEXADAS and len(df) == 1
+    assert len(registro) == 4 and estado.n_partidas == 4
+
+    # A linha incompleta só entra quando terminar
+    _anexar(csv, "eiras,empate,2,2\n")
+    situacao, df, _ = sincronizar(acompanhador, registro, estado)
+    assert situacao == ANEXADAS and df['visitante'].tolist() == ['palmeiras']
+    assert sincronizar(acompanhador, registro, estado)[0] == SEM_MUDANCAS
+    assert _placares(registro)[-1] == ('santos', 'palmeiras', 2, 2)
+
+
+def test_linha_invalida_nao_avanca_a_posicao(ambiente):
+    csv, registro, acompanhador = ambiente
+    _anexar(csv, "vasco,flamengo,vasco,x,0\n")
+    with pytest.raises(ValueError):
+        sincronizar(acompanhador, registro)
+    with pytest.raises(ValueError):
+        sincronizar(acompanhador, registro)
+    assert len(registro) == 3
+
+
+def test_reescrita_preserva_partidas_so_do_registro(ambiente):
+    csv, registro, acompanhador = ambiente
+    registro.anexar('gremio', 3, 'internacional', 1)
+    csv.write_text(CABECALHO + LINHAS[0] + LINHAS[2], encoding='utf-8')
+    situacao, df, preservadas = sincronizar(acompanhador, registro)
+    assert situacao == REESCRITO and len(df) == 2
+    assert _placares(registro) == [('flamengo', 'vasco', 2, 0), ('bahia', 'sport', 0, 1),
+                                   ('palmeiras', 'santos', 1, 1), ('gremio', 'internacional', 3, 1)]
+    assert len(preservadas) == 2
+
+
+def test_edicao_no_meio_do_arquivo(ambiente):
+    csv, registro, acompanhador = ambiente
+    # Mesmo tamanho, fora do início e do fim do arquivo
+    mtime_ns = os.stat(csv).st_mtime_ns
+    csv.write_text(CABECALHO + LINHAS[0] + LINHAS[1].replace('1,1', '2,2') + LINHAS[2], encoding='utf-8')
+    # Garante uma data de modificação diferente mesmo com relógio de baixa resolução
+    os.utime(csv, ns=(mtime_ns + 10 ** 9, mtime_ns + 10 ** 9))
+    situacao, _, _ = sincronizar(acompanhador, registro)
+    assert situacao == REESCRITO
+    assert ('palmeiras', 'santos', 2, 2) in _placares(registro)
+
+
+def test_primeira_verificacao_confere_com_o_registro(tmp_path):
+    csv = tmp_path / 'jogos.csv'
+    csv.write_text(CABECALHO + ''.join(LINHAS), encoding='utf-8')
+    registro = RegistroPartidas(str(tmp_path / 'outro.partidas'))
+    registro.anexar('flamengo', 2, 'vasco', 0)
+    situacao, _, preservadas = sincronizar(AcompanhadorCSV(str(csv)), registro)
+    assert situacao == REESCRITO and preservadas.empty
+    assert len(registro) == 3
+
+
+def test_registro_menor_que_o_lido_forca_reprocessamento(ambiente, tmp_path):
+    csv, _, acompanhador = ambiente
+    novo = RegistroPartidas(str(tmp_path / 'novo.partidas'))
+    assert sincronizar(acompanhador, novo)[0] == REESCRITO
+    assert len(novo) == 3
+
+
+def test_arquivo_intocado_nao_e_lido(ambiente, monkeypatch):
+    csv, registro, acompanhador = ambiente
+    _anexar(csv, "vasco,flamengo,vasco,1,0\nsantos,palm")
+    assert sincronizar(acompanhador, registro)[0] == ANEXADAS
+    leituras = []
+    monkeypatch.setattr(acompanhar_csv.AcompanhadorCSV, '_hash', lambda *a: leituras.append(a))
+    for _ in range(3):
+        assert sincronizar(acompanhador, registro)[0] == SEM_MUDANCAS
+    reaberto = AcompanhadorCSV(str(csv))
+    assert sincronizar(reaberto, registro)[0] == SEM_MUDANCAS
+    assert leituras == [] and len(registro) == 4
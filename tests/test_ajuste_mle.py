@@ -0,0 +1,69 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ajuste_mle import ajustar_poisson_mle, forcas_mle
+
+TIMES = ['a', 'b', 'c', 'd', 'e', 'f']
+ATAQUE = np.array([0.4, 0.2, 0.0, -0.1, -0.2, -0.3])
+DEFESA = np.array([0.3, 0.1, 0.0, 0.0, -0.1, -0.3])
+MU, CASA = 0.1, 0.25
+
+
+@pytest.fixture(scope='module')
+def partidas():
+    rng = np.random.default_rng(11)
+    pares = list(itertools.permutations(range(len(TIMES)), 2)) * 150
+    m, v = np.array(pares).T
+    return pd.DataFrame({
+        'mandante': np.array(TIMES)[m], 'visitante': np.array(TIMES)[v],
+        'gols_mandante': rng.poisson(np.exp(MU + CASA + ATAQUE[m] - DEFESA[v])),
+        'gols_visitante': rng.poisson(np.exp(MU + ATAQUE[v] - DEFESA[m])),
+    })
+
+
+def _lambdas(resultado, df):
+    indice = {t: i for i, t in enumerate(resultado['times'])}
+    m, v = df['mandante'].map(indice).to_numpy(), df['visitante'].map(indice).to_numpy()
+    a, d = resultado['ataque'], resultado['defesa']
+    return (np.exp(resultado['mu'] + resultado['casa'] + a[m] - d[v]), np.exp(resultado['mu'] + a[v] - d[m]))
+
+
+def test_recupera_os_parametros(partidas):
+    resultado = ajustar_poisson_mle(partidas)
+    assert resultado['times'] == TIMES
+    assert resultado['casa'] == pytest.approx(CASA, abs=0.05)
+    assert np.allclose(resultado['ataque'], ATAQUE - ATAQUE.mean(), atol=0.06)
+    assert np.allclose(resultado['defesa'], DEFESA - DEFESA.mean(), atol=0.06)
+
+
+def test_equacoes_de_verossimilhanca_no_otimo(partidas):
+    resultado = ajustar_poisson_mle(partidas)
+    lam_m, lam_v = _lambdas(resultado, partidas)
+    df = partidas.assign(lam_m=lam_m, lam_v=lam_v)
+    assert df['lam_m'].sum() == pytest.approx(df['gols_mandante'].sum())
+    marcados = df.groupby('mandante')['gols_mandante'].sum() + df.groupby('visitante')['gols_visitante'].sum()
+    esperados = df.groupby('mandante')['lam_m'].sum() + df.groupby('visitante')['lam_v'].sum()
+    assert np.allclose(marcados, esperados, rtol=1e-6)
+
+
+def test_partida_a_quente_e_ridge(partidas):
+    frio = ajustar_poisson_mle(partidas.iloc[:-30])
+    completo = ajustar_poisson_mle(partidas)
+    quente = ajustar_poisson_mle(partidas, inicial=frio)
+    assert quente['iteracoes'] <= completo['iteracoes']
+    assert np.allclose(quente['ataque'], completo['ataque'], atol=1e-6)
+
+    encolhido = ajustar_poisson_mle(partidas.iloc[:60], ridge=5.0)
+    livre = ajustar_poisson_mle(partidas.iloc[:60])
+    assert np.abs(encolhido['ataque']).sum() < np.abs(livre['ataque']).sum()
+
+
+def test_formato_de_calcular_forcas_poisson(partidas):
+    resultado = ajustar_poisson_mle(partidas)
+    forcas, medias = forcas_mle(resultado)
+    lam_m, _ = _lambdas(resultado, partidas.iloc[:1])
+    m, v = partidas['mandante'][0], partidas['visitante'][0]
+    assert forcas[m]['ataque_casa'] * forcas[v]['defesa_fora'] * medias['gols_casa'] == pytest.approx(lam_m[0])
@@ -0,0 +1,46 @@
+import os
+
+import numpy as np
+import pytest
+
+from bootstrap_poisson import FORCAS, _matriz_somas, _forcas_de_somas, bootstrap_forcas
+from dados import carregar_dataset
+from estado_modelo import EstadoModelo
+from modelo import calcular_forcas_poisson
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='module')
+def partidas():
+    return carregar_dataset(os.path.join(RAIZ, 'br-25.csv'))
+
+
+def test_replica_com_pesos_unitarios_e_a_estimativa_pontual(partidas):
+    times = sorted(set(partidas['mandante']) | set(partidas['visitante']))
+    somas = np.ones((1, len(partidas))) @ _matriz_somas(partidas, times)
+    forcas, media_casa, media_fora, _ = _forcas_de_somas(somas, len(partidas), len(times))
+    referencia, medias = calcular_forcas_poisson(partidas)
+    assert media_casa[0] == pytest.approx(medias['gols_casa']) and media_fora[0] == pytest.approx(medias['gols_fora'])
+    for f in FORCAS:
+        assert np.allclose(forcas[f][0], [referencia[t][f] for t in times])
+
+
+def test_intervalos_e_reprodutibilidade(partidas):
+    df_forcas, df_jogos = bootstrap_forcas(partidas, [('flamengo', 'vasco')], n_replicas=300, semente=4)
+    referencia, _ = calcular_forcas_poisson(partidas)
+    pontual = np.array([referencia[t]['ataque_casa'] for t in df_forcas.index])
+    dentro = (df_forcas['ataque_casa_inf'] <= pontual) & (pontual <= df_forcas['ataque_casa_sup'])
+    assert dentro.mean() >= 0.9
+    probs = df_jogos[['prob_mandante', 'prob_empate', 'prob_visitante']].to_numpy()
+    assert probs.sum() == pytest.approx(1, abs=0.05)
+
+    estado = EstadoModelo.de_dataframe(partidas)
+    mesmo = bootstrap_forcas(partidas, [('flamengo', 'vasco')], n_replicas=300, semente=4, estado=estado)
+    assert mesmo[0].equals(df_forcas) and np.allclose(mesmo[1].iloc[:, 2:].to_numpy(float),
+                                                      df_jogos.iloc[:, 2:].to_numpy(float))
+
+
+def test_time_desconhecido(partidas):
+    with pytest.raises(ValueError, match='palmeira'):
+        bootstrap_forcas(partidas, [('flamengo', 'palmeira')], n_replicas=10)
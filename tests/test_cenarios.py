@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cenarios import Cenario, PLACARES_REPRESENTATIVOS, avaliar_combinacoes
+from estado_modelo import EstadoModelo
+
+
+@pytest.fixture(scope='module')
+def base():
+    df = pd.DataFrame({
+        'mandante': ['a', 'b', 'c', 'd', 'e', 'a', 'c', 'b', 'd', 'e'],
+        'visitante': ['b', 'c', 'd', 'e', 'a', 'c', 'a', 'd', 'b', 'c'],
+        'gols_mandante': [2, 1, 0, 3, 1, 2, 1, 0, 2, 1],
+        'gols_visitante': [0, 1, 2, 1, 1, 2, 0, 1, 2, 3],
+    })
+    return EstadoModelo.de_dataframe(df)
+
+
+def test_cenario_nao_altera_a_base(base):
+    elo, n_partidas = base.elo.copy(), base.n_partidas
+    cenario = Cenario(base)
+    assert cenario.estado is base
+    cenario.aplicar('a', 3, 'b', 0).aplicar('f', 1, 'a', 1)
+    assert np.array_equal(base.elo, elo) and base.n_partidas == n_partidas and 'f' not in base.indice
+    assert cenario.estado.n_partidas == n_partidas + 2
+    ranking = cenario.comparar_ranking()
+    assert ranking.loc['a', 'variacao'] > 0 and ranking.loc['b', 'variacao'] < 0
+    previsoes = cenario.comparar_previsoes([('a', 'b')])
+    assert previsoes['prob_mandante_cenario'][0] > previsoes['prob_mandante'][0]
+
+
+def test_combinacoes_iguais_a_aplicar_cada_cenario(base):
+    rodada = [('a', 'b'), ('c', 'd'), ('e', 'a')]
+    previsao = [('b', 'e'), ('d', 'a')]
+    resultado = avaliar_combinacoes(base, rodada, previsao, tamanho_bloco=5)
+    assert resultado['desfechos'].shape == (27, 3)
+    for k, desfechos in enumerate(resultado['desfechos']):
+        cenario = Cenario(base)
+        for (mandante, visitante), d in zip(rodada, desfechos):
+            gols_m, gols_v = PLACARES_REPRESENTATIVOS[d]
+            cenario.aplicar(mandante, gols_m, visitante, gols_v)
+        estado = cenario.estado
+        assert np.allclose(resultado['elo'][k], [estado.elo[estado.indice[t]] for t in resultado['times']])
+        previsto = estado.prever_jogos(previsao)
+        probs = np.stack([previsto['prob_mandante'], previsto['prob_empate'], previsto['prob_visitante']], axis=-1)
+        assert np.allclose(resultado['probs'][k], probs)
+        posicoes = pd.Series(estado.elo, index=estado.times).rank(ascending=False, method='min')
+        assert resultado['posicao_elo'][k].tolist() == [int(posicoes[t]) for t in resultado['times']]
@@ -0,0 +1,62 @@
+import os
+
+import numpy as np
+import pytest
+
+import modelo
+from checkpoint_modelo import carregar_estado
+from registro_partidas import RegistroPartidas
+
+
+@pytest.fixture
+def registro(tmp_path):
+    registro = RegistroPartidas(str(tmp_path / 'teste.partidas'))
+    registro.anexar_lote([
+        {'mandante': 'flamengo', 'visitante': 'vasco', 'gols_mandante': 2, 'gols_visitante': 1},
+        {'mandante': 'vasco', 'visitante': 'bahia', 'gols_mandante': 0, 'gols_visitante': 0},
+        {'mandante': 'bahia', 'visitante': 'flamengo', 'gols_mandante': 1, 'gols_visitante': 3},
+    ])
+    return registro
+
+
+def test_checkpoint_reaproveitado_enquanto_o_registro_confere(registro, tmp_path):
+    caminho = str(tmp_path / 'modelo.npz')
+    estado, origem = carregar_estado(registro, caminho)
+    assert origem == 'ajuste' and os.path.exists(caminho)
+    carregado, origem = carregar_estado(RegistroPartidas(registro.caminho), caminho)
+    assert origem == 'checkpoint'
+    assert carregado.times == estado.times
+    assert np.allclose(carregado.elo, estado.elo) and np.allclose(carregado.forcas_vetor(), estado.forcas_vetor())
+    assert [f for f in os.listdir(tmp_path) if 'tmp' in f] == []
+
+
+def test_anexacao_invalida_o_checkpoint(registro, tmp_path):
+    caminho = str(tmp_path / 'modelo.npz')
+    carregar_estado(registro, caminho)
+    registro.anexar('vasco', 4, 'flamengo', 0)
+    estado, origem = carregar_estado(registro, caminho)
+    assert origem == 'ajuste' and estado.n_partidas == 4
+    assert carregar_estado(registro, caminho)[1] == 'checkpoint'
+
+
+def test_reescrita_de_mesmo_tamanho_invalida_o_checkpoint(registro, tmp_path):
+    caminho = str(tmp_path / 'modelo.npz')
+    carregar_estado(registro, caminho)
+    partidas = registro.para_dataframe().to_dict('records')
+    partidas[0]['gols_mandante'] = 5
+    registro.reescrever(partidas)
+    assert carregar_estado(registro, caminho)[1] == 'ajuste'
+
+
+def test_mudanca_de_parametros_invalida_o_checkpoint(registro, tmp_path, monkeypatch):
+    caminho = str(tmp_path / 'modelo.npz')
+    carregar_estado(registro, caminho)
+    monkeypatch.setattr(modelo, 'ELO_K_FACTOR_BASE', modelo.ELO_K_FACTOR_BASE + 1)
+    assert carregar_estado(registro, caminho)[1] == 'ajuste'
+
+
+def test_checkpoint_corrompido_e_refeito(registro, tmp_path):
+    caminho = tmp_path / 'modelo.npz'
+    caminho.write_bytes(b'lixo')
+    assert carregar_estado(registro, str(caminho))[1] == 'ajuste'
+    assert carregar_estado(registro, str(caminho))[1] == 'checkpoint'
@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from confrontos import IndiceConfrontos
+from registro_partidas import RegistroPartidas
+
+
+def _partidas(placares, mandante='flamengo', visitante='vasco'):
+    return pd.DataFrame({'mandante': mandante, 'visitante': visitante,
+                         'gols_mandante': [g[0] for g in placares], 'gols_visitante': [g[1] for g in placares]})
+
+
+def _simbolos(placares):
+    return ['V' if a > b else 'E' if a == b else 'D' for a, b in placares]
+
+
+@pytest.mark.parametrize('n_jogos', [0, 3, 5, 7, 12])
+def test_ultimos_em_ordem_apos_dar_a_volta(n_jogos):
+    placares = [(i % 3, 1) for i in range(n_jogos)]
+    indice = IndiceConfrontos.de_dataframe(_partidas(placares), ultimos_n=5)
+    assert indice.consultar('flamengo', 'vasco')['ultimos'] == _simbolos(placares)[-5:]
+
+
+def test_lote_e_partida_a_partida_coincidem():
+    placares = [(i % 4, (i * 7) % 3) for i in range(11)]
+    em_lote = IndiceConfrontos.de_dataframe(_partidas(placares), ultimos_n=4)
+    incremental = IndiceConfrontos(['flamengo', 'vasco'], ultimos_n=4)
+    for i, (a, b) in enumerate(placares):
+        incremental.aplicar_partida('flamengo', 'vasco', a, b)
+        assert incremental.consultar('flamengo', 'vasco')['ultimos'] == _simbolos(placares[:i + 1])[-4:]
+    assert np.array_equal(em_lote.ultimos, incremental.ultimos)
+    assert em_lote.consultar('flamengo', 'vasco') == incremental.consultar('flamengo', 'vasco')
+
+
+def test_consultar_par_soma_casa_e_fora():
+    df = pd.concat([_partidas([(2, 0), (1, 1)]), _partidas([(3, 1)], 'vasco', 'flamengo')], ignore_index=True)
+    par = IndiceConfrontos.de_dataframe(df).consultar_par('flamengo', 'vasco')
+    assert (par['jogos'], par['vitorias'], par['empates'], par['derrotas']) == (3, 1, 1, 1)
+    assert (par['gols_pro'], par['gols_contra']) == (4, 4)
+    assert par['ultimos_casa'] == ['V', 'E'] and par['ultimos_fora'] == ['D']
+
+
+def test_cache_reaproveitado_e_invalidado(tmp_path):
+    registro = RegistroPartidas(str(tmp_path / 'teste.partidas'))
+    registro.anexar_lote(_partidas([(1, 0), (0, 2)]).to_dict('records'))
+    cache = str(tmp_path / 'confrontos.npz')
+    IndiceConfrontos.de_registro(registro, cache)
+    registro.anexar('vasco', 1, 'flamengo', 1)
+    indice = IndiceConfrontos.de_registro(registro, cache)
+    assert indice.n_partidas == 3 and indice.consultar('vasco', 'flamengo')['empates'] == 1
+    assert [f for f in os.listdir(tmp_path) if 'tmp' in f] == []
+
+    partidas = registro.para_dataframe().to_dict('records')
+    partidas[0]['gols_mandante'] = 0
+    registro.reescrever(partidas)
+    indice = IndiceConfrontos.de_registro(registro, cache)
+    assert indice.consultar('flamengo', 'vasco')['ultimos'] == ['E', 'D']
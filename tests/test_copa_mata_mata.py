@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from copa_mata_mata import (
+    FATOR_PRORROGACAO, IDA_E_VOLTA, JOGO_UNICO, _matrizes_gols, simular_copa
+)
+from estado_modelo import EstadoModelo
+from modelo import poisson
+
+MAX_GOLS = 15
+
+
+@pytest.fixture(scope='module')
+def estado():
+    df = pd.DataFrame({
+        'mandante': ['a', 'b', 'c', 'd', 'a', 'c', 'b', 'd', 'a', 'b'],
+        'visitante': ['b', 'a', 'd', 'c', 'c', 'a', 'd', 'b', 'd', 'c'],
+        'gols_mandante': [3, 1, 2, 0, 2, 1, 1, 0, 4, 2],
+        'gols_visitante': [0, 1, 1, 2, 2, 0, 1, 1, 1, 2],
+    })
+    return EstadoModelo.de_dataframe(df)
+
+
+def _prob_ida_e_volta(casa, fora, gols_fora):
+    """
+    Probabilidade exata de A (mandante da ida) passar, enumerando os placares das duas partidas.
+    """
+    g = range(MAX_GOLS)
+
+    def pmf(media):
+        return [poisson(media, k) for k in g]
+
+    ida_a, ida_b = pmf(casa[0, 1]), pmf(fora[0, 1])
+    volta_b, volta_a = pmf(casa[1, 0]), pmf(fora[1, 0])
+    extra_a, extra_b = pmf(fora[1, 0] * FATOR_PRORROGACAO), pmf(casa[1, 0] * FATOR_PRORROGACAO)
+    vitoria_extra = sum(extra_a[i] * extra_b[j] for i in g for j in g if i > j)
+    empate_extra = extra_b[0] * extra_a[0] if gols_fora else sum(extra_a[i] * extra_b[i] for i in g)
+    if gols_fora:
+        vitoria_extra += sum(extra_a[i] * extra_b[i] for i in g if i > 0)
+    prob = 0.0
+    for ia in g:
+        for ib in g:
+            for va in g:
+                p = ida_a[ia] * ida_b[ib] * volta_a[va]
+                for vb in g:
+                    agregado_a, agregado_b = ia + va, ib + vb
+                    if agregado_a != agregado_b:
+                        prob += p * volta_b[vb] * (agregado_a > agregado_b)
+                    elif gols_fora and va != ib:
+                        prob += p * volta_b[vb] * (va > ib)
+                    else:
+                        # Pênaltis simétricos: metade das decisões para cada lado
+                        prob += p * volta_b[vb] * (vitoria_extra + empate_extra / 2)
+    return prob
+
+
+@pytest.mark.parametrize('gols_fora', [False, True])
+def test_ida_e_volta_igual_a_probabilidade_exata(estado, gols_fora):
+    casa, fora, _ = _matrizes_gols(estado, ['a', 'b'])
+    resultado = simular_copa(estado, ['a', 'b'], [IDA_E_VOLTA], gols_fora=gols_fora, n_simulacoes=400000, semente=3)
+    simulada = resultado['alcance'][0, 1] / 400000
+    assert simulada == pytest.approx(_prob_ida_e_volta(casa, fora, gols_fora), abs=0.005)
+
+
+def test_gols_fora_mudam_o_resultado(estado):
+    sem = simular_copa(estado, ['a', 'b'], [IDA_E_VOLTA], n_simulacoes=200000, semente=1)
+    com = simular_copa(estado, ['a', 'b'], [IDA_E_VOLTA], gols_fora=True, n_simulacoes=200000, semente=1)
+    assert sem['alcance'][0, 1] != com['alcance'][0, 1]
+
+
+def test_contagens_por_fase_e_reprodutibilidade(estado):
+    chave = ['a', 'b', 'c', 'd']
+    resultado = simular_copa(estado, chave, n_simulacoes=60000, semente=9)
+    assert resultado['fases'] == ['semifinal', 'final', 'campeao']
+    assert resultado['alcance'].sum(axis=0).tolist() == [4 * 60000, 2 * 60000, 60000]
+    assert np.array_equal(np.bincount(resultado['campeao'], minlength=4), resultado['alcance'][:, -1])
+    em_paralelo = simular_copa(estado, chave, n_simulacoes=60000, semente=9, processos=2)
+    assert np.array_equal(resultado['alcance'], em_paralelo['alcance'])
+
+
+def test_chave_invalida(estado):
+    with pytest.raises(ValueError):
+        simular_copa(estado, ['a', 'b', 'c'], n_simulacoes=10)
+    with pytest.raises(ValueError, match='flamengo'):
+        simular_copa(estado, ['a', 'flamengo'], n_simulacoes=10)
+    with pytest.raises(ValueError):
+        simular_copa(estado, ['a', 'b'], [JOGO_UNICO, JOGO_UNICO], n_simulacoes=10)
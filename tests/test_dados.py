@@ -0,0 +1,68 @@
+import os
+
+import pandas as pd
+import pytest
+
+from dados import carregar_csv, carregar_dataset, indice_particoes, temporadas_disponiveis
+
+CABECALHO = "ID,rodata,data,mandante,visitante,mandante_Placar,visitante_Placar\n"
+LINHAS = [
+    "1,1,10/05/2021,Flamengo,Vasco,2,1\n",
+    "2,1,20/06/2019,Bahia,Sport,0,0\n",
+    "3,38,15/02/2021,Vasco,Bahia,1,3\n",      # temporada 2020, encerrada em 2021
+    "4,2,,Sport,Flamengo,1,1\n",               # sem data
+    "5,30,05/12/2020,Flamengo,Bahia,4,0\n",
+    "6,5,01/08/2019,Vasco,Sport,2,2\n",
+]
+
+
+@pytest.fixture
+def csv(tmp_path):
+    caminho = tmp_path / 'partidas.csv'
+    caminho.write_text(CABECALHO + ''.join(LINHAS), encoding='utf-8')
+    return str(caminho)
+
+
+def _ids(df):
+    return sorted(df['ID'].tolist())
+
+
+def test_particoes_por_temporada(csv):
+    assert temporadas_disponiveis(csv) == [2019, 2020, 2021]
+    particoes = indice_particoes(csv)['particoes']
+    assert [p['temporada'] for p in particoes] == [2019, 2020, 2021, None]
+    assert [p['n_linhas'] for p in particoes] == [2, 2, 1, 1]
+    assert particoes[1]['data_min'] == '2020-12-05' and particoes[1]['data_max'] == '2021-02-15'
+
+
+def test_filtros_leem_so_as_linhas_pedidas(csv):
+    assert _ids(carregar_csv(csv)) == [1, 2, 3, 4, 5, 6]
+    assert _ids(carregar_csv(csv, temporadas=[2020])) == [3, 5]
+    assert _ids(carregar_csv(csv, temporadas=[2019, 2021])) == [1, 2, 6]
+    assert _ids(carregar_csv(csv, desde='2020-12-06', ate='2021-05-10')) == [1, 3]
+    assert _ids(carregar_csv(csv, temporadas=[2019], desde='2019-07-01')) == [6]
+    # Ordem por data, com as linhas sem data no fim
+    assert carregar_csv(csv)['ID'].tolist() == [2, 6, 5, 3, 1, 4]
+
+
+def test_dataset_normalizado(csv):
+    df = carregar_dataset(csv, temporadas=[2020])
+    assert df['mandante'].tolist() == ['flamengo', 'vasco']
+    assert df['temporada'].tolist() == [2020, 2020] and df['rodada'].tolist() == [30, 38]
+
+
+def test_alteracao_da_fonte_refaz_as_particoes(csv):
+    assert _ids(carregar_csv(csv, temporadas=[2022])) == []
+    with open(csv, 'a', encoding='utf-8') as f:
+        f.write("7,1,12/04/2022,Bahia,Flamengo,1,0\n")
+    assert _ids(carregar_csv(csv, temporadas=[2022])) == [7]
+    assert temporadas_disponiveis(csv) == [2019, 2020, 2021, 2022]
+    assert [f for f in os.listdir(csv + '.particoes') if f.endswith('.tmp')] == []
+
+
+def test_csv_sem_data(tmp_path):
+    caminho = tmp_path / 'rodada.csv'
+    caminho.write_text("mandante,visitante,gols_mandante,gols_visitante\nflamengo,vasco,1,0\n", encoding='utf-8')
+    assert indice_particoes(str(caminho)) is None and len(carregar_csv(str(caminho))) == 1
+    with pytest.raises(ValueError):
+        carregar_csv(str(caminho), temporadas=[2020])
@@ -0,0 +1,99 @@
+import os
+
+import numpy as np
+import pytest
+
+from dados import carregar_dataset
+from estado_modelo import EstadoModelo
+from modelo import calcular_forcas_poisson, calcular_vantagens_casa, calcular_elo_dinamico, prever_partida_hibrido
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='module')
+def partidas():
+    return carregar_dataset(os.path.join(RAIZ, 'br-25.csv'))
+
+
+@pytest.fixture(scope='module')
+def estado(partidas):
+    return EstadoModelo.de_dataframe(partidas)
+
+
+def _comparar_dicts(obtido, esperado):
+    assert set(obtido) == set(esperado)
+    for chave, valor in esperado.items():
+        assert obtido[chave] == pytest.approx(valor, rel=1e-12, abs=1e-12)
+
+
+def test_forcas_iguais_a_calcular_forcas_poisson(partidas, estado):
+    forcas, medias = calcular_forcas_poisson(partidas)
+    obtido = estado.forcas_poisson()
+    assert set(obtido) == set(forcas)
+    for time, valores in forcas.items():
+        _comparar_dicts(obtido[time], valores)
+    _comparar_dicts(estado.medias_liga(), medias)
+
+
+def test_vantagens_iguais_a_calcular_vantagens_casa(partidas, estado):
+    _comparar_dicts(estado.vantagens_casa(), calcular_vantagens_casa(partidas))
+
+
+def test_elo_igual_a_calcular_elo_dinamico(partidas, estado):
+    _comparar_dicts(estado.elo_ratings(), calcular_elo_dinamico(partidas, calcular_vantagens_casa(partidas)))
+
+
+def test_previsao_vetorizada_igual_a_prever_partida_hibrido(partidas, estado):
+    forcas, medias = calcular_forcas_poisson(partidas)
+    vantagens = calcular_vantagens_casa(partidas)
+    elo = calcular_elo_dinamico(partidas, vantagens)
+    jogos = [('flamengo', 'vasco'), ('palmeiras', 'santos'), ('bahia', 'sport')]
+    previsto = estado.prever_jogos(jogos)
+    for i, (mandante, visitante) in enumerate(jogos):
+        esperado = prever_partida_hibrido(mandante, visitante, elo, forcas, medias, vantagens)
+        for chave in ('prob_mandante', 'prob_empate', 'prob_visitante',
+                      'gols_esperados_mandante', 'gols_esperados_visitante'):
+            assert previsto[chave][i] == pytest.approx(esperado[chave], rel=1e-9)
+
+
+def test_somas_incrementais_iguais_a_reconstrucao(partidas, estado):
+    incremental = EstadoModelo.de_dataframe(partidas.iloc[:1000])
+    incremental.aplicar_partidas(partidas.iloc[1000:])
+    ordem = [incremental.indice[t] for t in estado.times]
+    for chave, valores in estado.somas.items():
+        assert np.array_equal(incremental.somas[chave][ordem], valores)
+    assert incremental.medias() == pytest.approx(estado.medias())
+    _comparar_dicts(incremental.vantagens_casa(), estado.vantagens_casa())
+
+
+def test_arrays_ida_e_volta(estado):
+    copia = EstadoModelo.de_arrays(estado.para_arrays())
+    assert copia.times == estado.times
+    assert np.array_equal(copia.elo, estado.elo)
+    _comparar_dicts(copia.medias_liga(), estado.medias_liga())
+
+
+def _xg_por_partida(df):
+    forcas, medias = calcular_forcas_poisson(df)
+    total, jogos = {}, {}
+    for mandante, visitante in zip(df['mandante'], df['visitante']):
+        res = prever_partida_hibrido(mandante, visitante, {}, forcas, medias, {})
+        for time, chave in ((mandante, 'gols_esperados_mandante'), (visitante, 'gols_esperados_visitante')):
+            total[time] = total.get(time, 0.0) + res[chave]
+            jogos[time] = jogos.get(time, 0) + 1
+    return total, {t: total[t] / jogos[t] for t in total}
+
+
+def test_xg_igual_a_soma_por_partida(partidas):
+    amostra = partidas.iloc[:600]
+    total, medio = EstadoModelo.de_dataframe(amostra, calcular_elo=False).xg_por_clube()
+    total_ref, medio_ref = _xg_por_partida(amostra)
+    _comparar_dicts(total, total_ref)
+    _comparar_dicts(medio, medio_ref)
+
+
+def test_xg_incremental_igual_a_reconstrucao(partidas):
+    incremental = EstadoModelo.de_dataframe(partidas.iloc[:400], calcular_elo=False)
+    incremental.aplicar_partidas(partidas.iloc[400:600])
+    total, _ = incremental.xg_por_clube()
+    _comparar_dicts(total, EstadoModelo.de_dataframe(partidas.iloc[:600], calcular_elo=False).xg_por_clube()[0])
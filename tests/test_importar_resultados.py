@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+
+from importar_resultados import ler_resultados, validar_resultados, importar_resultados
+from registro_partidas import RegistroPartidas
+
+
+@pytest.fixture
+def registro(tmp_path):
+    registro = RegistroPartidas(str(tmp_path / 'teste.partidas'))
+    registro.anexar('flamengo', 2, 'vasco', 1)
+    return registro
+
+
+def test_ler_esquema_completo_e_jsonl(tmp_path):
+    csv = tmp_path / 'rodada.csv'
+    csv.write_text("mandante,visitante,mandante_Placar,visitante_Placar,rodata\n Flamengo ,VASCO,2,1,5\n",
+                   encoding='utf-8')
+    jsonl = tmp_path / 'rodada.jsonl'
+    jsonl.write_text('{"mandante": "Flamengo", "visitante": "vasco", "gols_mandante": 2, "gols_visitante": 1}\n',
+                     encoding='utf-8')
+    df = ler_resultados(str(csv))
+    assert df[['mandante', 'visitante', 'gols_mandante', 'rodada']].values.tolist() == [['flamengo', 'vasco', '2', '5']]
+    assert ler_resultados(str(jsonl))[['mandante', 'visitante']].values.tolist() == [['flamengo', 'vasco']]
+
+
+def test_colunas_ausentes(tmp_path):
+    csv = tmp_path / 'rodada.csv'
+    csv.write_text("mandante,visitante,gols_mandante\nflamengo,vasco,1\n", encoding='utf-8')
+    with pytest.raises(ValueError, match='gols_visitante'):
+        ler_resultados(str(csv))
+
+
+def test_time_em_branco_e_rejeitado(tmp_path, registro):
+    csv = tmp_path / 'rodada.csv'
+    csv.write_text("mandante,visitante,gols_mandante,gols_visitante\nflamengo,,1,0\n  ,vasco,0,0\n", encoding='utf-8')
+    df = ler_resultados(str(csv))
+    assert pd.isna(df['visitante'][0]) and pd.isna(df['mandante'][1])
+    erros = validar_resultados(df.copy(), {'flamengo', 'vasco'}, permitir_novos=True)
+    assert erros == ["Linha 1: mandante e visitante são obrigatórios.",
+                     "Linha 2: mandante e visitante são obrigatórios."]
+    with pytest.raises(ValueError):
+        importar_resultados(df, registro, permitir_novos=True)
+    assert len(registro) == 1 and registro.times == ['flamengo', 'vasco']
+    with pytest.raises(ValueError):
+        registro.anexar('bahia', 1, float('nan'), 0)
+    assert registro.times == ['flamengo', 'vasco']
+
+
+def test_validacao(registro):
+    df = pd.DataFrame({'mandante': ['flamengo', 'flamengo', 'bahia'], 'visitante': ['flamengo', 'vasco', 'vasco'],
+                       'gols_mandante': ['1', '-1', '2'], 'gols_visitante': ['0', '1.5', '0']})
+    erros = validar_resultados(df, set(registro.times))
+    assert "Linha 1: mandante e visitante iguais (flamengo)." in erros
+    assert "Linha 3: time desconhecido 'bahia'." in erros
+    assert "Linha 2: gols_mandante deve ser inteiro positivo ou zero." in erros
+    assert "Linha 2: gols_visitante deve ser inteiro positivo ou zero." in erros
+
+
+def test_importacao_grava_em_uma_anexacao(registro):
+    df = pd.DataFrame({'mandante': ['vasco', 'bahia'], 'visitante': ['flamengo', 'vasco'],
+                       'gols_mandante': ['0', '3'], 'gols_visitante': ['0', '1']})
+    with pytest.raises(ValueError, match='bahia'):
+        importar_resultados(df.copy(), registro)
+    assert len(registro) == 1
+    importar_resultados(df, registro, permitir_novos=True)
+    assert registro.para_dataframe()['gols_mandante'].tolist() == [2, 0, 3]
+    assert registro.times == ['flamengo', 'vasco', 'bahia']
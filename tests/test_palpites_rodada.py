@@ -0,0 +1,23 @@
+import itertools
+
+import numpy as np
+
+from palpites_rodada import distribuicao_acertos
+
+
+def test_distribuicao_acertos_forca_bruta():
+    rng = np.random.default_rng(7)
+    p = rng.random(8)
+    esperado = np.zeros(9)
+    for acertos in itertools.product((0, 1), repeat=len(p)):
+        acertos = np.array(acertos)
+        esperado[acertos.sum()] += np.prod(np.where(acertos == 1, p, 1 - p))
+    assert np.allclose(distribuicao_acertos(p), esperado, atol=1e-15)
+
+
+def test_distribuicao_acertos_varias_rodadas():
+    p = np.random.default_rng(8).random((3, 5))
+    dist = distribuicao_acertos(p)
+    assert dist.shape == (3, 6)
+    for linha, probs in zip(dist, p):
+        assert np.allclose(linha, distribuicao_acertos(probs))
@@ -0,0 +1,25 @@
+import itertools
+
+import numpy as np
+
+from pontos_finais import distribuicao_pontos
+
+
+def test_distribuicao_pontos_forca_bruta():
+    times = ['a', 'b', 'c', 'd']
+    jogos = [('a', 'b'), ('c', 'd'), ('b', 'c'), ('d', 'a'), ('a', 'c'), ('b', 'd')]
+    rng = np.random.default_rng(9)
+    probs = rng.dirichlet(np.ones(3), size=len(jogos))
+    dist = distribuicao_pontos(times, jogos, probs[:, 0], probs[:, 1], probs[:, 2])
+
+    esperado = np.zeros_like(dist)
+    indice = {t: i for i, t in enumerate(times)}
+    for desfechos in itertools.product(range(3), repeat=len(jogos)):
+        pontos = np.zeros(len(times), dtype=int)
+        prob = 1.0
+        for (m, v), d, pj in zip(jogos, desfechos, probs):
+            prob *= pj[d]
+            pontos[indice[m]] += (3, 1, 0)[d]
+            pontos[indice[v]] += (0, 1, 3)[d]
+        esperado[np.arange(len(times)), pontos] += prob
+    assert np.allclose(dist, esperado, atol=1e-15)
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from registro_partidas import (
+    RegistroPartidas, DTYPE_PARTIDA, _OFFSET_DADOS, _TAMANHO_SLOT, DATA_AUSENTE, RODADA_AUSENTE
+)
+
+
+@pytest.fixture
+def registro(tmp_path):
+    return RegistroPartidas(str(tmp_path / 'teste.partidas'))
+
+
+def test_ida_e_volta(registro):
+    registro.anexar('Flamengo', 2, 'vasco ', 1, rodada=3, data='10/05/2025')
+    registro.anexar_lote([
+        {'mandante': 'palmeiras', 'visitante': 'santos', 'gols_mandante': 0, 'gols_visitante': 0},
+        {'mandante': 'vasco', 'visitante': 'flamengo', 'gols_mandante': 1, 'gols_visitante': 3,
+         'rodada': 4, 'data': '2025-05-17'},
+    ])
+    reaberto = RegistroPartidas(registro.caminho)
+    df = reaberto.para_dataframe()
+    assert len(reaberto) == 3
+    assert reaberto.times == ['flamengo', 'vasco', 'palmeiras', 'santos']
+    assert df['mandante'].tolist() == ['flamengo', 'palmeiras', 'vasco']
+    assert df['gols_visitante'].tolist() == [1, 0, 3]
+    assert df['rodada'].tolist() == [3, RODADA_AUSENTE, 4]
+    assert str(df['data'][0].date()) == '2025-05-10' and df['data'].isna().tolist() == [False, True, False]
+    assert reaberto.ler(2)['gols_mandante'].tolist() == [1]
+
+
+def test_reescrever_mantem_ids(registro):
+    registro.anexar('flamengo', 2, 'vasco', 1)
+    registro.reescrever(registro.para_dataframe().to_dict('records')
+                        + [{'mandante': 'bahia', 'visitante': 'vasco', 'gols_mandante': 1, 'gols_visitante': 1}])
+    assert registro.times == ['flamengo', 'vasco', 'bahia']
+    assert registro.para_dataframe()['mandante'].tolist() == ['flamengo', 'bahia']
+    assert registro.ler()['data'].tolist() == [DATA_AUSENTE, DATA_AUSENTE]
+
+
+def test_restos_de_gravacao_interrompida_sao_ignorados(registro):
+    registro.anexar('flamengo', 2, 'vasco', 1)
+    # Registros gravados sem a atualização do cabeçalho (queda no meio da anexação)
+    with open(registro.caminho, 'r+b') as f:
+        f.seek(_OFFSET_DADOS + DTYPE_PARTIDA.itemsize)
+        f.write(b'\xff' * DTYPE_PARTIDA.itemsize * 3)
+    assert len(registro) == 1
+    registro.anexar('santos', 0, 'bahia', 2)
+    assert registro.para_dataframe()['mandante'].tolist() == ['flamengo', 'santos']
+
+
+def test_cabecalho_rasgado_volta_ao_slot_anterior(registro):
+    registro.anexar('flamengo', 2, 'vasco', 1)
+    registro.anexar('santos', 0, 'bahia', 2)
+    # A geração 2 fica no slot 0; corrompê-lo simula uma queda durante a escrita do cabeçalho
+    with open(registro.caminho, 'r+b') as f:
+        f.seek(0)
+        f.write(b'\0' * (_TAMANHO_SLOT // 2))
+    assert len(registro) == 1
+    registro.anexar('bahia', 1, 'santos', 1)
+    assert registro.para_dataframe()['mandante'].tolist() == ['flamengo', 'bahia']
+
+
+def test_cabecalhos_invalidos(registro):
+    with open(registro.caminho, 'r+b') as f:
+        f.write(b'\0' * _OFFSET_DADOS)
+    with pytest.raises(ValueError):
+        len(registro)
+
+
+def test_importar_csv_so_em_registro_vazio(tmp_path):
+    csv = tmp_path / 'jogos.csv'
+    csv.write_text("mandante,visitante,resultado,gols_mandante,gols_visitante\n"
+                   "Sport ,vasco,Sport,2,0\npalmeiras,santos,,,\n", encoding='utf-8')
+    caminho = str(tmp_path / 'jogos.partidas')
+    registro = RegistroPartidas.importar_csv(str(csv), caminho)
+    assert len(registro) == 1 and registro.times == ['sport', 'vasco']
+    with pytest.raises(ValueError):
+        RegistroPartidas.importar_csv(str(csv), caminho)
+    assert len(RegistroPartidas.importar_csv(str(csv), caminho, se_vazio=True)) == 1
+
+
+def test_exportar_e_importar_esquema_completo(registro, tmp_path):
+    registro.anexar('flamengo', 2, 'vasco', 1, rodada=1, data='2025-04-01')
+    registro.anexar('vasco', 0, 'flamengo', 0, rodada=2, data='2025-04-08')
+    csv = str(tmp_path / 'completo.csv')
+    registro.exportar_csv(csv, esquema='completo')
+    copia = RegistroPartidas.importar_csv(csv, str(tmp_path / 'copia.partidas'))
+    assert np.array_equal(copia.ler(), registro.ler())
@@ -0,0 +1,82 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+import resultados_simulacao
+from resultados_simulacao import ResultadosSimulacao, salvar_resultados, interpretar_evento, MANDANTE
+from simulacao_dinamica import posicoes_finais
+
+
+def _resultado(n_simulacoes=25, semente=3):
+    rng = np.random.default_rng(semente)
+    return {
+        'times': ['flamengo', 'vasco', 'bahia'],
+        'jogos': [('flamengo', 'vasco', 1), ('vasco', 'bahia', float('nan')), ('bahia', 'flamengo', None)],
+        'desfechos': rng.integers(0, 3, (n_simulacoes, 3)),
+        'pontos': rng.integers(0, 7, (n_simulacoes, 3)),
+        'saldo': rng.integers(-3, 4, (n_simulacoes, 3)),
+        'gols': rng.integers(0, 5, (n_simulacoes, 3)),
+        'vitorias': rng.integers(0, 3, (n_simulacoes, 3)),
+        'elo_final': rng.normal(1500, 50, (n_simulacoes, 3)),
+    }
+
+
+def test_consultas_sobre_blocos(tmp_path):
+    resultado = _resultado()
+    salvar_resultados(resultado, str(tmp_path), semente=3, tamanho_bloco=10)
+    resultados = ResultadosSimulacao(str(tmp_path))
+    assert resultados.jogos[1] == ('vasco', 'bahia', None) and len(resultados.metadados['blocos']) == 3
+
+    posicoes = posicoes_finais(resultado)
+    vence = resultado['desfechos'][:, 0] == MANDANTE
+    campeao = posicoes[:, 0] == 1
+    assert resultados.probabilidade(resultados.campeao('flamengo')) == pytest.approx(campeao.mean())
+    condicional = resultados.probabilidade(resultados.campeao('flamengo'), resultados.vitoria('flamengo', 'vasco'))
+    assert condicional == pytest.approx((campeao & vence).sum() / vence.sum())
+
+
+def test_interpretar_evento_normaliza_os_times(tmp_path):
+    salvar_resultados(_resultado(), str(tmp_path))
+    resultados = ResultadosSimulacao(str(tmp_path))
+    evento = interpretar_evento(resultados, 'Campeao: Flamengo ')
+    assert resultados.contar(evento) == resultados.contar(resultados.campeao('flamengo'))
+    assert resultados.contar(interpretar_evento(resultados, 'vitoria:VASCO:Flamengo')) >= 0
+    with pytest.raises(ValueError):
+        interpretar_evento(resultados, 'top:flamengo')
+    with pytest.raises(KeyError):
+        interpretar_evento(resultados, 'campeao:palmeiras')
+
+
+def test_nova_gravacao_substitui_a_anterior(tmp_path):
+    salvar_resultados(_resultado(semente=1), str(tmp_path), tamanho_bloco=10)
+    salvar_resultados(_resultado(semente=2), str(tmp_path), tamanho_bloco=20)
+    resultados = ResultadosSimulacao(str(tmp_path))
+    assert resultados.metadados['geracao'] == 2
+    assert sorted(f for f in os.listdir(tmp_path) if f.endswith('.npz')) == resultados.metadados['blocos']
+    pontos = np.concatenate([b['pontos'] for b in resultados.blocos()])
+    assert np.array_equal(pontos, _resultado(semente=2)['pontos'])
+
+
+def test_queda_durante_a_gravacao_preserva_os_resultados_anteriores(tmp_path, monkeypatch):
+    salvar_resultados(_resultado(semente=1), str(tmp_path), tamanho_bloco=10)
+    with open(tmp_path / 'metadados.json', encoding='utf-8') as f:
+        metadados = json.load(f)
+
+    gravar = resultados_simulacao.gravar_atomico
+    chamadas = []
+
+    def gravar_e_cair(caminho, conteudo):
+        chamadas.append(caminho)
+        if len(chamadas) == 2:
+            raise OSError("queda simulada")
+        gravar(caminho, conteudo)
+
+    monkeypatch.setattr(resultados_simulacao, 'gravar_atomico', gravar_e_cair)
+    with pytest.raises(OSError):
+        salvar_resultados(_resultado(semente=2), str(tmp_path), tamanho_bloco=10)
+    resultados = ResultadosSimulacao(str(tmp_path))
+    assert resultados.metadados == metadados
+    pontos = np.concatenate([b['pontos'] for b in resultados.blocos()])
+    assert np.array_equal(pontos, _resultado(semente=1)['pontos'])
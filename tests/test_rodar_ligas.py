@@ -0,0 +1,51 @@
+import pytest
+
+from dados import carregar_dataset
+from modelo import calcular_vantagens_casa, calcular_elo_dinamico
+from rodar_ligas import gerar_unidades, processar_unidade, rodar_unidades, gerar_relatorio
+
+CABECALHO = "ID,rodata,data,mandante,visitante,mandante_Placar,visitante_Placar\n"
+LINHAS = [
+    "1,1,20/06/2019,Bahia,Sport,0,0\n",
+    "2,2,01/08/2019,Vasco,Sport,2,2\n",
+    "3,3,10/09/2019,Sport,Bahia,1,2\n",
+    "4,1,05/07/2020,Flamengo,Bahia,4,0\n",
+    "5,2,15/02/2021,Vasco,Flamengo,1,3\n",
+    "6,1,10/05/2021,Flamengo,Vasco,2,1\n",
+]
+
+
+@pytest.fixture
+def arquivos(tmp_path):
+    completo = tmp_path / 'completo.csv'
+    completo.write_text(CABECALHO + ''.join(LINHAS), encoding='utf-8')
+    rodada = tmp_path / 'rodada.csv'
+    rodada.write_text("mandante,visitante,gols_mandante,gols_visitante\nflamengo,vasco,1,0\nvasco,flamengo,2,2\n",
+                      encoding='utf-8')
+    return str(completo), str(rodada)
+
+
+def test_unidades_por_temporada(arquivos):
+    completo, rodada = arquivos
+    assert gerar_unidades([completo, rodada]) == [(completo, None), (rodada, None)]
+    assert gerar_unidades([completo, rodada], por_temporada=True) == [
+        (completo, 2019), (completo, 2020), (completo, 2021), (rodada, None)]
+
+
+def test_unidade_igual_ao_pipeline_direto(arquivos):
+    completo, _ = arquivos
+    resumo = processar_unidade((completo, 2020))
+    df = carregar_dataset(completo, temporadas=[2020])
+    elo = calcular_elo_dinamico(df, calcular_vantagens_casa(df))
+    assert resumo['partidas'] == 2 and resumo['times'] == 3
+    assert resumo['top_elo'] == sorted(elo.items(), key=lambda x: x[1], reverse=True)[:len(resumo['top_elo'])]
+    assert resumo['vitorias_mandante'] == 0.5 and resumo['empates'] == 0.0
+
+
+def test_paralelo_igual_ao_sequencial_e_relatorio(arquivos):
+    unidades = gerar_unidades(list(arquivos), por_temporada=True)
+    paralelo = rodar_unidades(unidades, processos=2)
+    assert paralelo == rodar_unidades(unidades, processos=1)
+    relatorio = gerar_relatorio(paralelo)
+    assert [linha for linha in relatorio.splitlines() if linha.startswith('## ')] == [
+        '## completo.csv - 2019', '## completo.csv - 2020', '## completo.csv - 2021', '## rodada.csv']
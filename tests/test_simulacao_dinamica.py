@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from dados import ler_classificacao
+from estado_modelo import EstadoModelo
+from simulacao_dinamica import _rodadas_sem_conflito, posicoes_finais, simular_temporadas
+
+
+def _uma_simulacao(**colunas):
+    times = ['a', 'b', 'c']
+    resultado = {'times': times}
+    for chave in ('pontos', 'vitorias', 'saldo', 'gols'):
+        resultado[chave] = np.array([colunas.get(chave, [0, 0, 0])])
+    return resultado
+
+
+def test_ordem_de_desempate():
+    resultado = _uma_simulacao(pontos=[6, 6, 6], vitorias=[1, 2, 2], saldo=[9, 1, 3], gols=[9, 9, 1])
+    assert posicoes_finais(resultado).tolist() == [[3, 2, 1]]
+    resultado = _uma_simulacao(pontos=[4, 4, 4], vitorias=[1, 1, 1], saldo=[2, 2, 2], gols=[1, 3, 2])
+    assert posicoes_finais(resultado).tolist() == [[3, 1, 2]]
+
+
+def test_classificacao_atual_entra_em_todos_os_criterios():
+    resultado = _uma_simulacao(pontos=[3, 3, 0], vitorias=[1, 1, 0], saldo=[1, 1, -2], gols=[1, 1, 0])
+    classificacao = {
+        'a': {'pontos': 10, 'vitorias': 3, 'saldo': 2, 'gols_pro': 8},
+        'b': {'pontos': 10, 'vitorias': 3, 'saldo': 2, 'gols_pro': 9},
+        'c': {'pontos': 13, 'vitorias': 4, 'saldo': 5, 'gols_pro': 7},
+    }
+    # Empatados em pontos, vitórias e saldo; b tem mais gols somando os já marcados
+    assert posicoes_finais(resultado, classificacao).tolist() == [[2, 1, 3]]
+    so_pontos = {t: {'pontos': c['pontos']} for t, c in classificacao.items()}
+    assert posicoes_finais(resultado, so_pontos)[0, 2] == 3
+
+
+def test_empate_total_e_sorteado():
+    resultado = _uma_simulacao()
+    resultado = {k: np.repeat(v, 3000, axis=0) if k != 'times' else v for k, v in resultado.items()}
+    campeoes = (posicoes_finais(resultado) == 1).mean(axis=0)
+    assert np.allclose(campeoes, 1 / 3, atol=0.05)
+
+
+def test_ler_classificacao_com_colunas_opcionais(tmp_path):
+    csv = tmp_path / 'tabela.csv'
+    csv.write_text("time,pontos,saldo\n Flamengo ,50,12\nvasco,41,\n", encoding='utf-8')
+    assert ler_classificacao(str(csv)) == {
+        'flamengo': {'pontos': 50, 'vitorias': 0, 'saldo': 12, 'gols_pro': 0},
+        'vasco': {'pontos': 41, 'vitorias': 0, 'saldo': 0, 'gols_pro': 0},
+    }
+
+
+def test_jogos_sem_rodada_ficam_para_o_fim():
+    jogos_idx = [(0, 1), (2, 3), (0, 2), (1, 3), (0, 3)]
+    grupos = _rodadas_sem_conflito(jogos_idx, [2, None, 1, float('nan'), 1])
+    assert [g.tolist() for g in grupos] == [[2], [4], [0], [1], [3]]
+
+
+def test_simulacao_conta_vitorias_e_pontos():
+    df = pd.DataFrame({'mandante': ['a', 'b', 'c', 'a', 'b', 'c'], 'visitante': ['b', 'c', 'a', 'c', 'a', 'b'],
+                       'gols_mandante': [2, 1, 0, 3, 1, 2], 'gols_visitante': [0, 1, 1, 1, 2, 2]})
+    jogos = [('a', 'b', 1), ('c', 'a', 2), ('b', 'c', None)]
+    resultado = simular_temporadas(EstadoModelo.de_dataframe(df), jogos, n_simulacoes=500, semente=5)
+    desfechos = resultado['desfechos']
+    empates = np.stack([(desfechos[:, [0, 1]] == 1).sum(axis=1), (desfechos[:, [0, 2]] == 1).sum(axis=1),
+                        (desfechos[:, [1, 2]] == 1).sum(axis=1)], axis=1)
+    ordem = [resultado['times'].index(t) for t in ('a', 'b', 'c')]
+    assert np.array_equal(resultado['pontos'][:, ordem], 3 * resultado['vitorias'][:, ordem] + empates)
+    assert resultado['vitorias'].sum() == (desfechos != 1).sum()